@@ -0,0 +1,188 @@
+"""
+Interior clearance of the Pico case.
+Voxelizes the case panels and the motherboard assembly, builds a signed
+distance field for each, and derives free-volume and clearance maps used
+to decide where cables, an NVMe heatsink or a bigger cooler can fit.
+"""
+
+import json
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from analysis.images import heatmap, write_png
+from analysis.voxel import Grid, signed_distance, surface, voxelize_union
+from config import PicoDimensions
+from mesh.core import Mesh
+from mesh.parts import render_shape
+from pipeline.render import DEFAULT_QUALITY, render_quality, vitamin_detail
+
+CASE_PARTS = ("base_panel", "back_panel", "top_shell")
+CONTENT_PARTS = ("mobo_assembly",)
+
+CASE_COLOUR = (90, 90, 90)
+CONTENTS_COLOUR = (70, 110, 170)
+
+
+def pico_meshes(dim: PicoDimensions | None = None, with_hdd: bool = False,
+                quality: str = DEFAULT_QUALITY) -> Tuple[List[Mesh], List[Mesh]]:
+    """(case, contents) part meshes placed as in PicoAssembly; parts may overlap."""
+    from assemblies.pico import PicoAssembly
+
+    with render_quality(quality):
+        layout = PicoAssembly(dim=dim or PicoDimensions(), with_hdd=with_hdd, detail=vitamin_detail()).layout()
+
+    def place(names) -> List[Mesh]:
+        meshes = []
+        for name in names:
+            shape, post = layout[name]
+            # Parts are added at their "centre" anchor, then moved by `post`.
+            transform = np.asarray((post * shape.at("centre").I).A)
+            meshes.append(render_shape(shape).transformed(transform))
+        return meshes
+
+    return place(CASE_PARTS), place(CONTENT_PARTS)
+
+
+@dataclass
+class Clearance:
+    """
+    Voxel occupancy and distance fields of a case and its contents.
+    Distances are in mm between voxel centres.
+    """
+    grid: Grid
+    case: np.ndarray          # (nx, ny, nz) bool
+    contents: np.ndarray      # (nx, ny, nz) bool
+    case_sdf: np.ndarray      # signed distance to the case, float32
+    contents_sdf: np.ndarray  # signed distance to the contents, float32
+
+    @cached_property
+    def interior(self) -> np.ndarray:
+        """Voxels inside the case envelope that are not case material."""
+        occupied = np.argwhere(self.case)
+        lo, hi = occupied.min(axis=0), occupied.max(axis=0) + 1
+        inside = np.zeros_like(self.case)
+        inside[lo[0]:hi[0], lo[1]:hi[1], lo[2]:hi[2]] = True
+        return inside & ~self.case
+
+    @cached_property
+    def free(self) -> np.ndarray:
+        """Interior voxels not taken by the contents."""
+        return self.interior & ~self.contents
+
+    @property
+    def room(self) -> np.ndarray:
+        """Distance from each free voxel to the nearest solid (NaN elsewhere)."""
+        return np.where(self.free, np.minimum(self.case_sdf, self.contents_sdf), np.nan)
+
+    def free_volume(self) -> float:
+        """Free interior volume in mm^3."""
+        return float(self.free.sum() * self.grid.voxel_volume)
+
+    def free_height_map(self) -> np.ndarray:
+        """(nx, ny) free vertical room per column, mm."""
+        return self.free.sum(axis=2) * self.grid.pitch
+
+    def clearance_map(self) -> np.ndarray:
+        """(nx, ny) smallest contents-to-case distance per column, mm (NaN: no contents)."""
+        gaps = np.where(surface(self.contents), self.case_sdf, np.inf).min(axis=2)
+        return np.where(np.isinf(gaps), np.nan, gaps)
+
+    def min_clearance(self) -> Tuple[float, np.ndarray]:
+        """Tightest contents-to-case distance (mm) and where it occurs."""
+        gaps = np.where(surface(self.contents), self.case_sdf, np.inf)
+        index = np.unravel_index(np.argmin(gaps), gaps.shape)
+        return float(gaps[index]), self.grid.point(index)
+
+    def summary(self) -> Dict:
+        gap, where = self.min_clearance()
+        return {
+            "pitch": self.grid.pitch,
+            "grid": list(self.grid.shape),
+            "interior_volume_cm3": round(self.interior.sum() * self.grid.voxel_volume / 1000, 2),
+            "free_volume_cm3": round(self.free_volume() / 1000, 2),
+            "min_clearance_mm": round(gap, 3),
+            "min_clearance_at": [round(float(v), 2) for v in where],
+            "max_free_height_mm": float(self.free_height_map().max()),
+        }
+
+
+def analyze(case: Mesh | Sequence[Mesh], contents: Mesh | Sequence[Mesh],
+            pitch: float = 0.5) -> Clearance:
+    """
+    Voxelize the case and contents on a shared grid and build their
+    distance fields. Each may be several (possibly overlapping) parts,
+    which are voxelized separately and combined.
+    """
+    case = [case] if isinstance(case, Mesh) else list(case)
+    contents = [contents] if isinstance(contents, Mesh) else list(contents)
+    meshes = case + contents
+    bounds = np.array([
+        np.min([m.bounds[0] for m in meshes], axis=0),
+        np.max([m.bounds[1] for m in meshes], axis=0),
+    ])
+    grid = Grid.around(bounds, pitch)
+    case_vox = voxelize_union(case, grid)
+    contents_vox = voxelize_union(contents, grid)
+    return Clearance(
+        grid, case_vox, contents_vox,
+        signed_distance(case_vox, pitch), signed_distance(contents_vox, pitch),
+    )
+
+
+def _top_view(values: np.ndarray) -> np.ndarray:
+    """(nx, ny) grid -> image rows (+Y up)."""
+    return values.T[::-1]
+
+
+def slice_image(result: Clearance, k: int, room: np.ndarray, max_room: float) -> np.ndarray:
+    """RGB image of horizontal slice k: case, contents, free space by `room`."""
+    rgb = heatmap(_top_view(room[:, :, k]), 0.0, max_room)
+    rgb[_top_view(result.case[:, :, k])] = CASE_COLOUR
+    rgb[_top_view(result.contents[:, :, k])] = CONTENTS_COLOUR
+    return rgb
+
+
+def write_report(result: Clearance, output: Path, slice_step: float = 5.0,
+                 scale: int = 2, save_grids: bool = False) -> Dict:
+    """Write summary.json, free-height / clearance heatmaps and Z slices."""
+    output = Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+
+    free_height = result.free_height_map()
+    write_png(output / "free_height.png",
+              heatmap(_top_view(np.where(free_height > 0, free_height, np.nan)), 0, free_height.max()),
+              scale)
+
+    clearance = result.clearance_map()
+    finite = clearance[np.isfinite(clearance)]
+    write_png(output / "clearance.png",
+              heatmap(_top_view(clearance), 0, finite.max() if finite.size else 1.0), scale)
+
+    room = result.room
+    max_room = float(np.nanmax(room)) if np.isfinite(room).any() else 1.0
+    step = max(1, int(round(slice_step / result.grid.pitch)))
+    z = result.grid.centres(2)
+    slices = []
+    for k in range(0, result.grid.shape[2], step):
+        if not result.interior[:, :, k].any():
+            continue
+        name = f"slice_z{z[k]:07.2f}.png"
+        write_png(output / "slices" / name, slice_image(result, k, room, max_room), scale)
+        slices.append(name)
+
+    if save_grids:
+        np.savez_compressed(
+            output / "grids.npz",
+            origin=np.asarray(result.grid.origin), pitch=result.grid.pitch,
+            case=result.case, contents=result.contents,
+            case_sdf=result.case_sdf, contents_sdf=result.contents_sdf,
+        )
+
+    summary = result.summary()
+    summary["slices"] = slices
+    (output / "summary.json").write_text(json.dumps(summary, indent=2))
+    return summary
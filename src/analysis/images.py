@@ -0,0 +1,48 @@
+"""Minimal PNG output and colour maps for analysis images (stdlib + NumPy)."""
+
+import struct
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+# Perceptually ordered stops (dark blue -> teal -> green -> yellow)
+_HEAT_STOPS = np.array([
+    [68, 1, 84],
+    [59, 82, 139],
+    [33, 145, 140],
+    [94, 201, 98],
+    [253, 231, 37],
+], dtype=np.float64)
+
+
+def heatmap(values: np.ndarray, vmin: float, vmax: float,
+            nan_colour=(255, 255, 255)) -> np.ndarray:
+    """Map values to RGB uint8; NaNs get `nan_colour`."""
+    values = np.asarray(values, dtype=np.float64)
+    t = np.clip((values - vmin) / max(vmax - vmin, 1e-12), 0.0, 1.0)
+    t = np.nan_to_num(t) * (len(_HEAT_STOPS) - 1)
+    lo = np.floor(t).astype(int).clip(0, len(_HEAT_STOPS) - 2)
+    frac = (t - lo)[..., None]
+    rgb = _HEAT_STOPS[lo] * (1 - frac) + _HEAT_STOPS[lo + 1] * frac
+    rgb[np.isnan(values)] = nan_colour
+    return rgb.round().astype(np.uint8)
+
+
+def write_png(path: Path, rgb: np.ndarray, scale: int = 1):
+    """Write an (H, W, 3) uint8 image, optionally upscaled by pixel repetition."""
+    rgb = np.asarray(rgb, dtype=np.uint8)
+    if scale > 1:
+        rgb = rgb.repeat(scale, axis=0).repeat(scale, axis=1)
+    h, w, _ = rgb.shape
+    raw = np.concatenate([np.zeros((h, 1), dtype=np.uint8), rgb.reshape(h, w * 3)], axis=1)
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    png = b"\x89PNG\r\n\x1a\n"
+    png += chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 2, 0, 0, 0))
+    png += chunk(b"IDAT", zlib.compress(raw.tobytes(), 6))
+    png += chunk(b"IEND", b"")
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_bytes(png)
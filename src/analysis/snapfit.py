@@ -0,0 +1,161 @@
+"""
+Snap-fit latch design optimizer.
+Every combination of the PicoDimensions latch fields in a design space
+is evaluated at once with the classic cantilever snap-fit formulas:
+
+    strain      e = 1.5 t y / L^2
+    deflection  P = w t^2 E e / (6 L)
+    mating      W = P (mu + tan a) / (1 - mu tan a)
+
+where y is the hook undercut and `a` the hook face angle (lead-in face
+for insertion, return face for retention). The modelled LatchArm hook is
+square; the face angles are the profile the printed hook is assumed to
+get. Strain and insertion force are checked at the deepest printed
+undercut, retention at the shallowest.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from analysis.tolerance import latch_strain
+from mesh.cost import Material
+
+LATCH_FIELDS = (
+    "latch_arm_length", "latch_arm_thickness", "latch_arm_width",
+    "latch_hook_depth", "latch_hook_height",
+)
+
+Range = Tuple[float, float, float]  # (start, stop, step), stop inclusive
+
+
+@dataclass(frozen=True)
+class LatchDesignSpace:
+    """Candidate values of the PicoDimensions latch fields (mm)."""
+    latch_arm_length: Range = (8.0, 20.0, 0.5)
+    latch_arm_thickness: Range = (1.0, 2.5, 0.1)
+    latch_arm_width: Range = (6.0, 14.0, 1.0)
+    latch_hook_depth: Range = (0.5, 2.5, 0.1)
+    latch_hook_height: Range = (1.0, 4.0, 0.5)
+
+    def values(self, name: str) -> np.ndarray:
+        start, stop, step = getattr(self, name)
+        return np.round(np.arange(start, stop + step / 2, step), 6)
+
+    def candidates(self) -> Dict[str, np.ndarray]:
+        """Full factorial grid, one flat array per field."""
+        grids = np.meshgrid(*(self.values(f) for f in LATCH_FIELDS), indexing="ij")
+        return {f: g.ravel() for f, g in zip(LATCH_FIELDS, grids)}
+
+
+@dataclass(frozen=True)
+class LatchRequirements:
+    """Per-latch load targets and the hook profile assumed for forces."""
+    max_insertion: float = 25.0     # N
+    min_retention: float = 15.0     # N
+    min_engagement: float = 0.5     # mm of undercut that must survive printing
+    undercut_margin: float = 0.3    # mm, printed undercut spread (see `analyze tolerance`)
+    max_utilization: float = 0.8    # peak strain allowed, as a fraction of the material's limit
+    lead_angle: float = 30.0        # deg, lead-in face from the insertion direction
+    return_angle: float = 45.0      # deg, return face from the insertion direction
+
+
+def mating_force(deflection_force, friction: float, angle: float) -> np.ndarray:
+    """Force along the insertion direction to push a hook face of `angle` past the ledge."""
+    tan = np.tan(np.radians(angle))
+    if friction * tan >= 1:
+        return np.full(np.shape(deflection_force), np.inf)  # self-locking
+    return deflection_force * (friction + tan) / (1 - friction * tan)
+
+
+def evaluate(candidates: Dict[str, np.ndarray], material: Material,
+             req: LatchRequirements = LatchRequirements()) -> Dict[str, np.ndarray]:
+    """Strain, forces, latch size and feasibility of every candidate."""
+    length = candidates["latch_arm_length"]
+    thickness = candidates["latch_arm_thickness"]
+    width = candidates["latch_arm_width"]
+    depth = candidates["latch_hook_depth"]
+    height = candidates["latch_hook_height"]
+
+    deepest = depth + req.undercut_margin
+    shallowest = np.maximum(depth - req.undercut_margin, 0.0)
+
+    strain = latch_strain(thickness, length, deepest)
+    stiffness = width * thickness ** 3 * material.modulus / (4 * length ** 3)  # N/mm at the tip
+    insertion = mating_force(stiffness * deepest, material.friction, req.lead_angle)
+    retention = mating_force(stiffness * shallowest, material.friction, req.return_angle)
+
+    # Both hook faces must fit within the hook height.
+    profile = depth * (1 / np.tan(np.radians(req.lead_angle)) + 1 / np.tan(np.radians(req.return_angle)))
+
+    feasible = (
+        (strain <= req.max_utilization * material.max_strain)
+        & (insertion <= req.max_insertion)
+        & (retention >= req.min_retention)
+        & (shallowest >= req.min_engagement)
+        & (profile <= height + 1e-9)
+    )
+    return {
+        "strain": strain,
+        "insertion_force": insertion,
+        "retention_force": retention,
+        "size": latch_size(candidates),
+        "feasible": feasible,
+    }
+
+
+def latch_size(candidates: Dict[str, np.ndarray]) -> np.ndarray:
+    """Material volume of the arm plus hook (mm^3), the quantity optimize() minimizes."""
+    return (candidates["latch_arm_length"] * candidates["latch_arm_thickness"]
+            + candidates["latch_hook_depth"] * candidates["latch_hook_height"]) * candidates["latch_arm_width"]
+
+
+@dataclass(frozen=True)
+class LatchDesign:
+    """One evaluated latch candidate."""
+    material: str
+    overrides: Dict[str, float]     # PicoDimensions field -> value
+    strain: float
+    strain_utilization: float       # strain / material max_strain
+    insertion_force: float
+    retention_force: float
+    size: float                     # mm^3
+
+    def to_dict(self) -> dict:
+        return {
+            "material": self.material,
+            "overrides": self.overrides,
+            "strain": round(self.strain, 5),
+            "strain_utilization": round(self.strain_utilization, 3),
+            "insertion_force": round(self.insertion_force, 2),
+            "retention_force": round(self.retention_force, 2),
+            "size": round(self.size, 2),
+        }
+
+
+def optimize(material: Material, space: LatchDesignSpace = LatchDesignSpace(),
+             req: LatchRequirements = LatchRequirements(), top: int = 5) -> List[LatchDesign]:
+    """
+    Smallest feasible latches: retention at or above the target and
+    strain within `max_utilization` of the material's limit. Equal sizes
+    prefer the lower strain, then the lower insertion force.
+    """
+    candidates = space.candidates()
+    result = evaluate(candidates, material, req)
+    index = np.flatnonzero(result["feasible"])
+    order = index[np.lexsort((
+        result["insertion_force"][index], result["strain"][index], np.round(result["size"][index], 6),
+    ))][:top]
+    return [
+        LatchDesign(
+            material=material.name,
+            overrides={f: float(candidates[f][i]) for f in LATCH_FIELDS},
+            strain=float(result["strain"][i]),
+            strain_utilization=float(result["strain"][i] / material.max_strain),
+            insertion_force=float(result["insertion_force"][i]),
+            retention_force=float(result["retention_force"][i]),
+            size=float(result["size"][i]),
+        )
+        for i in order
+    ]
@@ -0,0 +1,175 @@
+"""
+Printability of thin features.
+Points sampled over a part's surface cast rays against the part through
+a bounding volume hierarchy (BVH):
+  inward  (along -normal) the distance to the far side is the local wall
+          thickness; below `min_wall` a wall prints with too few
+          perimeters, below `min_feature` it is narrower than one
+          extrusion line and drops out of the slice
+  outward (along +normal) the distance back to the part is the width of
+          a slot or gap; below `min_gap` it fuses shut
+Thresholds default from the nozzle diameter. Failing samples are
+clustered into reported locations, and each face is coloured by the
+thinnest wall sampled on it for a PLY heatmap.
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from analysis.images import heatmap
+from mesh.bvh import BVH
+from mesh.core import Mesh
+from mesh.io import write_ply
+
+NOZZLE = 0.4               # mm
+LINE_WIDTH_FACTOR = 1.125  # extrusion width / nozzle diameter (slicer default)
+MIN_WALL_LINES = 2         # perimeters a wall needs to print solidly
+DEFAULT_SAMPLES = 50_000
+CLUSTER_RADIUS = 1.0       # mm; failing samples closer than this are one location
+RANGE = 4.0                # rays stop at RANGE x threshold; anything thicker is fine
+_EPS = 1e-4
+
+
+@dataclass(frozen=True)
+class Thresholds:
+    min_wall: float
+    min_feature: float
+    min_gap: float
+
+    @classmethod
+    def for_nozzle(cls, nozzle: float = NOZZLE) -> "Thresholds":
+        line = nozzle * LINE_WIDTH_FACTOR
+        return cls(min_wall=MIN_WALL_LINES * line, min_feature=line, min_gap=nozzle)
+
+
+def sample_points(mesh: Mesh, n: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """Area-weighted surface points plus every face's centroid: ((P, 3), (P,) faces)."""
+    tris = mesh.triangles.astype(np.float64)
+    area = 0.5 * np.linalg.norm(np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0]), axis=1)
+    faces = np.arange(len(tris))
+    if area.sum() > 0 and n:
+        faces = np.concatenate([faces, rng.choice(len(tris), size=n, p=area / area.sum())])
+    u, v = rng.random((2, len(faces)))
+    u[:len(tris)] = v[:len(tris)] = 1 / 3
+    flip = u + v > 1
+    u[flip], v[flip] = 1 - u[flip], 1 - v[flip]
+    t = tris[faces]
+    return t[:, 0] + u[:, None] * (t[:, 1] - t[:, 0]) + v[:, None] * (t[:, 2] - t[:, 0]), faces
+
+
+@dataclass
+class Issue:
+    """A cluster of failing samples."""
+    kind: str          # "feature", "wall" or "gap"
+    centre: Tuple[float, float, float]
+    size: float        # thinnest wall or narrowest gap measured (mm)
+    area: float        # approximate surface area affected (mm^2)
+
+    def to_dict(self) -> dict:
+        return {"kind": self.kind, "centre": [round(c, 2) for c in self.centre],
+                "size": round(self.size, 3), "area": round(self.area, 2)}
+
+
+@dataclass
+class ThicknessResult:
+    name: str
+    mesh: Mesh
+    thresholds: Thresholds
+    points: np.ndarray      # (P, 3)
+    faces: np.ndarray       # (P,) face of each sample
+    thickness: np.ndarray   # (P,) inward ray length (inf: thicker than the range)
+    gap: np.ndarray         # (P,) outward ray length (inf: open)
+    issues: List[Issue]
+    sample_area: float      # surface area per sample (mm^2)
+
+    def face_thickness(self) -> np.ndarray:
+        """Thinnest wall sampled on each face (inf if none)."""
+        out = np.full(len(self.mesh.faces), np.inf)
+        np.minimum.at(out, self.faces, self.thickness)
+        return out
+
+    def summary(self) -> dict:
+        finite = self.thickness[np.isfinite(self.thickness)]
+        gaps = self.gap[np.isfinite(self.gap)]
+        counts = {k: sum(i.kind == k for i in self.issues) for k in ("feature", "wall", "gap")}
+        return {
+            "name": self.name,
+            "thresholds": vars(self.thresholds),
+            "samples": len(self.points),
+            "min_thickness": round(float(finite.min()), 3) if finite.size else None,
+            "min_gap": round(float(gaps.min()), 3) if gaps.size else None,
+            "thin_area": round(float((self.thickness < self.thresholds.min_wall).sum() * self.sample_area), 2),
+            "issues": counts,
+            "locations": [i.to_dict() for i in self.issues],
+        }
+
+
+def _clusters(points: np.ndarray, radius: float) -> np.ndarray:
+    """Connected-component label per point, linking points within `radius`."""
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+    from scipy.spatial import cKDTree
+
+    pairs = cKDTree(points).query_pairs(radius, output_type="ndarray")
+    graph = coo_matrix((np.ones(len(pairs)), (pairs[:, 0], pairs[:, 1])), shape=(len(points),) * 2)
+    return connected_components(graph, directed=False)[1]
+
+
+def _issues(kind: str, points: np.ndarray, values: np.ndarray, mask: np.ndarray,
+            sample_area: float) -> List[Issue]:
+    if not mask.any():
+        return []
+    pts, vals = points[mask], values[mask]
+    labels = _clusters(pts, CLUSTER_RADIUS)
+    issues = []
+    for label in np.unique(labels):
+        member = labels == label
+        worst = int(np.argmin(np.where(member, vals, np.inf)))
+        issues.append(Issue(kind, tuple(float(c) for c in pts[worst]), float(vals[worst]),
+                            float(member.sum() * sample_area)))
+    return issues
+
+
+def analyze(name: str, mesh: Mesh, thresholds: Thresholds | None = None,
+            samples: int = DEFAULT_SAMPLES, seed: int = 0) -> ThicknessResult:
+    """Wall thickness and gap width over the surface of a closed, outward-wound mesh."""
+    thresholds = thresholds or Thresholds.for_nozzle()
+    points, faces = sample_points(mesh, samples, np.random.default_rng(seed))
+    tris = mesh.triangles.astype(np.float64)
+    normals = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    normals /= np.maximum(np.linalg.norm(normals, axis=1), 1e-12)[:, None]
+    n = normals[faces]
+
+    bvh = BVH(mesh)
+    # Rays start just off the surface so they cannot hit their own face
+    thickness = bvh.intersect(points - _EPS * n, -n, RANGE * thresholds.min_wall)[0] + _EPS
+    gap = bvh.intersect(points + _EPS * n, n, RANGE * thresholds.min_gap)[0] + _EPS
+
+    area = 0.5 * np.linalg.norm(np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0]), axis=1)
+    sample_area = float(area.sum() / len(points))
+    feature = thickness < thresholds.min_feature
+    issues = (
+        _issues("feature", points, thickness, feature, sample_area)
+        + _issues("wall", points, thickness, (thickness < thresholds.min_wall) & ~feature, sample_area)
+        + _issues("gap", points, gap, gap < thresholds.min_gap, sample_area)
+    )
+    issues.sort(key=lambda i: (i.kind != "feature", i.size))
+    return ThicknessResult(name, mesh, thresholds, points, faces, thickness, gap, issues, sample_area)
+
+
+def write_report(result: ThicknessResult, output: Path) -> Dict:
+    """`<name>.ply` heatmap (face colour = thinnest wall, 0 to 2x min_wall) and `<name>.json`."""
+    output = Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+    mesh = result.mesh
+    # Unshared vertices, so every face keeps its own colour
+    flat = Mesh(mesh.triangles.reshape(-1, 3), np.arange(len(mesh.faces) * 3).reshape(-1, 3))
+    colours = heatmap(np.minimum(result.face_thickness(), 1e6), 0.0, 2 * result.thresholds.min_wall)
+    write_ply(output / f"{result.name}.ply", flat, np.repeat(colours, 3, axis=0))
+    summary = result.summary()
+    (output / f"{result.name}.json").write_text(json.dumps(summary, indent=2))
+    return summary
@@ -0,0 +1,206 @@
+"""
+Monte Carlo fit-tolerance analysis of the dovetail and latch joints.
+Printed dimensions are sampled from a per-material printer error model
+and the joint fit formulas are evaluated over all samples at once, so
+10^6 virtual prints take well under a second per joint.
+
+Error model, per printed part:
+- every surface is offset outward by an over-extrusion bias that varies
+  across the printer fleet, plus independent per-surface noise;
+- the whole part shrinks by a material-dependent fraction;
+- Z dimensions land on a layer boundary with a random phase.
+External widths (rails) grow by the offset on both sides, internal ones
+(channels) lose it on both; a face measured from a datum on its own part
+(hook or ledge depth, the inner face of a wall) has one printed side, so
+moves by one offset.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from components.dovetail import DovetailDimensions
+from components.latch import LatchDimensions
+from config import PicoDimensions
+from mesh.cost import MATERIALS, Material
+
+DEFAULT_SAMPLES = 200_000
+
+
+@dataclass(frozen=True)
+class PrintError:
+    """Dimensional error distribution of one material across the fleet (mm)."""
+    offset: float          # mean outward surface offset (over-extrusion)
+    offset_sd: float       # printer-to-printer spread of the offset
+    surface_sd: float      # per-surface noise
+    shrink: float          # mean linear shrinkage (fraction)
+    shrink_sd: float
+    layer_height: float = 0.2
+
+
+PRINT_ERRORS: Dict[str, PrintError] = {
+    "PLA": PrintError(offset=0.05, offset_sd=0.05, surface_sd=0.03, shrink=0.002, shrink_sd=0.001),
+    "PETG": PrintError(offset=0.08, offset_sd=0.06, surface_sd=0.05, shrink=0.003, shrink_sd=0.001),
+    "ASA": PrintError(offset=0.04, offset_sd=0.05, surface_sd=0.04, shrink=0.006, shrink_sd=0.002),
+}
+
+EXACT = PrintError(offset=0.0, offset_sd=0.0, surface_sd=0.0, shrink=0.0, shrink_sd=0.0, layer_height=0.0)
+
+
+class PrintedPart:
+    """Sampled printing errors of one part; features of a part share its bias."""
+
+    def __init__(self, error: PrintError, n: int, rng: np.random.Generator):
+        self.error = error
+        self.n = n
+        self.rng = rng
+        self.offset = rng.normal(error.offset, error.offset_sd, n)
+        self.scale = 1.0 - rng.normal(error.shrink, error.shrink_sd, n)
+
+    def _noise(self, surfaces: int) -> np.ndarray:
+        return self.rng.normal(0.0, self.error.surface_sd * np.sqrt(surfaces), self.n)
+
+    def external(self, nominal: float) -> np.ndarray:
+        """XY width of a boss, rail or hook."""
+        return nominal * self.scale + 2 * self.offset + self._noise(2)
+
+    def protrusion(self, nominal: float) -> np.ndarray:
+        """XY depth of a hook or ledge standing off its part: one printed face."""
+        return nominal * self.scale + self.offset + self._noise(1)
+
+    def internal(self, nominal: float) -> np.ndarray:
+        """XY width of a channel or slot."""
+        return nominal * self.scale - 2 * self.offset + self._noise(2)
+
+    def height(self, nominal: float) -> np.ndarray:
+        """Z extent, snapped to a layer boundary."""
+        layer = self.error.layer_height
+        z = nominal * self.scale + self._noise(2)
+        if layer <= 0:
+            return z
+        phase = self.rng.uniform(0.0, layer, self.n)
+        return np.round((z - phase) / layer) * layer + phase
+
+    def position(self, nominal: float) -> np.ndarray:
+        """Location of one surface relative to a datum on another part."""
+        return nominal * self.scale + self._noise(1)
+
+
+@dataclass
+class FitResult:
+    """Outcome of n sampled prints of one joint."""
+    joint: str
+    material: str
+    metric: str               # name of the per-sample fit quantity
+    values: np.ndarray        # (n,) fit quantity, mm
+    too_tight: np.ndarray     # (n,) bool
+    too_loose: np.ndarray
+    no_engagement: np.ndarray
+
+    @property
+    def n(self) -> int:
+        return len(self.values)
+
+    def summary(self) -> Dict:
+        ok = ~(self.too_tight | self.too_loose | self.no_engagement)
+        p5, p50, p95 = np.percentile(self.values, [5, 50, 95])
+        return {
+            "joint": self.joint,
+            "material": self.material,
+            "samples": self.n,
+            "p_too_tight": float(self.too_tight.mean()),
+            "p_too_loose": float(self.too_loose.mean()),
+            "p_no_engagement": float(self.no_engagement.mean()),
+            "p_ok": float(ok.mean()),
+            "metric": self.metric,
+            "p5": round(float(p5), 4),
+            "p50": round(float(p50), 4),
+            "p95": round(float(p95), 4),
+        }
+
+
+def dovetail_fit(dim: DovetailDimensions, material: str, error: PrintError,
+                 n: int, rng: np.random.Generator,
+                 min_gap: float = 0.0, max_gap: float = 0.5) -> FitResult:
+    """
+    Side gap of the male rail in the female channel.
+    Below `min_gap` the rail will not slide in; above `max_gap` the back
+    panel rattles. The channel is captive, so the rail always engages.
+    """
+    channel = PrintedPart(error, n, rng).internal(dim.dovetail_base_width + 2 * dim.dovetail_clearance)
+    rail = PrintedPart(error, n, rng).external(dim.dovetail_base_width)
+    gap = channel - rail
+    return FitResult(
+        "dovetail", material, "gap", gap,
+        too_tight=gap < min_gap,
+        too_loose=gap > max_gap,
+        no_engagement=np.zeros(n, dtype=bool),
+    )
+
+
+def latch_strain(thickness, length, deflection) -> np.ndarray:
+    """Peak strain of a rectangular cantilever deflected at its tip."""
+    return 1.5 * thickness * deflection / length ** 2
+
+
+def latch_fit(dim: LatchDimensions, material: Material, error: PrintError,
+              n: int, rng: np.random.Generator,
+              min_engagement: float = 0.5) -> FitResult:
+    """
+    Undercut of the hook behind the ledge, as PicoTopShell and
+    PicoBasePanel place them. All depths are measured inboard from the
+    shell wall's inner face, which is flush with the base panel's inner
+    edge: the LatchArm's back lies on the wall and its hook reaches
+    `hook_reach`; the LatchLedge stands on the panel edge and reaches
+    `hook_depth`. Sliding the shell on, the arm deflects until its back
+    clears the ledge tip; the undercut is the overlap of hook and ledge.
+    - no engagement: undercut <= 0, the hook never catches;
+    - too loose: undercut < `min_engagement`, it slips off under load;
+    - too tight: passing the ledge strains the arm past `max_strain`.
+    """
+    shell = PrintedPart(error, n, rng)
+    base = PrintedPart(error, n, rng)
+
+    # The wall's inner face bounds the shell cavity, so over-extrusion
+    # moves it (and the arm printed on it) inboard like the faces below
+    arm_back = shell.protrusion(0.0)
+    hook = shell.protrusion(dim.hook_reach)
+    ledge = base.protrusion(dim.hook_depth)
+    deflection = np.maximum(ledge - arm_back, 0.0)
+    undercut = np.minimum(hook, ledge) - arm_back
+
+    # The shell prints top-down: the arm thickness is in XY, its length in Z.
+    strain = latch_strain(shell.external(dim.arm_thickness), shell.height(dim.arm_length),
+                          deflection)
+    no_engagement = undercut <= 0
+    return FitResult(
+        "latch", material.name, "undercut", undercut,
+        too_tight=~no_engagement & (strain > material.max_strain),
+        too_loose=~no_engagement & (undercut < min_engagement),
+        no_engagement=no_engagement,
+    )
+
+
+def latch_dimensions(dim: PicoDimensions) -> LatchDimensions:
+    """Latch geometry as built into the Pico top shell."""
+    return LatchDimensions(
+        arm_length=dim.latch_arm_length,
+        arm_thickness=dim.latch_arm_thickness,
+        arm_width=dim.latch_arm_width,
+        hook_depth=dim.latch_hook_depth,
+        hook_height=dim.latch_hook_height,
+    )
+
+
+def analyze(dim: PicoDimensions | None = None, materials: Sequence[str] = tuple(MATERIALS),
+            n: int = DEFAULT_SAMPLES, seed: int = 0) -> List[FitResult]:
+    """Dovetail and latch fits of the Pico case for each material."""
+    dim = dim or PicoDimensions()
+    rng = np.random.default_rng(seed)
+    results = []
+    for name in materials:
+        error = PRINT_ERRORS[name]
+        results.append(dovetail_fit(DovetailDimensions(), name, error, n, rng))
+        results.append(latch_fit(latch_dimensions(dim), MATERIALS[name], error, n, rng))
+    return results
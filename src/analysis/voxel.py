@@ -0,0 +1,146 @@
+"""Voxel grids, mesh voxelization and signed distance fields."""
+
+from dataclasses import dataclass
+from typing import Sequence, Tuple
+
+import numpy as np
+from scipy import ndimage
+
+from mesh.core import Mesh
+
+# Column sample points are nudged off the grid so rays never run exactly
+# along the axis-aligned edges that dominate CAD meshes.
+_RAY_JITTER = np.array([1.2345e-4, 2.3456e-4])
+
+# Triangle/column pairs tested per batch (bounds peak memory)
+_BATCH_PAIRS = 1_000_000
+
+
+@dataclass(frozen=True)
+class Grid:
+    """
+    Regular voxel grid.
+    origin: (3,) corner of voxel (0, 0, 0) in mm.
+    pitch: voxel edge length in mm.
+    shape: (nx, ny, nz) voxel counts.
+    """
+    origin: Tuple[float, float, float]
+    pitch: float
+    shape: Tuple[int, int, int]
+
+    @classmethod
+    def around(cls, bounds: np.ndarray, pitch: float, pad: int = 1) -> "Grid":
+        """Smallest grid covering `bounds` ((2, 3) min/max) plus `pad` voxels per side."""
+        bounds = np.asarray(bounds, dtype=np.float64)
+        lo = np.floor(bounds[0] / pitch) * pitch - pad * pitch
+        hi = np.ceil(bounds[1] / pitch) * pitch + pad * pitch
+        shape = np.round((hi - lo) / pitch).astype(int)
+        return cls(tuple(float(v) for v in lo), float(pitch), tuple(int(n) for n in shape))
+
+    def centres(self, axis: int) -> np.ndarray:
+        """Voxel centre coordinates along one axis."""
+        return self.origin[axis] + (np.arange(self.shape[axis]) + 0.5) * self.pitch
+
+    def index(self, point) -> Tuple[int, int, int]:
+        """Voxel containing a point (clamped to the grid)."""
+        ijk = np.floor((np.asarray(point) - self.origin) / self.pitch).astype(int)
+        return tuple(int(v) for v in np.clip(ijk, 0, np.array(self.shape) - 1))
+
+    def point(self, index) -> np.ndarray:
+        """Centre of a voxel."""
+        return np.asarray(self.origin) + (np.asarray(index) + 0.5) * self.pitch
+
+    @property
+    def voxel_volume(self) -> float:
+        return self.pitch ** 3
+
+
+def voxelize(mesh: Mesh, grid: Grid) -> np.ndarray:
+    """
+    Boolean occupancy of a closed mesh on `grid` (voxel centres inside).
+    Casts one +Z ray per (x, y) column through all triangles at once and
+    fills between crossings by parity.
+    """
+    nx, ny, nz = grid.shape
+    x0, y0, z0 = grid.origin
+    p = grid.pitch
+    # uint8 wraps at 256, which keeps the parity we need.
+    crossings = np.zeros((nx, ny, nz + 1), dtype=np.uint8)
+
+    tri = mesh.triangles
+    a, b, c = tri[:, 0], tri[:, 1], tri[:, 2]
+    area = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])
+    keep = np.abs(area) > 1e-12  # vertical faces never cross a vertical ray
+    tri, area = tri[keep], area[keep]
+
+    jx, jy = _RAY_JITTER * p
+    lo = tri[:, :, :2].min(axis=1)
+    hi = tri[:, :, :2].max(axis=1)
+    i0 = np.maximum(np.ceil((lo[:, 0] - x0 - jx) / p - 0.5), 0).astype(np.int64)
+    i1 = np.minimum(np.floor((hi[:, 0] - x0 - jx) / p - 0.5), nx - 1).astype(np.int64)
+    j0 = np.maximum(np.ceil((lo[:, 1] - y0 - jy) / p - 0.5), 0).astype(np.int64)
+    j1 = np.minimum(np.floor((hi[:, 1] - y0 - jy) / p - 0.5), ny - 1).astype(np.int64)
+    wi = np.maximum(i1 - i0 + 1, 0)
+    wj = np.maximum(j1 - j0 + 1, 0)
+    counts = wi * wj
+
+    # Batch triangles so each batch expands to at most _BATCH_PAIRS columns.
+    ends = np.cumsum(counts)
+    start = 0
+    while start < len(tri):
+        base = ends[start - 1] if start else 0
+        stop = max(int(np.searchsorted(ends, base + _BATCH_PAIRS, side="right")), start + 1)
+        sel = slice(start, stop)
+        n = counts[sel]
+        owner = np.repeat(np.arange(start, stop), n)
+        local = np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+        ii = i0[owner] + local // wj[owner]
+        jj = j0[owner] + local % wj[owner]
+        px = x0 + (ii + 0.5) * p + jx
+        py = y0 + (jj + 0.5) * p + jy
+
+        t = tri[owner]
+        # Barycentric weights of the column in the triangle's XY projection
+        w0 = ((t[:, 1, 0] - px) * (t[:, 2, 1] - py) - (t[:, 1, 1] - py) * (t[:, 2, 0] - px)) / area[owner]
+        w1 = ((t[:, 2, 0] - px) * (t[:, 0, 1] - py) - (t[:, 2, 1] - py) * (t[:, 0, 0] - px)) / area[owner]
+        w2 = 1.0 - w0 - w1
+        hit = (w0 >= 0) & (w1 >= 0) & (w2 >= 0)
+
+        z = w0[hit] * t[hit, 0, 2] + w1[hit] * t[hit, 1, 2] + w2[hit] * t[hit, 2, 2]
+        # First voxel whose centre lies above the crossing
+        kk = np.clip(np.ceil((z - z0) / p - 0.5), 0, nz).astype(np.int64)
+        np.add.at(crossings, (ii[hit], jj[hit], kk), 1)
+        start = stop
+
+    inside = np.cumsum(crossings, axis=2, dtype=np.uint8) & 1
+    return inside[:, :, :nz].astype(bool)
+
+
+def voxelize_union(meshes: Sequence[Mesh], grid: Grid) -> np.ndarray:
+    """
+    Occupancy of the union of closed meshes. Each is voxelized on its own:
+    parity-filling overlapping shells together would empty their overlap.
+    """
+    solid = np.zeros(grid.shape, dtype=bool)
+    for mesh in meshes:
+        solid |= voxelize(mesh, grid)
+    return solid
+
+
+def surface(solid: np.ndarray) -> np.ndarray:
+    """Solid voxels with at least one empty face neighbour."""
+    return solid & ~ndimage.binary_erosion(solid, border_value=0)
+
+
+def signed_distance(solid: np.ndarray, pitch: float) -> np.ndarray:
+    """
+    Signed distance (mm) from each voxel centre to the solid's surface
+    voxels: positive in free space, negative inside the solid.
+    One Euclidean distance transform to the surface shell serves both
+    signs (half a voxel coarser than two separate transforms).
+    """
+    shell = surface(solid)
+    if not shell.any():
+        return np.full(solid.shape, np.inf, dtype=np.float32)
+    distance = ndimage.distance_transform_edt(~shell, sampling=pitch).astype(np.float32)
+    return np.where(solid, -distance, distance)
@@ -1,31 +1,33 @@
 import anchorscad as ad
 from anchorscad import datatree
 from dataclasses import field
+from typing import Dict, Tuple
 
 from config import PicoDimensions
-from registry import register_part
+from registry import FloatParam, register_part, register_variant
+from pipeline.library import prebuilt
+from pipeline.render import vitamin_detail
+from vitamins.detail import PROXY
 from vitamins.motherboard_assembly import MotherboardAssemblyPico
-from components.case_pico import PicoBasePanel, PicoBackPanel, PicoTopShell
+from components.case_pico import PICO_VARIATION, WITH_HDD, PicoBasePanel, PicoBackPanel, PicoTopShell
 
 @register_part("pico_base_assembly", part_type="assembly")
 def create_pico_base_assembly() -> ad.Shape:
-    return PicoBaseAssembly(dim=PicoDimensions())
-
-@register_part("pico_assembly", part_type="assembly")
-def create_pico_assembly() -> ad.Shape:
-    return PicoAssembly(dim=PicoDimensions())
-
-@register_part("pico_assembly_exploded", part_type="assembly")
-def create_pico_assembly_exploded() -> ad.Shape:
-    return PicoAssembly(dim=PicoDimensions(), explode=30.0)
-
-@register_part("pico_assembly_hdd", part_type="assembly")
-def create_pico_assembly_hdd() -> ad.Shape:
-    return PicoAssembly(dim=PicoDimensions(), with_hdd=True)
-
-@register_part("pico_assembly_hdd_exploded", part_type="assembly")
-def create_pico_assembly_hdd_exploded() -> ad.Shape:
-    return PicoAssembly(dim=PicoDimensions(), with_hdd=True, explode=30.0)
+    return PicoBaseAssembly(dim=PicoDimensions(), detail=vitamin_detail())
+
+@register_part("pico_assembly", part_type="assembly", params={
+    "with_hdd": WITH_HDD,
+    "variation": PICO_VARIATION,
+    "explode": FloatParam(0.0, min=0.0, max=100.0, doc="Vertical separation of parts (mm)"),
+})
+def create_pico_assembly(with_hdd=False, variation="normal", explode=0.0) -> ad.Shape:
+    return PicoAssembly(dim=PicoDimensions(variation=variation), with_hdd=with_hdd, explode=explode,
+                        detail=vitamin_detail())
+
+# Gallery presets (cadeng.yaml)
+register_variant("pico_assembly_exploded", "pico_assembly", explode=30.0)
+register_variant("pico_assembly_hdd", "pico_assembly", with_hdd=True)
+register_variant("pico_assembly_hdd_exploded", "pico_assembly", with_hdd=True, explode=30.0)
 
 @ad.shape
 @datatree
@@ -33,20 +35,23 @@ class PicoBaseAssembly(ad.CompositeShape):
     """
     Base panel with motherboard assembly. No top shell.
     Useful for verifying motherboard fit and IO alignment on the base panel.
+    `detail` is the vitamins' level of detail; the factory takes it from the
+    render quality profile.
     """
     dim: PicoDimensions
+    detail: str = PROXY
 
     def build(self) -> ad.Maker:
         wall = self.dim.wall_thickness
 
         base_panel = PicoBasePanel(dim=self.dim)
-        assembly = base_panel.solid("base_panel").at("centre")
+        assembly = prebuilt(base_panel).solid("base_panel").at("centre")
 
-        mobo_assy = MotherboardAssemblyPico(dim=self.dim)
+        mobo_assy = MotherboardAssemblyPico(dim=self.dim, detail=self.detail)
         mobo_z = wall / 2 + self.dim.standoff_height + self.dim.mobo.pcb_thickness / 2
 
         assembly.add_at(
-            mobo_assy.solid("mobo_assembly").at("centre"),
+            prebuilt(mobo_assy).solid("mobo_assembly").at("centre"),
             post=ad.translate([0, 0, mobo_z])
         )
 
@@ -61,14 +66,20 @@ class PicoAssembly(ad.CompositeShape):
     Three-piece design: base panel + back panel + top shell.
     Back panel connects to base via dovetails, top shell retained by 4 snap-fit latches.
     When explode > 0, components are separated vertically.
+    Vitamins inside use `detail`; the factory takes it from the render
+    quality profile.
     """
     dim: PicoDimensions
     with_hdd: bool = False
     explode: float = 0.0
+    detail: str = PROXY
 
-    def build(self) -> ad.Maker:
+    def layout(self) -> Dict[str, Tuple[ad.Shape, ad.GMatrix]]:
+        """
+        Each part of the assembly and the transform applied to its centre.
+        Shared with the interior clearance analysis.
+        """
         wall = self.dim.wall_thickness
-        panel_width = self.dim.pico_case_width
         panel_depth = self.dim.pico_case_depth
 
         if self.with_hdd:
@@ -80,18 +91,12 @@ class PicoAssembly(ad.CompositeShape):
 
         # 1. Base Panel
         base_panel = PicoBasePanel(dim=self.dim, with_hdd=self.with_hdd)
-        assembly = base_panel.solid("base_panel").at("centre")
 
         # 2. Motherboard Assembly
-        mobo_assy = MotherboardAssemblyPico(dim=self.dim)
+        mobo_assy = MotherboardAssemblyPico(dim=self.dim, detail=self.detail)
         mobo_z = wall / 2 + self.dim.standoff_height + self.dim.mobo.pcb_thickness / 2
         mobo_z += self.explode
 
-        assembly.add_at(
-            mobo_assy.solid("mobo_assembly").at("centre"),
-            post=ad.translate([0, 0, mobo_z])
-        )
-
         # 3. Back Panel
         # Back panel center: at back edge of base plate, wall centered on back_wall_height
         back_panel = PicoBackPanel(dim=self.dim, with_hdd=self.with_hdd)
@@ -99,19 +104,29 @@ class PicoAssembly(ad.CompositeShape):
         back_panel_z = wall / 2 + shell_height / 2
         back_panel_z += self.explode
 
-        assembly.add_at(
-            back_panel.solid("back_panel").colour("lightblue").at("centre"),
-            post=ad.translate([0, back_panel_y, back_panel_z])
-        )
-
         # 4. Top Shell — slides straight on, retained by 4 snap-fit latches
         top_shell = PicoTopShell(dim=self.dim, with_hdd=self.with_hdd)
         top_z = wall / 2 + shell_height / 2
         top_z += 2 * self.explode
 
-        assembly.add_at(
-            top_shell.solid("top_shell").at("centre"),
-            post=ad.translate([0, 0, top_z])
-        )
+        return {
+            "base_panel": (base_panel, ad.IDENTITY),
+            "mobo_assembly": (mobo_assy, ad.translate([0, 0, mobo_z])),
+            "back_panel": (back_panel, ad.translate([0, back_panel_y, back_panel_z])),
+            "top_shell": (top_shell, ad.translate([0, 0, top_z])),
+        }
+
+    def build(self) -> ad.Maker:
+        parts = self.layout()
+
+        base_panel, _ = parts["base_panel"]
+        assembly = prebuilt(base_panel).solid("base_panel").at("centre")
+
+        for name in ("mobo_assembly", "back_panel", "top_shell"):
+            shape, post = parts[name]
+            maker = prebuilt(shape).solid(name)
+            if name == "back_panel":
+                maker = maker.colour("lightblue")
+            assembly.add_at(maker.at("centre"), post=post)
 
         return assembly
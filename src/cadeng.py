@@ -0,0 +1,67 @@
+"""Access to the cadeng gallery configuration (cadeng.yaml)."""
+
+from pathlib import Path
+from typing import Dict, List
+
+import yaml
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+CADENG_CONFIG = REPO_ROOT / "cadeng.yaml"
+
+
+def load_config(path: Path = CADENG_CONFIG) -> dict:
+    """Parse cadeng.yaml into a plain dict."""
+    with open(path) as f:
+        return yaml.safe_load(f) or {}
+
+
+def stl_models(config: dict | None = None) -> List[str]:
+    """Names of the models flagged `stl: true` (printed components)."""
+    if config is None:
+        config = load_config()
+    return [m["name"] for m in config.get("models", []) if m.get("stl")]
+
+
+def expected_shells(config: dict | None = None) -> Dict[str, int]:
+    """Bodies each printed model should render as (`shells`, default 1)."""
+    if config is None:
+        config = load_config()
+    return {m["name"]: int(m.get("shells", 1)) for m in config.get("models", []) if m.get("stl")}
+
+
+def stl_scales(config: dict | None = None) -> List[int]:
+    """Percent scales STLs are released at (`stl.scales`; 100 is the part itself)."""
+    if config is None:
+        config = load_config()
+    return [int(s) for s in config.get("stl", {}).get("scales", [100])]
+
+
+def cameras(config: dict | None = None) -> Dict[str, str]:
+    """Camera name -> OpenSCAD gimbal camera string."""
+    if config is None:
+        config = load_config()
+    return dict(config.get("cameras", {}))
+
+
+def camera_set(angles=None, config: dict | None = None) -> List[str]:
+    """Resolve a model's `angles` (set name, camera name or list) to camera names."""
+    if config is None:
+        config = load_config()
+    sets = config.get("camera_sets", {})
+    if angles is None:
+        angles = "default"
+    while isinstance(angles, str) and angles in sets:
+        angles = sets[angles]
+    return [angles] if isinstance(angles, str) else list(angles)
+
+
+def gallery_views(config: dict | None = None) -> Dict[str, List[str]]:
+    """Model (and `<model>_<variant>`) name -> camera names to render."""
+    if config is None:
+        config = load_config()
+    views = {}
+    for model in config.get("models", []):
+        views[model["name"]] = camera_set(model.get("angles"), config)
+        for variant in model.get("variants", []):
+            views[f"{model['name']}_{variant['name']}"] = camera_set(variant.get("angles"), config)
+    return views
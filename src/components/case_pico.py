@@ -3,35 +3,44 @@ from anchorscad import datatree
 from dataclasses import field
 
 from config import PicoDimensions
-from registry import register_part
+from registry import BoolParam, EnumParam, register_part, register_variant
 from vitamins.storage import SSD25Dimensions
 from components.dovetail import DovetailDimensions, FemaleDovetail, MaleDovetail
 from components.latch import LatchDimensions, LatchArm, LatchLedge
 
 
-@register_part("pico_base_panel", part_type="component")
-def create_pico_base_panel() -> ad.Shape:
-    return PicoBasePanel(dim=PicoDimensions())
+PICO_VARIATION = EnumParam(("normal", "server"), default="normal",
+                           doc="server adds interior height for 2.5\" drives")
+WITH_HDD = BoolParam(doc="Raise the case for a top-mounted 2.5\" SSD/HDD")
 
-@register_part("pico_base_panel_hdd", part_type="component")
-def create_pico_base_panel_hdd() -> ad.Shape:
-    return PicoBasePanel(dim=PicoDimensions(), with_hdd=True)
 
-@register_part("pico_back_panel", part_type="component")
-def create_pico_back_panel() -> ad.Shape:
-    return PicoBackPanel(dim=PicoDimensions())
+@register_part("pico_base_panel", part_type="component", params={
+    "with_hdd": WITH_HDD,
+    "ventilation": BoolParam(doc="Honeycomb vents under the motherboard"),
+    "center_cutout": BoolParam(doc="Square cutout under the motherboard"),
+})
+def create_pico_base_panel(with_hdd=False, ventilation=False, center_cutout=False) -> ad.Shape:
+    return PicoBasePanel(dim=PicoDimensions(), with_hdd=with_hdd,
+                         ventilation=ventilation, center_cutout=center_cutout)
 
-@register_part("pico_back_panel_hdd", part_type="component")
-def create_pico_back_panel_hdd() -> ad.Shape:
-    return PicoBackPanel(dim=PicoDimensions(), with_hdd=True)
+@register_part("pico_back_panel", part_type="component", params={
+    "with_hdd": WITH_HDD,
+    "variation": PICO_VARIATION,
+})
+def create_pico_back_panel(with_hdd=False, variation="normal") -> ad.Shape:
+    return PicoBackPanel(dim=PicoDimensions(variation=variation), with_hdd=with_hdd)
 
-@register_part("pico_top_shell", part_type="component")
-def create_pico_top_shell() -> ad.Shape:
-    return PicoTopShell(dim=PicoDimensions())
+@register_part("pico_top_shell", part_type="component", params={
+    "with_hdd": WITH_HDD,
+    "variation": PICO_VARIATION,
+})
+def create_pico_top_shell(with_hdd=False, variation="normal") -> ad.Shape:
+    return PicoTopShell(dim=PicoDimensions(variation=variation), with_hdd=with_hdd)
 
-@register_part("pico_top_shell_hdd", part_type="component")
-def create_pico_top_shell_hdd() -> ad.Shape:
-    return PicoTopShell(dim=PicoDimensions(), with_hdd=True)
+# Gallery presets (cadeng.yaml)
+register_variant("pico_base_panel_hdd", "pico_base_panel", with_hdd=True)
+register_variant("pico_back_panel_hdd", "pico_back_panel", with_hdd=True)
+register_variant("pico_top_shell_hdd", "pico_top_shell", with_hdd=True)
 
 
 # Dovetail positions: 25% and 75% of inner width
@@ -91,6 +100,29 @@ class PicoBasePanel(ad.CompositeShape):
                 post=ad.translate([cx_rel, cy_rel, 0])
             )
 
+        # Ventilation honeycomb over the motherboard area
+        if self.ventilation:
+            vent_border = 20.0
+            vent_r = self.dim.honeycomb_radius + 1
+            vent_w = self.dim.mobo.width - 2 * vent_border
+            vent_d = self.dim.mobo.depth - 2 * vent_border
+            x_spacing = vent_r * 2.5
+            y_spacing = vent_r * 2.5 * 3 ** 0.5 / 2
+            cols = int(vent_w // x_spacing)
+            rows = int(vent_d // y_spacing)
+            x0 = x_offset_center + standoff_x_offset + vent_border + (vent_w - cols * x_spacing) / 2
+            y0 = y_offset_center + vent_border + (vent_d - rows * y_spacing) / 2
+
+            vent = ad.Cylinder(r=vent_r, h=panel_thickness + 0.2, fn=6)
+            for row in range(rows):
+                for col in range(cols):
+                    x = x0 + col * x_spacing
+                    y = y0 + row * y_spacing + (y_spacing / 2 if col % 2 else 0)
+                    shape.add_at(
+                        vent.hole(f"vent_{row}_{col}").at("centre"),
+                        post=ad.translate([x, y, 0])
+                    )
+
         # Standoff Bosses and Holes
         for i, loc in enumerate(self.dim.standoff_locations):
             x_scad, y_scad = loc
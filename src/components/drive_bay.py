@@ -0,0 +1,159 @@
+import anchorscad as ad
+from anchorscad import datatree
+from dataclasses import field
+from typing import Dict, Tuple
+
+from config import MinimalDimensions
+from registry import EnumParam, IntParam, register_part, register_variant
+from pipeline.library import prebuilt
+from vitamins.storage import HDD35, HDD35Dimensions, SSD25, SSD25Dimensions
+
+# Drive kinds a bay can hold: vitamin class and its dimensions
+DRIVES = {
+    "hdd35": (HDD35, HDD35Dimensions),
+    "ssd25": (SSD25, SSD25Dimensions),
+}
+
+
+@register_part("drive_bay_array", part_type="assembly", params={
+    "columns": IntParam(2, min=1, max=16, doc="Bays side by side"),
+    "rows": IntParam(1, min=1, max=8, doc="Bays stacked vertically"),
+    "drive": EnumParam(tuple(DRIVES), default="hdd35", doc="Drive form factor"),
+})
+def create_drive_bay_array(columns=2, rows=1, drive="hdd35") -> ad.Shape:
+    return DriveBayArray(dim=MinimalDimensions(), columns=columns, rows=rows, drive=drive)
+
+@register_part("drive_bay_cell", part_type="component")
+def create_drive_bay_cell() -> ad.Shape:
+    return DriveBayCell(dim=MinimalDimensions(), with_drive=False)
+
+# Gallery presets (cadeng.yaml)
+register_variant("nas_8bay", "drive_bay_array", columns=4, rows=2)
+register_variant("nas_16bay", "drive_bay_array", columns=4, rows=4)
+
+
+@datatree
+class DriveBayDimensions:
+    """Rail bay around one drive (legacy nas_2disk/hotswap_rails.scad)."""
+    rail_height: float = 10.0
+    floor_thickness: float = 2.0
+    row_gap: float = 5.0               # between stacked rows
+    screw_clearance_hole: float = 3.6  # fits M3 and 6-32 drive screws
+
+
+@ad.shape
+@datatree
+class DriveBayCell(ad.CompositeShape):
+    """
+    One drive bay: floor tray, a side rail either side with screw holes
+    on the drive's side mounting holes, and the drive itself.
+    Rail width comes from `nas_2disk_rail_width`, so a row of two HDD
+    cells plus `nas_2disk_gap` spans `nas_2disk_width` less walls and padding.
+    Origin at the centre of the cell's bounding box.
+    """
+    dim: MinimalDimensions = field(default_factory=MinimalDimensions)
+    bay: DriveBayDimensions = field(default_factory=DriveBayDimensions)
+    drive: str = "hdd35"
+    with_drive: bool = True
+
+    @property
+    def drive_dim(self):
+        return DRIVES[self.drive][1]()
+
+    @property
+    def width(self) -> float:
+        return self.drive_dim.width + 2 * self.dim.nas_2disk_rail_width
+
+    @property
+    def length(self) -> float:
+        return self.drive_dim.length
+
+    @property
+    def height(self) -> float:
+        return self.bay.floor_thickness + max(self.drive_dim.height, self.bay.rail_height)
+
+    def build(self) -> ad.Maker:
+        drive_dim = self.drive_dim
+        rail_w = self.dim.nas_2disk_rail_width
+        floor_top = -self.height / 2 + self.bay.floor_thickness
+
+        floor = ad.Box([self.width, self.length, self.bay.floor_thickness])
+        # The floor's frame becomes the cell's: lift the frame so the floor sits at the bottom
+        cell = floor.solid("floor").colour("silver").at(
+            "centre", post=ad.translate([0, 0, self.height / 2 - self.bay.floor_thickness / 2])
+        )
+
+        rail = ad.Box([rail_w, self.length, self.bay.rail_height])
+        hole = ad.Cylinder(r=self.bay.screw_clearance_hole / 2, h=rail_w + 0.02)
+        for side, sign in (("left", -1), ("right", 1)):
+            rail_x = sign * (drive_dim.width + rail_w) / 2
+            cell.add_at(
+                rail.solid(f"{side}_rail").colour("orange").at("centre"),
+                post=ad.translate([rail_x, 0, floor_top + self.bay.rail_height / 2])
+            )
+            for i, (_, y, z) in enumerate(drive_dim.side_hole_locations):
+                if (i < 2) != (sign < 0) or z > self.bay.rail_height:
+                    continue
+                cell.add_at(
+                    hole.hole(f"{side}_screw_{i}").at("centre"),
+                    post=ad.translate([rail_x, y - self.length / 2, floor_top + z]) * ad.rotY(90)
+                )
+
+        if self.with_drive:
+            vitamin, _ = DRIVES[self.drive]
+            cell.add_at(
+                vitamin(dim=drive_dim).solid("drive").at("centre"),
+                post=ad.translate([0, 0, floor_top + drive_dim.height / 2])
+            )
+
+        return cell
+
+
+@ad.shape
+@datatree
+class DriveBayArray(ad.CompositeShape):
+    """
+    columns x rows grid of identical DriveBayCells, gap `nas_2disk_gap`
+    between columns. The cell is built once and placed by transform, so
+    under a MeshLibrary (or with mesh.parts.instanced_mesh) its booleans
+    are solved once however many bays there are.
+    Origin at the centre of the first (bottom-left) cell.
+    """
+    dim: MinimalDimensions = field(default_factory=MinimalDimensions)
+    bay: DriveBayDimensions = field(default_factory=DriveBayDimensions)
+    drive: str = "hdd35"
+    columns: int = 2
+    rows: int = 1
+    with_drives: bool = True
+
+    def cell(self) -> DriveBayCell:
+        return DriveBayCell(dim=self.dim, bay=self.bay, drive=self.drive, with_drive=self.with_drives)
+
+    @property
+    def pitch(self) -> Tuple[float, float]:
+        """(x, z) distance between neighbouring cell centres."""
+        cell = self.cell()
+        return cell.width + self.dim.nas_2disk_gap, cell.height + self.bay.row_gap
+
+    @property
+    def inner_width(self) -> float:
+        """Width of the bays and the gaps between them."""
+        return self.columns * self.pitch[0] - self.dim.nas_2disk_gap
+
+    def layout(self) -> Dict[str, Tuple[ad.Shape, ad.GMatrix]]:
+        """Each bay and the transform applied to its centre."""
+        cell = self.cell()
+        pitch_x, pitch_z = self.pitch
+        return {
+            f"bay_{row}_{col}": (cell, ad.translate([col * pitch_x, 0, row * pitch_z]))
+            for row in range(self.rows)
+            for col in range(self.columns)
+        }
+
+    def build(self) -> ad.Maker:
+        bays = iter(self.layout().items())
+        name, (cell, _) = next(bays)
+        assembly = prebuilt(cell).solid(name).at("centre")
+        for name, (cell, post) in bays:
+            assembly.add_at(prebuilt(cell).solid(name).at("centre"), post=post)
+        return assembly
@@ -0,0 +1,98 @@
+import anchorscad as ad
+from anchorscad import datatree
+from dataclasses import field
+from typing import Tuple
+
+from mesh.glyphs import DEFAULT_TOLERANCE, glyph_library
+from pipeline.render import current_emboss_version
+from registry import register_part
+
+
+@register_part("info_embosser", part_type="component")
+def create_info_embosser() -> ad.Shape:
+    return InfoEmbosser(part_name="CASE-FP-PICO")
+
+
+@ad.shape
+@datatree(frozen=True)
+class EmbossedText(ad.Shape):
+    """
+    Lines of text as one polygon extruded `depth` along +Z, from cached
+    glyph outlines (mesh.glyphs) instead of OpenSCAD text().
+    Origin at the start of the first line's baseline; lines step down -Y.
+    """
+    lines: Tuple[str, ...] = ("TEXT",)
+    size: float = 3.0
+    depth: float = 0.4
+    font: str = "Liberation Sans:style=Bold"
+    spacing: float = 1.0        # multiplier on glyph advances
+    line_spacing: float = 2.0   # multiplier on size between baselines
+    halign: str = "left"        # left, center or right
+    tolerance: float = DEFAULT_TOLERANCE
+
+    def outline(self):
+        """(points (N, 2), paths) of the laid-out text."""
+        return glyph_library(self.font, self.size, self.tolerance).layout(
+            self.lines, self.spacing, self.line_spacing, self.halign
+        )
+
+    def render(self, renderer):
+        points, paths = self.outline()
+        polygon = renderer.model.Polygon(points.tolist(), [p.tolist() for p in paths])
+        return renderer.add(renderer.model.Linear_Extrude(self.depth)(polygon))
+
+    @ad.anchor("base")
+    def base(self):
+        """Start of the first line's baseline, on the bottom face."""
+        return ad.IDENTITY
+
+    @ad.anchor("centre")
+    def centre(self):
+        """Centre of the text's bounding box."""
+        points, _ = self.outline()
+        (x0, y0), (x1, y1) = points.min(axis=0), points.max(axis=0)
+        return ad.translate([(x0 + x1) / 2, (y0 + y1) / 2, self.depth / 2])
+
+
+@ad.shape
+@datatree
+class InfoEmbosser(ad.CompositeShape):
+    """
+    Embossed metadata block (legacy modules/util/info_embosser.scad, SPEC §1.4):
+    "PART: <version> <part_name>" over "<location> <designer> <year>".
+    Text lies on the XZ plane and extrudes along +Y, reading upright
+    from +Y, so it drops onto a front panel's interior face unrotated.
+    Origin at the first line's baseline start; `version` defaults to the
+    render's emboss_version() stamp.
+    """
+    part_name: str = "Unnamed Part"
+    version: str = field(default_factory=current_emboss_version)
+    designer: str = "NCRMRO"
+    year: int = 2025
+    location: str = "HTX"
+    text_size: float = 3.0
+    emboss_height: float = 0.4
+    line_spacing: float = 2.0
+    font: str = "Liberation Sans:style=Bold"
+    spacing: float = 1.0
+    halign: str = "left"  # "right" to anchor to a right margin
+
+    @property
+    def lines(self) -> Tuple[str, ...]:
+        return (
+            f"PART: {self.version} {self.part_name}",
+            f"{self.location} {self.designer} {self.year}",
+        )
+
+    def build(self) -> ad.Maker:
+        text = EmbossedText(
+            lines=self.lines, size=self.text_size, depth=self.emboss_height, font=self.font,
+            spacing=self.spacing, line_spacing=self.line_spacing, halign=self.halign,
+        )
+        # Legacy rotate([-90, 180, 0]): X mirrored, text up -> +Z, extrusion -> +Y
+        return text.solid("text").colour("white").at("base", post=ad.rotY(180) * ad.rotX(-90))
+
+    @ad.anchor("base")
+    def base(self):
+        """First line's baseline start, on the face that sits against the panel."""
+        return ad.IDENTITY
@@ -14,6 +14,11 @@ class LatchDimensions:
     hook_depth: float = 2.0
     hook_height: float = 1.5
 
+    @property
+    def hook_reach(self) -> float:
+        """Hook face distance from the back of the arm (the wall it hangs on)."""
+        return self.arm_thickness + self.hook_depth
+
 
 @ad.shape
 @datatree
@@ -34,7 +39,7 @@ class LatchArm(ad.CompositeShape):
         shape = arm.solid("arm").colour("orange").at("centre")
 
         # Hook at bottom - protrudes outward (+Y direction)
-        hook = ad.Box([dd.arm_width, dd.hook_depth + dd.arm_thickness, dd.hook_height])
+        hook = ad.Box([dd.arm_width, dd.hook_reach, dd.hook_height])
         hook_y = dd.hook_depth / 2
         hook_z = -dd.arm_length / 2 + dd.hook_height / 2
 
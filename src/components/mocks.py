@@ -4,7 +4,7 @@ from config import CommonDimensions, MinimalDimensions
 
 # Imports from vitamins
 from vitamins.motherboard import MiniItxMotherboard
-from vitamins.storage import SSD25
+from vitamins.storage import HDD35, SSD25
 from vitamins.ram import RamStick
 from vitamins.cooling import Fan, FAN_120_25, FAN_120_15
 from vitamins.psu import SfxPsu, FlexAtxPsu
@@ -17,6 +17,10 @@ def create_motherboard() -> ad.Shape:
 def create_ssd() -> ad.Shape:
     return SSD25()
 
+@register_part("hdd_3_5", part_type="vitamin")
+def create_hdd() -> ad.Shape:
+    return HDD35()
+
 @register_part("ram_stick", part_type="vitamin")
 def create_ram() -> ad.Shape:
     return RamStick()
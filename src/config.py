@@ -76,7 +76,7 @@ class PicoDimensions(CommonDimensions):
     latch_arm_length: float = 12.0
     latch_arm_thickness: float = 1.5
     latch_arm_width: float = 10.0
-    latch_hook_depth: float = 2.0
+    latch_hook_depth: float = 0.9  # deeper over-strains PLA and ASA arms (bin/analyze tolerance)
     latch_hook_height: float = 1.5
 
     # Variation: "normal" or "server"
@@ -0,0 +1,123 @@
+"""
+Bounding volume hierarchy over a triangle mesh, queried for many rays
+or boxes at once: each step of the traversal tests every live
+(query, node) pair with NumPy instead of walking the tree per query.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+from mesh.core import Mesh
+
+_EPS = 1e-4   # mm; hits closer than this to the ray origin are ignored
+
+
+class BVH:
+    """Median split on the longest axis; leaves hold up to `leaf_size` faces."""
+
+    def __init__(self, mesh: Mesh, leaf_size: int = 4):
+        self.triangles = mesh.triangles.astype(np.float64)
+        centroids = self.triangles.mean(axis=1)
+        tri_lo, tri_hi = self.triangles.min(axis=1), self.triangles.max(axis=1)
+        self.order = np.arange(len(self.triangles))
+        lo, hi, left, right, start, count = [], [], [], [], [], []
+
+        def node(first, last):
+            idx = self.order[first:last]
+            lo.append(tri_lo[idx].min(axis=0) if len(idx) else np.zeros(3))
+            hi.append(tri_hi[idx].max(axis=0) if len(idx) else np.zeros(3))
+            left.append(-1), right.append(-1), start.append(first), count.append(last - first)
+            return len(lo) - 1
+
+        stack = [(node(0, len(self.order)), 0, len(self.order))]
+        while stack:
+            i, first, last = stack.pop()
+            if last - first <= leaf_size:
+                continue
+            idx = self.order[first:last]
+            c = centroids[idx]
+            axis = int(np.argmax(np.ptp(c, axis=0)))
+            mid = (last - first) // 2
+            self.order[first:last] = idx[np.argpartition(c[:, axis], mid)]
+            count[i] = 0   # internal
+            left[i], right[i] = node(first, first + mid), node(first + mid, last)
+            stack += [(left[i], first, first + mid), (right[i], first + mid, last)]
+
+        self.lo, self.hi = np.array(lo), np.array(hi)
+        self.left, self.right = np.array(left), np.array(right)
+        self.start, self.count = np.array(start), np.array(count)
+
+    def intersect(self, origins: np.ndarray, directions: np.ndarray,
+                  t_max: float | np.ndarray = np.inf) -> Tuple[np.ndarray, np.ndarray]:
+        """Distance to and face of the first hit per ray (inf and -1 where none within t_max)."""
+        n = len(origins)
+        best_t = np.broadcast_to(np.asarray(t_max, dtype=np.float64), (n,)).copy()
+        best_f = np.full(n, -1)
+        d = np.where(np.abs(directions) < 1e-12, 1e-12, directions)
+        inv = 1.0 / d
+        rays = np.arange(n)
+        nodes = np.zeros(n, dtype=np.int64)
+        while rays.size:
+            t0 = (self.lo[nodes] - origins[rays]) * inv[rays]
+            t1 = (self.hi[nodes] - origins[rays]) * inv[rays]
+            near = np.maximum(np.minimum(t0, t1).max(axis=1), 0.0)
+            far = np.maximum(t0, t1).min(axis=1)
+            live = (near <= far) & (near <= best_t[rays])
+            rays, nodes = rays[live], nodes[live]
+
+            leaf = self.count[nodes] > 0
+            if leaf.any():
+                r, faces = self._leaf_faces(rays[leaf], nodes[leaf])
+                t = ray_triangle(origins[r], d[r], self.triangles[faces])
+                np.minimum.at(best_t, r, t)
+                won = t == best_t[r]
+                best_f[r[won]] = faces[won]
+            inner = ~leaf
+            rays = np.concatenate([rays[inner], rays[inner]])
+            nodes = np.concatenate([self.left[nodes[inner]], self.right[nodes[inner]]])
+        best_t[best_f < 0] = np.inf
+        return best_t, best_f
+
+    def overlapping(self, lo: np.ndarray, hi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(query, face) index pairs whose boxes overlap, for query boxes (Q, 3) lo/hi."""
+        queries = np.arange(len(lo))
+        nodes = np.zeros(len(lo), dtype=np.int64)
+        found_q, found_f = [], []
+        while queries.size:
+            live = np.all((lo[queries] <= self.hi[nodes]) & (hi[queries] >= self.lo[nodes]), axis=1)
+            queries, nodes = queries[live], nodes[live]
+            leaf = self.count[nodes] > 0
+            if leaf.any():
+                q, faces = self._leaf_faces(queries[leaf], nodes[leaf])
+                tri_lo, tri_hi = self.triangles[faces].min(axis=1), self.triangles[faces].max(axis=1)
+                hit = np.all((lo[q] <= tri_hi) & (hi[q] >= tri_lo), axis=1)
+                found_q.append(q[hit]), found_f.append(faces[hit])
+            inner = ~leaf
+            queries = np.concatenate([queries[inner], queries[inner]])
+            nodes = np.concatenate([self.left[nodes[inner]], self.right[nodes[inner]]])
+        if not found_q:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate(found_q), np.concatenate(found_f)
+
+    def _leaf_faces(self, queries: np.ndarray, leaves: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Expand (query, leaf) pairs to (query, face) pairs."""
+        counts = self.count[leaves]
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        return np.repeat(queries, counts), self.order[np.repeat(self.start[leaves], counts) + offsets]
+
+
+def ray_triangle(o: np.ndarray, d: np.ndarray, tri: np.ndarray) -> np.ndarray:
+    """Möller-Trumbore distance per (ray, triangle) pair; inf for misses."""
+    e1, e2 = tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0]
+    p = np.cross(d, e2)
+    det = np.einsum("ij,ij->i", e1, p)
+    ok = np.abs(det) > 1e-12
+    inv = np.divide(1.0, det, out=np.zeros_like(det), where=ok)
+    s = o - tri[:, 0]
+    u = np.einsum("ij,ij->i", s, p) * inv
+    q = np.cross(s, e1)
+    v = np.einsum("ij,ij->i", d, q) * inv
+    t = np.einsum("ij,ij->i", e2, q) * inv
+    hit = ok & (u >= 0) & (v >= 0) & (u + v <= 1) & (t > _EPS)
+    return np.where(hit, t, np.inf)
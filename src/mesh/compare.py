@@ -0,0 +1,212 @@
+"""
+Geometric comparison of two meshes: volume, bounding box and symmetric
+Hausdorff distance between their surfaces.
+"""
+
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from mesh.core import Mesh, translation
+from mesh.properties import mass_properties
+
+
+def sample_surface(mesh: Mesh, n: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Area-weighted random surface points plus every vertex and points along
+    every edge at the sample spacing, with the index of a triangle each
+    point lies on: ((P, 3) points, (P,) faces). The edge points keep long
+    thin triangles, which random samples rarely hit, findable by position.
+    """
+    tris = mesh.triangles.astype(np.float64)
+    owner = np.full(len(mesh.vertices), -1)
+    owner[mesh.faces.ravel()] = np.repeat(np.arange(len(mesh.faces)), 3)
+    used = owner >= 0
+    vertices = np.asarray(mesh.vertices, dtype=np.float64)[used]
+    area = 0.5 * np.linalg.norm(np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0]), axis=1)
+    if area.sum() <= 0:
+        return vertices, owner[used]
+    pick = rng.choice(len(tris), size=n, p=area / area.sum())
+    u, v = rng.random((2, n))
+    flip = u + v > 1
+    u[flip], v[flip] = 1 - u[flip], 1 - v[flip]
+    t = tris[pick]
+    points = t[:, 0] + u[:, None] * (t[:, 1] - t[:, 0]) + v[:, None] * (t[:, 2] - t[:, 0])
+
+    spacing = np.sqrt(area.sum() / n)
+    start = tris.reshape(-1, 3)
+    end = np.roll(tris, -1, axis=1).reshape(-1, 3)
+    steps = np.floor(np.linalg.norm(end - start, axis=1) / spacing).astype(np.int64)
+    edge = np.repeat(np.arange(len(start)), steps)
+    k = np.arange(steps.sum()) - np.repeat(np.cumsum(steps) - steps, steps) + 1
+    f = (k / (steps[edge] + 1))[:, None]
+    edge_points = start[edge] + f * (end[edge] - start[edge])
+
+    return (
+        np.concatenate([points, vertices, edge_points]),
+        np.concatenate([pick, owner[used], edge // 3]),
+    )
+
+
+def point_triangle_distance(p: np.ndarray, a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """Distance from each point to the closest point of its triangle (all (N, 3))."""
+    ab, ac, ap = b - a, c - a, p - a
+    d1 = np.einsum("ij,ij->i", ab, ap)
+    d2 = np.einsum("ij,ij->i", ac, ap)
+    bp = p - b
+    d3 = np.einsum("ij,ij->i", ab, bp)
+    d4 = np.einsum("ij,ij->i", ac, bp)
+    cp = p - c
+    d5 = np.einsum("ij,ij->i", ab, cp)
+    d6 = np.einsum("ij,ij->i", ac, cp)
+    va = d3 * d6 - d5 * d4
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+
+    # Interior of the face by default, then overwrite edge and vertex regions.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        denom = va + vb + vc
+        v = np.where(denom != 0, vb / denom, 0.0)
+        w = np.where(denom != 0, vc / denom, 0.0)
+        closest = a + v[:, None] * ab + w[:, None] * ac
+
+        edge_ab = (vc <= 0) & (d1 >= 0) & (d3 <= 0)
+        t = d1 / (d1 - d3)
+        closest[edge_ab] = (a + t[:, None] * ab)[edge_ab]
+        edge_ac = (vb <= 0) & (d2 >= 0) & (d6 <= 0)
+        t = d2 / (d2 - d6)
+        closest[edge_ac] = (a + t[:, None] * ac)[edge_ac]
+        edge_bc = (va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0)
+        t = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+        closest[edge_bc] = (b + t[:, None] * (c - b))[edge_bc]
+
+    at_a = (d1 <= 0) & (d2 <= 0)
+    at_b = (d3 >= 0) & (d4 <= d3)
+    at_c = (d6 >= 0) & (d5 <= d6)
+    closest[at_a] = a[at_a]
+    closest[at_b] = b[at_b]
+    closest[at_c] = c[at_c]
+    return np.linalg.norm(p - closest, axis=1)
+
+
+def _directed(points: np.ndarray, target: Mesh, target_points: np.ndarray,
+              target_faces: np.ndarray, k: int = 8) -> np.ndarray:
+    """Distance from each point to `target`, checking the triangles of its k nearest samples."""
+    k = min(k, len(target_points))
+    _, nearest = cKDTree(target_points).query(points, k=k)
+    faces = target_faces[np.asarray(nearest).reshape(len(points), k)]
+    tris = target.triangles[faces.ravel()]
+    p = np.repeat(points, k, axis=0)
+    d = point_triangle_distance(p, tris[:, 0], tris[:, 1], tris[:, 2])
+    return d.reshape(-1, k).min(axis=1)
+
+
+def hausdorff(a: Mesh, b: Mesh, samples: int = 100_000, seed: int = 0) -> Tuple[float, float]:
+    """
+    Symmetric Hausdorff distance between two surfaces and its sampling
+    resolution (mm). Each surface is sampled (vertices included) and the
+    exact distance from every sample to the other surface is measured
+    against the triangles nearest to it; a far point lying between
+    samples can be missed by up to about `resolution`.
+    """
+    rng = np.random.default_rng(seed)
+    pa, fa = sample_surface(a, samples, rng)
+    pb, fb = sample_surface(b, samples, rng)
+    ab = _directed(pa, b, pb, fb)
+    ba = _directed(pb, a, pa, fa)
+    area = max(mass_properties(a).area, mass_properties(b).area)
+    resolution = float(np.sqrt(area / samples))
+    return float(max(ab.max(), ba.max())), resolution
+
+
+@dataclass(frozen=True)
+class MeshComparison:
+    """Differences of `b` relative to `a` (mm, mm^3)."""
+    volume_a: float
+    volume_b: float
+    extents_a: Tuple[float, float, float]
+    extents_b: Tuple[float, float, float]
+    offset: Tuple[float, float, float]   # bbox centre of b minus that of a
+    hausdorff: float                     # after aligning bbox centres
+    resolution: float
+
+    @property
+    def volume_error(self) -> float:
+        """Relative volume difference."""
+        return abs(self.volume_b - self.volume_a) / max(abs(self.volume_a), 1e-9)
+
+    @property
+    def extents_error(self) -> float:
+        """Largest bounding-box size difference along any axis."""
+        return float(np.max(np.abs(np.subtract(self.extents_b, self.extents_a))))
+
+    def to_dict(self) -> dict:
+        return {
+            "volume_a": round(self.volume_a, 3),
+            "volume_b": round(self.volume_b, 3),
+            "volume_error": round(self.volume_error, 5),
+            "extents_a": [round(v, 3) for v in self.extents_a],
+            "extents_b": [round(v, 3) for v in self.extents_b],
+            "extents_error": round(self.extents_error, 3),
+            "offset": [round(v, 3) for v in self.offset],
+            "hausdorff": round(self.hausdorff, 3),
+            "resolution": round(self.resolution, 3),
+        }
+
+
+def compare(a: Mesh, b: Mesh, samples: int = 100_000, seed: int = 0,
+            align: bool = True) -> MeshComparison:
+    """
+    Compare two meshes. By default shape is compared with both bounding
+    boxes centred, so a pure change of origin shows up only in `offset`;
+    with align=False a moved part also counts in `hausdorff`.
+    """
+    centre_a = a.bounds.mean(axis=0)
+    centre_b = b.bounds.mean(axis=0)
+    aligned = b.transformed(translation(centre_a - centre_b)) if align else b
+    distance, resolution = hausdorff(a, aligned, samples, seed)
+    return MeshComparison(
+        volume_a=abs(mass_properties(a).volume),
+        volume_b=abs(mass_properties(b).volume),
+        extents_a=tuple(float(v) for v in a.extents),
+        extents_b=tuple(float(v) for v in b.extents),
+        offset=tuple(float(v) for v in centre_b - centre_a),
+        hausdorff=distance,
+        resolution=resolution,
+    )
+
+
+def vertex_distances(mesh: Mesh, target: Mesh, samples: int = 100_000, seed: int = 0) -> np.ndarray:
+    """(V,) distance from each vertex of `mesh` to the surface of `target`."""
+    if len(target.faces) == 0:
+        return np.full(len(mesh.vertices), np.inf)
+    points, faces = sample_surface(target, samples, np.random.default_rng(seed))
+    return _directed(np.asarray(mesh.vertices, dtype=np.float64), target, points, faces)
+
+
+@dataclass(frozen=True)
+class MeshDiff:
+    """Change from `a` to `b` in place (no alignment), with per-vertex distances."""
+    a: Mesh
+    b: Mesh
+    comparison: MeshComparison
+    added: np.ndarray     # (Vb,) distance of each vertex of b from a
+    removed: np.ndarray   # (Va,) distance of each vertex of a from b
+
+    @property
+    def changed(self) -> bool:
+        """True when the surfaces differ by more than the sampling resolution."""
+        return self.comparison.hausdorff > self.comparison.resolution
+
+
+def diff(a: Mesh, b: Mesh, samples: int = 100_000, seed: int = 0) -> MeshDiff:
+    """Geometric diff of two versions of a part, in their own coordinates."""
+    return MeshDiff(
+        a=a,
+        b=b,
+        comparison=compare(a, b, samples, seed, align=False),
+        added=vertex_distances(b, a, samples, seed),
+        removed=vertex_distances(a, b, samples, seed),
+    )
@@ -0,0 +1,115 @@
+"""Indexed triangle mesh shared by the mesh tools."""
+
+import hashlib
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+
+
+@dataclass
+class Mesh:
+    """
+    Indexed triangle mesh.
+    vertices: (N, 3) coordinates in mm.
+    faces: (M, 3) vertex indices, counter-clockwise seen from outside.
+    """
+    vertices: np.ndarray
+    faces: np.ndarray
+
+    def __post_init__(self):
+        self.vertices = np.asarray(self.vertices).reshape(-1, 3)
+        self.faces = np.asarray(self.faces).reshape(-1, 3)
+
+    @classmethod
+    def from_triangles(cls, triangles: np.ndarray, decimals: int = 6) -> "Mesh":
+        """Build an indexed mesh from a (M, 3, 3) triangle soup, merging shared vertices."""
+        triangles = np.asarray(triangles, dtype=np.float64).reshape(-1, 3, 3)
+        flat = triangles.reshape(-1, 3)
+        vertices, inverse = np.unique(
+            np.round(flat, decimals), axis=0, return_inverse=True
+        )
+        return cls(vertices, inverse.reshape(-1, 3))
+
+    @classmethod
+    def from_manifold(cls, manifold) -> "Mesh":
+        """Convert a manifold3d.Manifold (in-process render result)."""
+        m = manifold.to_mesh()
+        return cls(np.asarray(m.vert_properties)[:, :3], np.asarray(m.tri_verts))
+
+    @classmethod
+    def box(cls, size, centre=(0.0, 0.0, 0.0)) -> "Mesh":
+        """Axis-aligned box, outward-facing triangles."""
+        corners = np.array(
+            [[x, y, z] for z in (-0.5, 0.5) for y in (-0.5, 0.5) for x in (-0.5, 0.5)]
+        )
+        faces = np.array([
+            [0, 2, 1], [1, 2, 3],  # -Z
+            [4, 5, 6], [5, 7, 6],  # +Z
+            [0, 1, 4], [1, 5, 4],  # -Y
+            [2, 6, 3], [3, 6, 7],  # +Y
+            [0, 4, 2], [2, 4, 6],  # -X
+            [1, 3, 5], [3, 7, 5],  # +X
+        ])
+        return cls(corners * np.asarray(size, dtype=np.float64) + centre, faces)
+
+    @classmethod
+    def concatenate(cls, meshes: Iterable["Mesh"]) -> "Mesh":
+        """Merge several meshes into one, without welding vertices."""
+        meshes = list(meshes)
+        if not meshes:
+            return cls(np.zeros((0, 3)), np.zeros((0, 3), dtype=np.int64))
+        offsets = np.cumsum([0] + [len(m.vertices) for m in meshes[:-1]])
+        vertices = np.concatenate([m.vertices for m in meshes])
+        faces = np.concatenate([m.faces + off for m, off in zip(meshes, offsets)])
+        return cls(vertices, faces)
+
+    @property
+    def triangles(self) -> np.ndarray:
+        """(M, 3, 3) array of triangle corner coordinates."""
+        return self.vertices[self.faces]
+
+    @property
+    def bounds(self) -> np.ndarray:
+        """(2, 3) array of [min, max] corners."""
+        if len(self.vertices) == 0:
+            return np.zeros((2, 3))
+        return np.array([self.vertices.min(axis=0), self.vertices.max(axis=0)])
+
+    @property
+    def extents(self) -> np.ndarray:
+        return self.bounds[1] - self.bounds[0]
+
+    def transformed(self, matrix: np.ndarray) -> "Mesh":
+        """Return a copy transformed by a 4x4 homogeneous matrix."""
+        matrix = np.asarray(matrix, dtype=np.float64)
+        vertices = self.vertices @ matrix[:3, :3].T + matrix[:3, 3]
+        faces = self.faces
+        # Mirroring flips winding; restore outward orientation.
+        if np.linalg.det(matrix[:3, :3]) < 0:
+            faces = faces[:, ::-1]
+        return Mesh(vertices, faces.copy())
+
+
+def translation(offset) -> np.ndarray:
+    """4x4 translation matrix."""
+    m = np.eye(4)
+    m[:3, 3] = offset
+    return m
+
+
+def rotation_z(degrees: float) -> np.ndarray:
+    """4x4 rotation about the Z axis."""
+    a = np.radians(degrees)
+    c, s = np.cos(a), np.sin(a)
+    m = np.eye(4)
+    m[:2, :2] = [[c, -s], [s, c]]
+    return m
+
+
+def mesh_hash(mesh: Mesh) -> str:
+    """Content hash of a mesh's geometry (stable across processes)."""
+    h = hashlib.sha256()
+    h.update(np.ascontiguousarray(mesh.vertices, dtype=np.float64).tobytes())
+    h.update(np.ascontiguousarray(mesh.faces, dtype=np.int64).tobytes())
+    return h.hexdigest()
@@ -0,0 +1,131 @@
+"""
+Filament mass, print time and cost estimates from mesh properties.
+Geometry is reduced once per part (cached by STL digest); estimates
+for every material x infill combination are then a broadcast over that
+small set of numbers, so a full release report needs no slicer.
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence
+
+import numpy as np
+
+from mesh.core import Mesh
+from mesh.properties import MassProperties, mass_properties
+
+FILAMENT_DIAMETER = 1.75
+
+
+@dataclass(frozen=True)
+class Material:
+    """Filament material."""
+    name: str
+    density: float          # g/cm^3
+    price_per_kg: float     # currency units per kg
+    max_flow: float         # sustained volumetric flow, mm^3/s
+    modulus: float          # flexural modulus of printed parts, MPa
+    max_strain: float       # permissible strain for a single snap-fit assembly
+    friction: float         # printed part on printed part
+
+
+MATERIALS: Dict[str, Material] = {
+    m.name: m for m in [
+        Material("PLA", density=1.24, price_per_kg=20.0, max_flow=12.0,
+                 modulus=3300.0, max_strain=0.020, friction=0.35),
+        Material("PETG", density=1.27, price_per_kg=22.0, max_flow=9.0,
+                 modulus=2000.0, max_strain=0.040, friction=0.30),
+        Material("ASA", density=1.07, price_per_kg=28.0, max_flow=10.0,
+                 modulus=2000.0, max_strain=0.025, friction=0.45),
+    ]
+}
+
+
+@dataclass(frozen=True)
+class PrintSettings:
+    """Slicer settings the estimate depends on."""
+    line_width: float = 0.45
+    layer_height: float = 0.2
+    perimeters: int = 3
+    layer_change_time: float = 1.5  # s per layer (travel, retraction, z-hop)
+
+
+@dataclass(frozen=True)
+class CostEstimate:
+    material: str
+    infill: float
+    mass_g: float
+    filament_m: float
+    time_s: float
+    cost: float
+
+    def to_dict(self) -> dict:
+        return {
+            "material": self.material,
+            "infill": self.infill,
+            "mass_g": round(self.mass_g, 2),
+            "filament_m": round(self.filament_m, 3),
+            "time_s": round(self.time_s, 1),
+            "cost": round(self.cost, 3),
+        }
+
+
+def estimate(props: MassProperties, materials: Sequence[Material],
+             infills: Sequence[float],
+             settings: PrintSettings = PrintSettings()) -> List[CostEstimate]:
+    """
+    Estimate every material x infill combination at once.
+    The part is modelled as a solid shell (perimeters x line width over
+    the whole surface) around a sparse interior at the given infill ratio.
+    """
+    volume = abs(props.volume)
+    shell = min(volume, props.area * settings.perimeters * settings.line_width)
+    interior = volume - shell
+
+    infill = np.asarray(infills, dtype=np.float64)[None, :]             # (1, I)
+    density = np.array([m.density for m in materials])[:, None]         # (M, 1)
+    price = np.array([m.price_per_kg for m in materials])[:, None]
+    flow = np.array([m.max_flow for m in materials])[:, None]
+
+    extruded = shell + infill * interior                                # (1, I) mm^3
+    mass = extruded * density / 1000.0                                  # (M, I) g
+    filament = extruded / (np.pi * (FILAMENT_DIAMETER / 2) ** 2) / 1000.0
+    height = props.bounds[1][2] - props.bounds[0][2]
+    layers = np.ceil(height / settings.layer_height)
+    time = extruded / flow + layers * settings.layer_change_time
+    cost = mass / 1000.0 * price
+
+    filament = np.broadcast_to(filament, mass.shape)
+    return [
+        CostEstimate(
+            material=m.name,
+            infill=float(infill[0, j]),
+            mass_g=float(mass[i, j]),
+            filament_m=float(filament[i, j]),
+            time_s=float(time[i, j]),
+            cost=float(cost[i, j]),
+        )
+        for i, m in enumerate(materials)
+        for j in range(infill.shape[1])
+    ]
+
+
+def cached_mass_properties(key: str, load: Callable[[], Mesh],
+                           cache_dir: Path | None = None) -> MassProperties:
+    """
+    mass_properties() of the mesh `load` returns, memoized on disk under
+    `key` (the STL digest or render cache key). A hit never loads the mesh:
+    hashing its vertices would cost about as much as the reduction itself.
+    """
+    if cache_dir is None:
+        return mass_properties(load())
+
+    cache_path = Path(cache_dir) / f"{key}.json"
+    if cache_path.exists():
+        return MassProperties.from_dict(json.loads(cache_path.read_text()))
+
+    props = mass_properties(load())
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(json.dumps(props.to_dict()))
+    return props
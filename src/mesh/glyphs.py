@@ -0,0 +1,278 @@
+"""
+Glyph outlines for embossed text, cached on disk as polygons.
+OpenSCAD's text() re-triangulates every glyph through FreeType on each
+render. Here each glyph of a font is flattened to polygons once
+(fontTools; curves subdivided to `tolerance` mm) and cached in
+`<cache>/<key>.npz`, keyed by font file digest, size and tolerance.
+Strings are laid out by offsetting cached contours with NumPy.
+Outer contours run counter-clockwise and holes clockwise, so the result
+fills the same under OpenSCAD's even-odd polygon() and manifold's
+positive fill rule.
+"""
+
+import hashlib
+import os
+import platform
+import shutil
+import subprocess
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from pipeline.cache import SRC_ROOT, cache_key
+
+GLYPH_CACHE_DIR = SRC_ROOT.parent / "build" / ".cache" / "glyphs"
+DEFAULT_TOLERANCE = 0.01  # mm, max distance of a flattened curve from the true one
+
+# Used when the requested family is not installed (same style)
+FALLBACK_FAMILIES = ("Liberation Sans", "DejaVu Sans")
+
+
+def _font_dirs() -> List[Path]:
+    system = platform.system()
+    if system == "Windows":
+        return [Path(os.environ.get("WINDIR", "C:\\Windows")) / "Fonts"]
+    if system == "Darwin":
+        return [Path("/Library/Fonts"), Path("/System/Library/Fonts"), Path.home() / "Library/Fonts"]
+    return [Path("/usr/share/fonts"), Path("/usr/local/share/fonts"),
+            Path.home() / ".fonts", Path.home() / ".local/share/fonts"]
+
+
+def parse_font(spec: str) -> Tuple[str, str]:
+    """("Liberation Sans", "Bold") from an OpenSCAD font spec "Liberation Sans:style=Bold"."""
+    family, _, rest = spec.partition(":")
+    style = "Regular"
+    for field in rest.split(":"):
+        key, _, value = field.partition("=")
+        if key.strip().lower() == "style" and value:
+            style = value.strip()
+    return family.strip(), style
+
+
+@lru_cache(maxsize=1)
+def _font_index() -> List[Tuple[str, str, Path]]:
+    """(family, style, path) of installed fonts, lower-cased, from their name tables."""
+    from fontTools.ttLib import TTFont, TTLibError
+
+    index = []
+    for root in _font_dirs():
+        if not root.is_dir():
+            continue
+        for path in sorted(root.rglob("*")):
+            if path.suffix.lower() not in (".ttf", ".otf"):
+                continue
+            try:
+                font = TTFont(path, lazy=True)
+                names = font["name"]
+                # Typographic family/subfamily (16/17) where present, else legacy (1/2)
+                family = names.getDebugName(16) or names.getDebugName(1)
+                style = names.getDebugName(17) or names.getDebugName(2) or "Regular"
+                font.close()
+            except (TTLibError, KeyError, OSError):
+                continue
+            if family:
+                index.append((family.lower(), style.lower(), path))
+    return index
+
+
+@lru_cache(maxsize=32)
+def resolve_font(spec: str) -> Path:
+    """Font file for an OpenSCAD font spec (or a path to a .ttf/.otf)."""
+    if Path(spec).suffix.lower() in (".ttf", ".otf") and Path(spec).is_file():
+        return Path(spec)
+    if shutil.which("fc-match"):
+        # fontconfig is what OpenSCAD itself uses
+        result = subprocess.run(["fc-match", "--format=%{file}", spec], capture_output=True, text=True)
+        if result.returncode == 0 and Path(result.stdout).is_file():
+            return Path(result.stdout)
+
+    family, style = parse_font(spec)
+    index = _font_index()
+    for candidate in (family, *FALLBACK_FAMILIES):
+        matches = [(s, p) for f, s, p in index if f == candidate.lower()]
+        for s, path in matches:
+            if s == style.lower():
+                return path
+        if matches and candidate == family:
+            return matches[0][1]
+    raise FileNotFoundError(f"no font file for '{spec}' (or {', '.join(FALLBACK_FAMILIES)})")
+
+
+@lru_cache(maxsize=32)
+def _file_digest(path: Path, mtime: float) -> str:
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def _quadratic(p0, p1, p2, tolerance: float) -> np.ndarray:
+    """Points after p0 on a quadratic Bezier, at most `tolerance` from the curve."""
+    p0, p1, p2 = (np.asarray(p, dtype=float) for p in (p0, p1, p2))
+    n = max(1, int(np.ceil(np.sqrt(np.linalg.norm(p0 - 2 * p1 + p2) / (8 * tolerance)))))
+    t = np.linspace(0, 1, n + 1)[1:, None]
+    return (1 - t) ** 2 * p0 + 2 * (1 - t) * t * p1 + t ** 2 * p2
+
+
+def _cubic(p0, p1, p2, p3, tolerance: float) -> np.ndarray:
+    p0, p1, p2, p3 = (np.asarray(p, dtype=float) for p in (p0, p1, p2, p3))
+    bend = max(np.linalg.norm(p0 - 2 * p1 + p2), np.linalg.norm(p1 - 2 * p2 + p3))
+    n = max(1, int(np.ceil(np.sqrt(3 * bend / (4 * tolerance)))))
+    t = np.linspace(0, 1, n + 1)[1:, None]
+    return ((1 - t) ** 3 * p0 + 3 * (1 - t) ** 2 * t * p1
+            + 3 * (1 - t) * t ** 2 * p2 + t ** 3 * p3)
+
+
+def _signed_area(contour: np.ndarray) -> float:
+    x, y = contour[:, 0], contour[:, 1]
+    return 0.5 * float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+
+
+def flatten_glyph(glyph_set, name: str, scale: float, tolerance: float) -> List[np.ndarray]:
+    """Contours of a glyph in mm, outer counter-clockwise, holes clockwise."""
+    from fontTools.pens.basePen import BasePen
+
+    contours: List[np.ndarray] = []
+
+    class Pen(BasePen):
+        def __init__(self):
+            super().__init__(glyph_set)
+            self.points: List[np.ndarray] = []
+
+        def _moveTo(self, pt):
+            self.points = [np.array([pt], dtype=float)]
+
+        def _lineTo(self, pt):
+            self.points.append(np.array([pt], dtype=float))
+
+        def _qCurveToOne(self, pt1, pt2):
+            self.points.append(_quadratic(self._getCurrentPoint(), pt1, pt2, tolerance / scale))
+
+        def _curveToOne(self, pt1, pt2, pt3):
+            self.points.append(_cubic(self._getCurrentPoint(), pt1, pt2, pt3, tolerance / scale))
+
+        def _closePath(self):
+            contour = np.concatenate(self.points) * scale
+            if len(contour) > 1 and np.allclose(contour[0], contour[-1]):
+                contour = contour[:-1]
+            if len(contour) >= 3:
+                contours.append(contour)
+            self.points = []
+
+        _endPath = _closePath
+
+    glyph_set[name].draw(Pen())
+    # Fonts wind outer contours either way round (TrueType clockwise, CFF counter-clockwise)
+    if sum(_signed_area(c) for c in contours) < 0:
+        contours = [c[::-1] for c in contours]
+    return contours
+
+
+class GlyphLibrary:
+    """Flattened glyphs of one font at one size, persisted between runs."""
+
+    def __init__(self, font: str, size: float, tolerance: float = DEFAULT_TOLERANCE,
+                 cache_dir: Path = GLYPH_CACHE_DIR):
+        self.font_path = resolve_font(font)
+        self.size = size
+        self.tolerance = tolerance
+        digest = _file_digest(self.font_path, self.font_path.stat().st_mtime)
+        self.path = Path(cache_dir) / f"{cache_key(font=digest, size=size, tolerance=tolerance)}.npz"
+        self.flattened = 0   # glyphs flattened (not found in the cache) by this instance
+        self._glyphs: Dict[str, Tuple[float, List[np.ndarray]]] = {}
+        self._font = None
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with np.load(self.path) as data:
+                arrays = {k: data[k] for k in data.files}
+        except (OSError, ValueError):
+            return
+        stops = arrays["contour_stops"]
+        starts = np.concatenate([[0], stops[:-1]]).astype(np.int64)
+        contours = [arrays["points"][a:b] for a, b in zip(starts, stops)]
+        offsets = arrays["glyph_contours"]
+        for i, (code, advance) in enumerate(zip(arrays["codepoints"], arrays["advances"])):
+            self._glyphs[chr(code)] = (float(advance), contours[offsets[i]:offsets[i + 1]])
+
+    def _save(self):
+        chars = sorted(self._glyphs)
+        contours = [c for ch in chars for c in self._glyphs[ch][1]]
+        counts = [len(self._glyphs[ch][1]) for ch in chars]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.stem}.tmp{os.getpid()}.npz")
+        np.savez(
+            tmp,
+            codepoints=np.array([ord(ch) for ch in chars], dtype=np.int32),
+            advances=np.array([self._glyphs[ch][0] for ch in chars]),
+            glyph_contours=np.concatenate([[0], np.cumsum(counts)]).astype(np.int64),
+            contour_stops=np.cumsum([len(c) for c in contours]).astype(np.int64),
+            points=np.concatenate(contours) if contours else np.zeros((0, 2)),
+        )
+        tmp.replace(self.path)
+
+    def glyphs(self, chars: Sequence[str]) -> Dict[str, Tuple[float, List[np.ndarray]]]:
+        """(advance, contours) per character, flattening and caching any not seen before."""
+        missing = sorted(set(chars) - set(self._glyphs))
+        if missing:
+            with self._lock:
+                missing = [ch for ch in missing if ch not in self._glyphs]
+                if missing:
+                    self._flatten(missing)
+                    self._save()
+        return {ch: self._glyphs[ch] for ch in set(chars)}
+
+    def _flatten(self, chars: Sequence[str]):
+        from fontTools.ttLib import TTFont
+
+        if self._font is None:
+            self._font = TTFont(self.font_path)
+        font = self._font
+        scale = self.size / font["head"].unitsPerEm
+        cmap = font.getBestCmap() or {}
+        glyph_set = font.getGlyphSet()
+        metrics = font["hmtx"].metrics
+        for ch in chars:
+            name = cmap.get(ord(ch), ".notdef")
+            self._glyphs[ch] = (
+                metrics[name][0] * scale, flatten_glyph(glyph_set, name, scale, self.tolerance)
+            )
+            self.flattened += 1
+
+    def layout(self, lines: Sequence[str], spacing: float = 1.0, line_spacing: float = 1.0,
+               halign: str = "left") -> Tuple[np.ndarray, List[np.ndarray]]:
+        """
+        (points (N, 2), paths) of text lines, first baseline at y=0 and
+        each next line `size * line_spacing` lower; `spacing` scales
+        glyph advances as in OpenSCAD text().
+        """
+        glyphs = self.glyphs("".join(lines))
+        blocks, contour_lengths = [], []
+        for row, line in enumerate(lines):
+            if not line:
+                continue
+            advances = np.array([glyphs[ch][0] for ch in line]) * spacing
+            x = np.concatenate([[0.0], np.cumsum(advances)[:-1]])
+            width = advances.sum()
+            x += {"left": 0.0, "center": -width / 2, "centre": -width / 2, "right": -width}[halign]
+            origin = np.column_stack([x, np.full(len(line), -row * self.size * line_spacing)])
+            contours = [glyphs[ch][1] for ch in line]
+            flat = [c for cs in contours for c in cs]
+            if not flat:
+                continue
+            # Each glyph's offset, repeated over its points
+            counts = [sum(len(c) for c in cs) for cs in contours]
+            blocks.append(np.concatenate(flat) + np.repeat(origin, counts, axis=0))
+            contour_lengths.extend(len(c) for c in flat)
+        points = np.concatenate(blocks) if blocks else np.zeros((0, 2))
+        stops = np.cumsum(contour_lengths, dtype=np.int64)
+        paths = [np.arange(a, b) for a, b in zip(np.concatenate([[0], stops[:-1]]), stops)]
+        return points, paths
+
+
+@lru_cache(maxsize=16)
+def glyph_library(font: str, size: float, tolerance: float = DEFAULT_TOLERANCE) -> GlyphLibrary:
+    """Shared in-process GlyphLibrary for a font and size, cached in GLYPH_CACHE_DIR."""
+    return GlyphLibrary(font, size, tolerance, GLYPH_CACHE_DIR)
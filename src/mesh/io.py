@@ -0,0 +1,166 @@
+"""Mesh file formats: STL (read/write), 3MF and PLY (write)."""
+
+import re
+import zipfile
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+
+from mesh.core import Mesh
+
+_STL_RECORD = np.dtype([
+    ("normal", "<f4", (3,)),
+    ("vertices", "<f4", (3, 3)),
+    ("attr", "<u2"),
+])
+
+_VERTEX_RE = re.compile(rb"vertex\s+(\S+)\s+(\S+)\s+(\S+)")
+
+
+def _is_binary_stl(data: bytes) -> bool:
+    if len(data) < 84:
+        return False
+    count = int(np.frombuffer(data, dtype="<u4", count=1, offset=80)[0])
+    if len(data) == 84 + count * _STL_RECORD.itemsize:
+        return True
+    return not data.lstrip().startswith(b"solid")
+
+
+def read_stl(path: Path) -> Mesh:
+    """Read a binary or ASCII STL file (OpenSCAD writes ASCII by default)."""
+    return parse_stl(Path(path).read_bytes())
+
+
+def parse_stl(data: bytes) -> Mesh:
+    """Mesh of binary or ASCII STL data."""
+    if _is_binary_stl(data):
+        count = int(np.frombuffer(data, dtype="<u4", count=1, offset=80)[0])
+        records = np.frombuffer(data, dtype=_STL_RECORD, count=count, offset=84)
+        triangles = records["vertices"].astype(np.float64)
+    else:
+        coords = np.array(_VERTEX_RE.findall(data), dtype=np.float64)
+        triangles = coords.reshape(-1, 3, 3)
+    return Mesh.from_triangles(triangles)
+
+
+def write_stl(path: Path, mesh: Mesh, header: bytes = b"ks-systems-hardware"):
+    """Write a binary STL file (path or binary file object)."""
+    triangles = mesh.triangles
+    normals = np.cross(
+        triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0]
+    )
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    normals = np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+
+    records = np.zeros(len(triangles), dtype=_STL_RECORD)
+    records["normal"] = normals
+    records["vertices"] = triangles
+
+    payload = b"".join([
+        header[:80].ljust(80, b"\0"),
+        np.uint32(len(records)).tobytes(),
+        records.tobytes(),
+    ])
+    if hasattr(path, "write"):
+        path.write(payload)
+    else:
+        Path(path).write_bytes(payload)
+
+
+def write_ply(path: Path, mesh: Mesh, vertex_colours: np.ndarray | None = None):
+    """Write a binary PLY file, optionally with (V, 3) uint8 RGB per vertex."""
+    vertex = [("xyz", "<f4", (3,))]
+    header = [
+        "ply",
+        "format binary_little_endian 1.0",
+        f"element vertex {len(mesh.vertices)}",
+        "property float x",
+        "property float y",
+        "property float z",
+    ]
+    if vertex_colours is not None:
+        vertex.append(("rgb", "u1", (3,)))
+        header += ["property uchar red", "property uchar green", "property uchar blue"]
+    header += [
+        f"element face {len(mesh.faces)}",
+        "property list uchar int vertex_indices",
+        "end_header",
+    ]
+
+    vertices = np.zeros(len(mesh.vertices), dtype=vertex)
+    vertices["xyz"] = mesh.vertices
+    if vertex_colours is not None:
+        vertices["rgb"] = vertex_colours
+    faces = np.zeros(len(mesh.faces), dtype=[("n", "u1"), ("v", "<i4", (3,))])
+    faces["n"] = 3
+    faces["v"] = mesh.faces
+    Path(path).write_bytes(
+        ("\n".join(header) + "\n").encode() + vertices.tobytes() + faces.tobytes()
+    )
+
+
+_3MF_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+  <Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+  <Default Extension="model" ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>
+</Types>
+"""
+
+_3MF_RELS = """<?xml version="1.0" encoding="UTF-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+  <Relationship Target="/3D/3dmodel.model" Id="rel0" Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>
+</Relationships>
+"""
+
+
+def _3mf_mesh_xml(mesh: Mesh) -> str:
+    vertices = "\n".join(
+        f'<vertex x="{x:.5f}" y="{y:.5f}" z="{z:.5f}"/>' for x, y, z in mesh.vertices
+    )
+    triangles = "\n".join(
+        f'<triangle v1="{a}" v2="{b}" v3="{c}"/>' for a, b, c in mesh.faces
+    )
+    return (
+        f"<mesh><vertices>\n{vertices}\n</vertices>"
+        f"<triangles>\n{triangles}\n</triangles></mesh>"
+    )
+
+
+def write_3mf(path: Path, objects: List[Tuple[str, Mesh]],
+              colours: List[Tuple[float, float, float, float]] | None = None):
+    """
+    Write a 3MF package with one object and build item per (name, mesh).
+    Meshes are written in their final (plate) coordinates. `colours`
+    (RGBA 0-1, one per object) become a base material per object, which
+    slicers read as its filament/extruder colour.
+    """
+    resources = []
+    items = []
+    materials = len(objects) + 1
+    if colours is not None:
+        bases = "".join(
+            f'<base name="{name}" displaycolor="#{"".join(f"{round(v * 255):02X}" for v in rgba)}"/>'
+            for (name, _), rgba in zip(objects, colours)
+        )
+        resources.append(f'<basematerials id="{materials}">{bases}</basematerials>')
+    for i, (name, mesh) in enumerate(objects, start=1):
+        material = f' pid="{materials}" pindex="{i - 1}"' if colours is not None else ""
+        resources.append(
+            f'<object id="{i}" name="{name}" type="model"{material}>{_3mf_mesh_xml(mesh)}</object>'
+        )
+        items.append(f'<item objectid="{i}"/>')
+
+    model = (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<model unit="millimeter" xml:lang="en-US" '
+        'xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">\n'
+        f"<resources>\n{chr(10).join(resources)}\n</resources>\n"
+        f"<build>\n{chr(10).join(items)}\n</build>\n"
+        "</model>\n"
+    )
+
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        z.writestr("[Content_Types].xml", _3MF_CONTENT_TYPES)
+        z.writestr("_rels/.rels", _3MF_RELS)
+        z.writestr("3D/3dmodel.model", model)
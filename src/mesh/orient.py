@@ -0,0 +1,155 @@
+"""
+Print orientation.
+Candidate "down" directions (a Fibonacci sphere sample, plus the
+normals of the mesh's largest flat faces so resting on a face is always
+tried) are scored all at once from the face normals and areas:
+  support  projected area of downward faces steeper than the overhang
+           limit that are not on the bed
+  contact  area of faces lying on the bed (adhesion)
+  height   build height (print time)
+Rotation about Z does not change any of these; bed packing picks it.
+"""
+
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+from mesh.core import Mesh, translation
+
+OVERHANG_ANGLE = 45.0   # degrees from vertical printable without support
+BED_TOLERANCE = 0.05    # mm; faces this close to the bed touch it
+DEFAULT_SAMPLES = 256
+
+# Score = support + HEIGHT_WEIGHT * height - CONTACT_WEIGHT * contact, with
+# areas as fractions of the surface and height as a fraction of the
+# bounding-box diagonal, so the weights are the same for every part size.
+HEIGHT_WEIGHT = 0.25
+CONTACT_WEIGHT = 0.5
+
+
+@dataclass(frozen=True)
+class Orientation:
+    """A part's print orientation: `down` (part frame) points at the bed."""
+    down: Tuple[float, float, float]
+    support_area: float   # mm^2
+    contact_area: float   # mm^2
+    height: float         # mm
+    score: float
+
+    def rotation(self) -> np.ndarray:
+        """4x4 rotation taking `down` to -Z."""
+        return rotation_to(np.asarray(self.down), np.array([0.0, 0.0, -1.0]))
+
+    def transform(self, mesh: Mesh) -> np.ndarray:
+        """4x4 matrix that rotates `mesh` into this orientation, resting on Z=0."""
+        rotation = self.rotation()
+        lo = mesh.transformed(rotation).bounds[0]
+        return translation([0.0, 0.0, -lo[2]]) @ rotation
+
+    def to_dict(self) -> dict:
+        return {
+            "down": [round(v, 6) for v in self.down],
+            "support_area": round(self.support_area, 3),
+            "contact_area": round(self.contact_area, 3),
+            "height": round(self.height, 3),
+            "score": round(self.score, 6),
+        }
+
+
+def rotation_to(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """4x4 rotation taking unit vector `a` to unit vector `b` (Rodrigues)."""
+    a = a / np.linalg.norm(a)
+    b = b / np.linalg.norm(b)
+    axis = np.cross(a, b)
+    s, c = np.linalg.norm(axis), float(np.dot(a, b))
+    m = np.eye(4)
+    if s < 1e-12:
+        if c < 0:
+            # Opposite: half turn about any axis perpendicular to a
+            perp = np.cross(a, [1.0, 0.0, 0.0] if abs(a[0]) < 0.9 else [0.0, 1.0, 0.0])
+            perp /= np.linalg.norm(perp)
+            m[:3, :3] = 2 * np.outer(perp, perp) - np.eye(3)
+        return m
+    k = axis / s
+    kx = np.array([[0, -k[2], k[1]], [k[2], 0, -k[0]], [-k[1], k[0], 0]])
+    m[:3, :3] = np.eye(3) + s * kx + (1 - c) * kx @ kx
+    return m
+
+
+def sphere_directions(n: int) -> np.ndarray:
+    """(n, 3) near-uniform unit vectors (Fibonacci lattice), -Z first."""
+    i = np.arange(n) + 0.5
+    z = -1 + 2 * i / n
+    r = np.sqrt(1 - z * z)
+    phi = np.pi * (1 + 5 ** 0.5) * i
+    points = np.column_stack([r * np.cos(phi), r * np.sin(phi), z])
+    return np.vstack([[0.0, 0.0, -1.0], points])
+
+
+def _face_normals(mesh: Mesh) -> Tuple[np.ndarray, np.ndarray]:
+    """Unit normals (F, 3) and areas (F,); degenerate faces get zero area."""
+    tris = mesh.triangles.astype(np.float64)
+    cross = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    norm = np.linalg.norm(cross, axis=1)
+    normals = np.divide(cross, norm[:, None], out=np.zeros_like(cross), where=norm[:, None] > 0)
+    return normals, norm / 2
+
+
+def candidate_directions(mesh: Mesh, samples: int = DEFAULT_SAMPLES, faces: int = 12) -> np.ndarray:
+    """Current orientation, the sphere sample and the `faces` largest flat-face normals."""
+    normals, areas = _face_normals(mesh)
+    keys, inverse = np.unique(np.round(normals, 3), axis=0, return_inverse=True)
+    flat = np.bincount(inverse.ravel(), weights=areas, minlength=len(keys))
+    largest = keys[np.argsort(-flat)[:faces]]
+    largest = largest[np.linalg.norm(largest, axis=1) > 0.5]
+    largest /= np.linalg.norm(largest, axis=1)[:, None]
+    return np.vstack([sphere_directions(samples), largest])
+
+
+def score_orientations(mesh: Mesh, directions: np.ndarray, overhang: float = OVERHANG_ANGLE,
+                       chunk: int = 64) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (support_area, contact_area, height, score) for each candidate down
+    direction (K, 3), evaluated as (faces x candidates) matrices in
+    chunks of `chunk` candidates.
+    """
+    directions = np.asarray(directions, dtype=np.float64)
+    normals, areas = _face_normals(mesh)
+    vertices = mesh.vertices.astype(np.float64)
+    tris = mesh.faces
+    total_area = areas.sum() or 1.0
+    diagonal = np.linalg.norm(np.ptp(vertices, axis=0)) or 1.0
+    limit = np.sin(np.radians(overhang))
+
+    support, contact, height = (np.empty(len(directions)) for _ in range(3))
+    for start in range(0, len(directions), chunk):
+        d = directions[start:start + chunk]
+        # Height above the bed of every vertex, per candidate: (N, k)
+        up = -(vertices @ d.T)
+        up -= up.min(axis=0)
+        face_top = up[tris].max(axis=1)    # (F, k)
+        nz = -(normals @ d.T)              # normal's Z after rotation, (F, k)
+        on_bed = face_top < BED_TOLERANCE
+        downward = nz < -limit
+        support[start:start + chunk] = ((downward & ~on_bed) * areas[:, None] * -nz).sum(axis=0)
+        contact[start:start + chunk] = ((on_bed & (nz < -0.999)) * areas[:, None]).sum(axis=0)
+        height[start:start + chunk] = up.max(axis=0)
+    score = (support / total_area + HEIGHT_WEIGHT * height / diagonal
+             - CONTACT_WEIGHT * contact / total_area)
+    return support, contact, height, score
+
+
+def best_orientation(mesh: Mesh, samples: int = DEFAULT_SAMPLES,
+                     overhang: float = OVERHANG_ANGLE) -> Orientation:
+    """Lowest-scoring candidate; ties keep the modelled orientation."""
+    directions = candidate_directions(mesh, samples)
+    support, contact, height, score = score_orientations(mesh, directions, overhang)
+    best = int(np.argmin(np.round(score, 9)))
+    return Orientation(
+        down=tuple(float(v) for v in directions[best]),
+        support_area=float(support[best]),
+        contact_area=float(contact[best]),
+        height=float(height[best]),
+        score=float(score[best]),
+    )
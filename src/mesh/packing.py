@@ -0,0 +1,215 @@
+"""
+Print-bed packing.
+Each part is reduced to its convex-hull footprint, rotated to its
+minimum-area bounding rectangle, then packed onto as few plates as
+possible with the MaxRects (best short side fit) heuristic.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+import numpy as np
+
+from mesh.core import Mesh, rotation_z, translation
+
+
+def convex_hull(points: np.ndarray) -> np.ndarray:
+    """2D convex hull (Andrew's monotone chain), counter-clockwise."""
+    pts = np.unique(np.asarray(points, dtype=np.float64)[:, :2], axis=0)
+    if len(pts) < 3:
+        return pts
+
+    def half(seq):
+        out = []
+        for p in seq:
+            while len(out) >= 2:
+                (ax, ay), (bx, by) = out[-2], out[-1]
+                if (bx - ax) * (p[1] - ay) - (by - ay) * (p[0] - ax) > 1e-12:
+                    break
+                out.pop()
+            out.append(p)
+        return out
+
+    lower = half(pts)
+    upper = half(pts[::-1])
+    return np.array(lower[:-1] + upper[:-1])
+
+
+def min_area_rect(hull: np.ndarray) -> Tuple[float, float, float]:
+    """
+    Minimum-area enclosing rectangle of a convex polygon.
+    Returns (angle_deg, width, height) where rotating the polygon by
+    angle_deg about Z aligns the rectangle with the axes.
+    """
+    if len(hull) < 3:
+        ext = np.ptp(hull, axis=0) if len(hull) else np.zeros(2)
+        return 0.0, float(ext[0]), float(ext[1])
+
+    edges = np.roll(hull, -1, axis=0) - hull
+    angles = -np.arctan2(edges[:, 1], edges[:, 0])
+    c, s = np.cos(angles), np.sin(angles)
+    # (E, 2, 2) rotations applied to all hull points at once
+    rot = np.stack([np.stack([c, -s], -1), np.stack([s, c], -1)], -2)
+    projected = np.einsum("eij,pj->epi", rot, hull)
+    ext = projected.max(axis=1) - projected.min(axis=1)
+    areas = ext[:, 0] * ext[:, 1]
+    best = int(np.argmin(areas))
+    width, height = ext[best]
+    angle = np.degrees(angles[best])
+    # Prefer landscape orientation for deterministic output.
+    if height > width:
+        width, height = height, width
+        angle += 90.0
+    return float(angle), float(width), float(height)
+
+
+@dataclass
+class Footprint:
+    """Axis-aligned footprint of a part after its min-area rotation."""
+    name: str
+    mesh: Mesh
+    angle: float
+    width: float
+    height: float
+
+    @classmethod
+    def from_mesh(cls, name: str, mesh: Mesh) -> "Footprint":
+        angle, width, height = min_area_rect(convex_hull(mesh.vertices))
+        return cls(name=name, mesh=mesh, angle=angle, width=width, height=height)
+
+    @property
+    def area(self) -> float:
+        return self.width * self.height
+
+
+@dataclass
+class Placement:
+    """A footprint copy placed on a plate."""
+    footprint: Footprint
+    copy: int
+    x: float
+    y: float
+    rotated: bool
+
+    @property
+    def label(self) -> str:
+        return f"{self.footprint.name}_{self.copy + 1}"
+
+    def transform(self) -> np.ndarray:
+        """4x4 matrix taking the part mesh to its plate position, resting on Z=0."""
+        angle = self.footprint.angle + (90.0 if self.rotated else 0.0)
+        rotated = self.footprint.mesh.transformed(rotation_z(angle))
+        lo = rotated.bounds[0]
+        return translation([self.x - lo[0], self.y - lo[1], -lo[2]]) @ rotation_z(angle)
+
+    def placed_mesh(self) -> Mesh:
+        return self.footprint.mesh.transformed(self.transform())
+
+
+@dataclass
+class Plate:
+    """One print bed worth of placements."""
+    width: float
+    depth: float
+    placements: List[Placement] = field(default_factory=list)
+    free: np.ndarray = None  # (K, 4) free rectangles as x, y, w, h
+
+    def __post_init__(self):
+        if self.free is None:
+            self.free = np.array([[0.0, 0.0, self.width, self.depth]])
+
+    @property
+    def utilization(self) -> float:
+        used = sum(p.footprint.area for p in self.placements)
+        return used / (self.width * self.depth)
+
+
+def _best_fit(free: np.ndarray, w: float, h: float):
+    """Score every free rect for both orientations; return (score, index, rotated)."""
+    best = (np.inf, -1, False)
+    for rotated, (iw, ih) in ((False, (w, h)), (True, (h, w))):
+        fits = (free[:, 2] >= iw) & (free[:, 3] >= ih)
+        if not fits.any():
+            continue
+        short = np.minimum(free[:, 2] - iw, free[:, 3] - ih)
+        short = np.where(fits, short, np.inf)
+        idx = int(np.argmin(short))
+        if short[idx] < best[0]:
+            best = (short[idx], idx, rotated)
+    return best
+
+
+def _split_free(free: np.ndarray, rect: np.ndarray) -> np.ndarray:
+    """Remove `rect` from the free list (MaxRects split + prune)."""
+    x, y, w, h = rect
+    fx, fy, fw, fh = free.T
+    hit = (x < fx + fw) & (x + w > fx) & (y < fy + fh) & (y + h > fy)
+
+    keep = [free[~hit]]
+    for r in free[hit]:
+        rx, ry, rw, rh = r
+        if x > rx:
+            keep.append([[rx, ry, x - rx, rh]])
+        if x + w < rx + rw:
+            keep.append([[x + w, ry, rx + rw - (x + w), rh]])
+        if y > ry:
+            keep.append([[rx, ry, rw, y - ry]])
+        if y + h < ry + rh:
+            keep.append([[rx, y + h, rw, ry + rh - (y + h)]])
+    out = np.concatenate([np.asarray(k, dtype=np.float64).reshape(-1, 4) for k in keep])
+
+    # Drop rectangles fully contained in another one.
+    x0, y0 = out[:, 0], out[:, 1]
+    x1, y1 = x0 + out[:, 2], y0 + out[:, 3]
+    inside = (
+        (x0[:, None] >= x0[None, :]) & (y0[:, None] >= y0[None, :])
+        & (x1[:, None] <= x1[None, :]) & (y1[:, None] <= y1[None, :])
+    )
+    np.fill_diagonal(inside, False)
+    # Of two identical rects keep the first.
+    same = inside & inside.T
+    inside &= ~np.triu(same)
+    return out[~inside.any(axis=1)]
+
+
+def pack(footprints: List[Footprint], copies: int, bed: Tuple[float, float],
+         spacing: float = 5.0, margin: float = 5.0) -> List[Plate]:
+    """
+    Pack `copies` of every footprint onto as few plates as possible.
+    Spacing is kept between parts, margin between parts and bed edge.
+    """
+    bed_w, bed_d = bed
+    usable = (bed_w - 2 * margin + spacing, bed_d - 2 * margin + spacing)
+
+    items = [(fp, c) for fp in footprints for c in range(copies)]
+    items.sort(key=lambda it: (-max(it[0].width, it[0].height), -it[0].area, it[0].name))
+
+    plates: List[Plate] = []
+    for fp, copy in items:
+        w, h = fp.width + spacing, fp.height + spacing
+        if not (w <= usable[0] and h <= usable[1]) and not (h <= usable[0] and w <= usable[1]):
+            raise ValueError(
+                f"{fp.name} ({fp.width:.1f} x {fp.height:.1f} mm) does not fit "
+                f"on a {bed_w:g} x {bed_d:g} mm bed"
+            )
+
+        candidates = [(_best_fit(p.free, w, h), i) for i, p in enumerate(plates)]
+        candidates = [c for c in candidates if c[0][1] >= 0]
+        if candidates:
+            (_, idx, rotated), plate_idx = min(candidates, key=lambda c: (c[0][0], c[1]))
+            plate = plates[plate_idx]
+        else:
+            plate = Plate(*usable)
+            plates.append(plate)
+            _, idx, rotated = _best_fit(plate.free, w, h)
+
+        fx, fy = plate.free[idx, :2]
+        rect = np.array([fx, fy, h, w] if rotated else [fx, fy, w, h])
+        plate.free = _split_free(plate.free, rect)
+        plate.placements.append(
+            Placement(footprint=fp, copy=copy, x=fx + margin, y=fy + margin, rotated=rotated)
+        )
+
+    for plate in plates:
+        plate.width, plate.depth = bed_w, bed_d
+    return plates
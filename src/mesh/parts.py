@@ -0,0 +1,173 @@
+"""Resolve registered parts to meshes."""
+
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import anchorscad as ad
+import manifold3d as m3d
+import numpy as np
+from pythonopenscad.m3dapi import COLOUR_MAP, M3dRenderer, RenderContextManifold
+from pythonopenscad.modifier import DISABLE, TRANSPARENT
+
+from mesh.core import Mesh
+from mesh.store import read_cached_stl
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+DEFAULT_BUILD_DIR = REPO_ROOT / "build"
+
+
+def _rendered(shape: ad.Shape, attrs: ad.ModelAttributes | None = None):
+    from pipeline.library import inline_meshes
+
+    # manifold3d has no import(); prebuilt sub-parts are inlined instead.
+    with inline_meshes():
+        return ad.render(shape, initial_attrs=attrs).rendered_shape
+
+
+def _render_manifold(shape: ad.Shape, attrs: ad.ModelAttributes | None = None):
+    return _rendered(shape, attrs).renderObj(M3dRenderer()).get_solid_manifold()
+
+
+def render_shape(shape: ad.Shape, attrs: ad.ModelAttributes | None = None) -> Mesh:
+    """Evaluate a shape in-process with manifold3d (no OpenSCAD needed)."""
+    return Mesh.from_manifold(_render_manifold(shape, attrs))
+
+
+def render_coloured(shape: ad.Shape, attrs: ad.ModelAttributes | None = None) -> Tuple[Mesh, np.ndarray]:
+    """render_shape() plus (F, 3) per-face RGB (0-1) from the shape's colour()s."""
+    raw = _render_manifold(shape, attrs).to_mesh()
+    props = np.asarray(raw.vert_properties)
+    faces = np.asarray(raw.tri_verts)
+    # M3dRenderer stores RGBA right after the position
+    colour = M3dRenderer.COLOR_PROP_INDEX + 3
+    return Mesh(props[:, :3], faces), props[faces[:, 0], colour:colour + 3]
+
+
+Colour = Tuple[float, float, float, float]
+MIN_BODY_VOLUME = 1e-3  # mm^3
+
+_TRANSFORMS = {
+    "Multmatrix": lambda ctx, obj: ctx.transform(obj.m),
+    "Translate": lambda ctx, obj: ctx.translate(obj.v),
+    "Rotate": lambda ctx, obj: ctx.rotate(obj.a, obj.v),
+    "Scale": lambda ctx, obj: ctx.scale(obj.v),
+    "Mirror": lambda ctx, obj: ctx.mirror(obj.v),
+}
+
+
+def _has_colour_below(obj) -> bool:
+    return any(type(c).__name__ == "Color" or _has_colour_below(c)
+               for c in getattr(obj, "children", list)())
+
+
+def _union_all(manifolds: List[m3d.Manifold]) -> m3d.Manifold:
+    return m3d.Manifold.batch_boolean(manifolds, m3d.OpType.Add) if len(manifolds) > 1 else manifolds[0]
+
+
+def _merge(bodies: List[Dict[Colour, m3d.Manifold]]) -> Dict[Colour, m3d.Manifold]:
+    """Union per colour; where colours overlap the later child's colour wins."""
+    result: Dict[Colour, m3d.Manifold] = {}
+    for part in bodies:
+        for colour in list(result):
+            others = [m for c, m in part.items() if c != colour]
+            if others:
+                result[colour] = result[colour] - _union_all(others)
+        for colour, m in part.items():
+            result[colour] = result[colour] + m if colour in result else m
+    return result
+
+
+def _split(obj, renderer: M3dRenderer) -> Dict[Colour, m3d.Manifold]:
+    """Colour -> solid of a pythonopenscad node, evaluating each subtree once."""
+    if obj.has_modifier(DISABLE) or obj.has_modifier(TRANSPARENT):
+        return {}
+    kind = type(obj).__name__
+    if kind == "Color":
+        renderer = renderer._color_renderer(obj.c, obj.alpha)
+    if not _has_colour_below(obj):
+        # One colour all the way down: the stock renderer evaluates it in one go
+        solid = obj.renderObj(renderer).get_solid_manifold()
+        return {} if solid.is_empty() else {tuple(np.round(renderer.color_prop, 4)): solid}
+
+    children = obj.children()
+    if kind in ("Difference", "Intersection"):
+        body = _split(children[0], renderer)
+        others = [c.renderObj(renderer).get_solid_manifold() for c in children[1:]]
+        if not others:
+            return body
+        if kind == "Difference":
+            # Holes are evaluated once and cut through every colour's body
+            cut = _union_all(others)
+            body = {c: m - cut for c, m in body.items()}
+        else:
+            common = others[0]
+            for other in others[1:]:
+                common = common ^ other
+            body = {c: m ^ common for c, m in body.items()}
+        return {c: m for c, m in body.items() if not m.is_empty()}
+
+    body = _merge([_split(child, renderer) for child in children])
+    if kind in _TRANSFORMS:
+        body = {
+            c: _TRANSFORMS[kind](RenderContextManifold.with_manifold(renderer, m), obj).get_solid_manifold()
+            for c, m in body.items()
+        }
+    elif kind not in ("Color", "Union", "LazyUnion", "Module"):
+        raise ValueError(f"cannot split colours through {kind}()")
+    return body
+
+
+def colour_name(colour: Colour) -> str:
+    """OpenSCAD colour name of an RGBA colour, else #rrggbb (#rrggbbaa if translucent)."""
+    for name, rgb in COLOUR_MAP.items():
+        if colour[3] == 1 and len(rgb) == 3 and np.allclose(rgb, colour[:3], atol=1e-3):
+            return name
+    digits = colour if colour[3] < 1 else colour[:3]
+    return "#" + "".join(f"{round(v * 255):02x}" for v in digits)
+
+
+def render_colour_split(shape: ad.Shape, attrs: ad.ModelAttributes | None = None
+                        ) -> List[Tuple[str, Colour, Mesh]]:
+    """
+    (colour name, RGBA, mesh) per colour of a shape, from one evaluation
+    of its CSG tree: holes are solved once and cut through every colour,
+    and only subtrees that mix colours are kept apart. Bodies do not
+    overlap (a later colour wins), so each is a printable volume for one
+    material of a multi-material print.
+    """
+    bodies = _split(_rendered(shape, attrs), M3dRenderer())
+    # Slivers left where a later colour covers an earlier one
+    return [(colour_name(c), c, Mesh.from_manifold(m)) for c, m in bodies.items()
+            if m.volume() > MIN_BODY_VOLUME]
+
+
+def instanced_mesh(layout: Dict[str, Tuple[ad.Shape, ad.GMatrix]],
+                   attrs: ad.ModelAttributes | None = None) -> Mesh:
+    """
+    Mesh of a layout (name -> (shape, transform of its centre), as
+    PicoAssembly.layout()). Each distinct shape is rendered once and its
+    mesh copied to every placement, rather than re-solving its booleans.
+    """
+    meshes: Dict[str, Mesh] = {}
+    placed = []
+    for shape, post in layout.values():
+        key = repr(shape)
+        if key not in meshes:
+            meshes[key] = render_shape(shape, attrs)
+        # Parts are added at their "centre" anchor, then moved by `post`.
+        placed.append(meshes[key].transformed(np.asarray((post * shape.at("centre").I).A)))
+    return Mesh.concatenate(placed)
+
+
+def part_mesh(name: str, factory: Callable[[], ad.Shape],
+              build_dir: Path = DEFAULT_BUILD_DIR) -> Mesh:
+    """
+    Mesh for a registered part.
+    Prefers the OpenSCAD STL in the build dir (through its memory-mapped
+    cache); falls back to an in-process render when the part has not
+    been rendered yet.
+    """
+    stl_path = Path(build_dir) / f"{name}.stl"
+    if stl_path.exists():
+        return read_cached_stl(stl_path)
+    return render_shape(factory())
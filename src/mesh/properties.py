@@ -0,0 +1,60 @@
+"""Vectorized mass properties of closed triangle meshes."""
+
+from dataclasses import dataclass, asdict
+from typing import Tuple
+
+import numpy as np
+
+from mesh.core import Mesh
+
+
+@dataclass(frozen=True)
+class MassProperties:
+    """Geometric properties of a closed mesh (mm, mm^2, mm^3)."""
+    volume: float
+    area: float
+    centre_of_mass: Tuple[float, float, float]
+    bounds: Tuple[Tuple[float, float, float], Tuple[float, float, float]]
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MassProperties":
+        return cls(
+            volume=data["volume"],
+            area=data["area"],
+            centre_of_mass=tuple(data["centre_of_mass"]),
+            bounds=tuple(tuple(b) for b in data["bounds"]),
+        )
+
+
+def mass_properties(mesh: Mesh) -> MassProperties:
+    """
+    Signed volume, surface area and centre of mass in one pass.
+    Each triangle forms a tetrahedron with the origin; summing the signed
+    tetrahedron volumes (and their volume-weighted centroids) integrates
+    over the enclosed solid. Outward winding gives a positive volume.
+    """
+    tris = mesh.triangles.astype(np.float64)
+    a, b, c = tris[:, 0], tris[:, 1], tris[:, 2]
+
+    cross = np.cross(b - a, c - a)
+    area = 0.5 * np.linalg.norm(cross, axis=1).sum()
+
+    tet_volumes = np.einsum("ij,ij->i", a, np.cross(b, c)) / 6.0
+    volume = tet_volumes.sum()
+
+    if abs(volume) > 1e-12:
+        # Tetrahedron centroid is (0 + a + b + c) / 4
+        com = (tet_volumes[:, None] * (a + b + c)).sum(axis=0) / (4.0 * volume)
+    else:
+        com = mesh.vertices.mean(axis=0) if len(mesh.vertices) else np.zeros(3)
+
+    lo, hi = mesh.bounds
+    return MassProperties(
+        volume=float(volume),
+        area=float(area),
+        centre_of_mass=tuple(float(v) for v in com),
+        bounds=(tuple(float(v) for v in lo), tuple(float(v) for v in hi)),
+    )
@@ -0,0 +1,158 @@
+"""
+Software rasterizer for gallery thumbnails (NumPy only, no display).
+Cameras use OpenSCAD's gimbal parameters (translate, rotate, distance):
+the model is rotated about X, Y then Z and viewed from -Y with +Z up.
+Projection is orthographic and always frames the whole model, like
+OpenSCAD's --autocenter --viewall; translate and distance are ignored.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+from mesh.core import Mesh
+
+# Pixel/triangle pairs tested per batch (bounds peak memory)
+_BATCH_FRAGMENTS = 2_000_000
+
+# View margin around the model, as a fraction of the image
+_MARGIN = 0.05
+
+
+@dataclass(frozen=True)
+class ColourScheme:
+    """Background and default (uncoloured) face colours, RGB 0-255."""
+    background: Tuple[int, int, int]
+    face: Tuple[int, int, int]
+
+
+# The OpenSCAD schemes named in cadeng.yaml
+COLOUR_SCHEMES: Dict[str, ColourScheme] = {
+    "Cornfield": ColourScheme(background=(255, 255, 229), face=(249, 215, 44)),
+    "Tomorrow Night": ColourScheme(background=(29, 31, 33), face=(240, 198, 116)),
+}
+DEFAULT_SCHEME = "Tomorrow Night"
+
+
+def parse_camera(camera: str | Sequence[float]) -> np.ndarray:
+    """"tx,ty,tz,rx,ry,rz,dist" (or a sequence) -> (rx, ry, rz) degrees."""
+    values = [float(v) for v in (camera.split(",") if isinstance(camera, str) else camera)]
+    if len(values) != 7:
+        raise ValueError(f"camera needs 7 values (tx,ty,tz,rx,ry,rz,dist), got {camera!r}")
+    return np.array(values[3:6])
+
+
+def view_matrix(rotation: Sequence[float]) -> np.ndarray:
+    """3x3 map from model coordinates to (screen right, depth away, screen up)."""
+    rx, ry, rz = np.radians(rotation)
+
+    def rot(axis: int, a: float) -> np.ndarray:
+        c, s = np.cos(a), np.sin(a)
+        i, j = [k for k in range(3) if k != axis]
+        m = np.eye(3)
+        m[i, i], m[i, j], m[j, i], m[j, j] = c, -s, s, c
+        return m
+
+    # glRotate order: Rx * Ry * Rz, so Z is applied to the model first
+    return rot(0, rx) @ rot(1, ry) @ rot(2, rz)
+
+
+def _shade(normals: np.ndarray) -> np.ndarray:
+    """Flat shading: ambient plus a headlight raised above and left of the eye."""
+    light = np.array([-0.3, -1.0, 0.5])
+    light /= np.linalg.norm(light)
+    return 0.35 + 0.65 * np.clip(normals @ light, 0.0, 1.0)
+
+
+def rasterize(mesh: Mesh, rotation: Sequence[float], size: Tuple[int, int],
+              face_colours: np.ndarray | None = None,
+              scheme: ColourScheme = COLOUR_SCHEMES[DEFAULT_SCHEME]) -> np.ndarray:
+    """
+    (H, W, 3) uint8 image of `mesh` seen from `rotation`.
+    face_colours: optional (F, 3) RGB in 0-1 per face; the scheme's face
+    colour is used otherwise.
+    """
+    width, height = size
+    image = np.empty((height, width, 3), dtype=np.uint8)
+    image[:] = scheme.background
+    if len(mesh.faces) == 0:
+        return image
+
+    view = mesh.vertices @ view_matrix(rotation).T     # (V, 3) right, depth, up
+    lo, hi = view.min(axis=0), view.max(axis=0)
+    span = np.maximum(hi - lo, 1e-9)
+    scale = (1 - 2 * _MARGIN) * min(width / span[0], height / span[2])
+    centre = (lo + hi) / 2
+    sx = (view[:, 0] - centre[0]) * scale + width / 2
+    sy = height / 2 - (view[:, 2] - centre[2]) * scale
+    depth = view[:, 1]
+
+    tri = mesh.faces
+    x, y, z = sx[tri], sy[tri], depth[tri]             # (F, 3) each
+
+    # Counter-clockwise-outward faces seen from the front have negative
+    # signed area in image coordinates (y down); cull the rest.
+    area = (x[:, 1] - x[:, 0]) * (y[:, 2] - y[:, 0]) - (y[:, 1] - y[:, 0]) * (x[:, 2] - x[:, 0])
+    keep = area < -1e-12
+    faces = np.flatnonzero(keep)
+    x, y, z, area = x[keep], y[keep], z[keep], area[keep]
+
+    normals = np.cross(
+        view[tri[keep, 1]] - view[tri[keep, 0]], view[tri[keep, 2]] - view[tri[keep, 0]]
+    )
+    normals /= np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12)
+    if face_colours is None:
+        base = np.broadcast_to(np.asarray(scheme.face, dtype=np.float64) / 255, (len(faces), 3))
+    else:
+        base = np.asarray(face_colours, dtype=np.float64)[faces, :3]
+    colours = np.clip(base * _shade(normals)[:, None] * 255, 0, 255).astype(np.uint8)
+
+    # Pixel centres covered by each triangle's screen bounding box
+    i0 = np.clip(np.ceil(x.min(axis=1) - 0.5), 0, width).astype(np.int64)
+    i1 = np.clip(np.floor(x.max(axis=1) - 0.5), -1, width - 1).astype(np.int64)
+    j0 = np.clip(np.ceil(y.min(axis=1) - 0.5), 0, height).astype(np.int64)
+    j1 = np.clip(np.floor(y.max(axis=1) - 0.5), -1, height - 1).astype(np.int64)
+    wi = np.maximum(i1 - i0 + 1, 0)
+    wj = np.maximum(j1 - j0 + 1, 0)
+    counts = wi * wj
+
+    zbuf = np.full(width * height, np.inf)
+    owner = np.full(width * height, -1, dtype=np.int64)
+
+    ends = np.cumsum(counts)
+    start = 0
+    while start < len(faces):
+        base_count = ends[start - 1] if start else 0
+        stop = max(int(np.searchsorted(ends, base_count + _BATCH_FRAGMENTS, side="right")), start + 1)
+        n = counts[start:stop]
+        t = np.repeat(np.arange(start, stop), n)
+        local = np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+        pi = i0[t] + local // np.maximum(wj[t], 1)
+        pj = j0[t] + local % np.maximum(wj[t], 1)
+        px, py = pi + 0.5, pj + 0.5
+
+        tx, ty = x[t], y[t]
+        w0 = ((tx[:, 1] - px) * (ty[:, 2] - py) - (ty[:, 1] - py) * (tx[:, 2] - px)) / area[t]
+        w1 = ((tx[:, 2] - px) * (ty[:, 0] - py) - (ty[:, 2] - py) * (tx[:, 0] - px)) / area[t]
+        w2 = 1.0 - w0 - w1
+        inside = (w0 >= 0) & (w1 >= 0) & (w2 >= 0)
+
+        t, pix = t[inside], (pj * width + pi)[inside]
+        frag_z = (w0[inside] * z[t, 0] + w1[inside] * z[t, 1] + w2[inside] * z[t, 2])
+
+        # Nearest fragment per pixel in this batch, then merge with the buffer
+        order = np.lexsort((frag_z, pix))
+        pix, frag_z, t = pix[order], frag_z[order], t[order]
+        first = np.ones(len(pix), dtype=bool)
+        first[1:] = pix[1:] != pix[:-1]
+        pix, frag_z, t = pix[first], frag_z[first], t[first]
+        closer = frag_z < zbuf[pix]
+        zbuf[pix[closer]] = frag_z[closer]
+        owner[pix[closer]] = t[closer]
+        start = stop
+
+    covered = owner >= 0
+    flat = image.reshape(-1, 3)
+    flat[covered] = colours[owner[covered]]
+    return image
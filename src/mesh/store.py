@@ -0,0 +1,145 @@
+"""
+Binary mesh cache opened with numpy.memmap.
+A cache is a directory `<name>.mesh/` of three .npy files:
+  vertices.npy  (V, 3) float32
+  faces.npy     (F, 3) uint32, indices into all vertices
+  solids.npy    (S,) records: name, vertex and face index ranges
+Loading maps the files read-only instead of parsing STL, so it costs
+microseconds and processes opening the same cache share its pages.
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from mesh.core import Mesh
+from mesh.io import read_stl
+
+MESH_SUFFIX = ".mesh"
+
+SOLID_DTYPE = np.dtype([
+    ("name", "<U64"),
+    ("vertex_start", "<u4"),
+    ("vertex_stop", "<u4"),
+    ("face_start", "<u4"),
+    ("face_stop", "<u4"),
+])
+
+
+def write_mesh_cache(path: Path, solids: Sequence[Tuple[str, Mesh]]):
+    """Write (name, mesh) solids to a cache directory, replacing it atomically."""
+    path = Path(path)
+    records = np.zeros(len(solids), dtype=SOLID_DTYPE)
+    vertex_count = face_count = 0
+    for record, (name, mesh) in zip(records, solids):
+        record["name"] = name
+        record["vertex_start"], record["face_start"] = vertex_count, face_count
+        vertex_count += len(mesh.vertices)
+        face_count += len(mesh.faces)
+        record["vertex_stop"], record["face_stop"] = vertex_count, face_count
+    if vertex_count >= 2**32:
+        raise ValueError(f"{path.name}: too many vertices for uint32 faces")
+
+    combined = Mesh.concatenate(m for _, m in solids)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Unique per call: threads of one process write caches concurrently
+    tmp = Path(tempfile.mkdtemp(prefix=f".{path.name}.", dir=path.parent))
+    try:
+        np.save(tmp / "vertices.npy", np.ascontiguousarray(combined.vertices, dtype="<f4"))
+        np.save(tmp / "faces.npy", np.ascontiguousarray(combined.faces, dtype="<u4"))
+        np.save(tmp / "solids.npy", records)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    # A directory can't be renamed over another, so swap the old one out
+    # first; readers caught between the two renames see a cache miss
+    old = tmp.with_name(f"{tmp.name}.old")
+    try:
+        path.replace(old)
+    except FileNotFoundError:
+        pass
+    try:
+        tmp.replace(path)
+    except OSError:
+        # Another writer swapped its cache of the same solids in first
+        shutil.rmtree(tmp, ignore_errors=True)
+    shutil.rmtree(old, ignore_errors=True)
+
+
+class MeshCache:
+    """
+    Read-only, memory-mapped view of a mesh cache.
+    Pickles as its path, so passing one to a worker process reopens the
+    same mapping there instead of copying the arrays.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.vertices = np.load(self.path / "vertices.npy", mmap_mode="r")
+        self.faces = np.load(self.path / "faces.npy", mmap_mode="r")
+        self.solids = np.load(self.path / "solids.npy")
+
+    def __reduce__(self):
+        return (MeshCache, (str(self.path),))
+
+    @property
+    def names(self) -> List[str]:
+        return [str(n) for n in self.solids["name"]]
+
+    @property
+    def mesh(self) -> Mesh:
+        """All solids as one mesh (no copy)."""
+        return Mesh(self.vertices, self.faces)
+
+    def solid(self, name: str) -> Mesh:
+        """One solid; its vertices are a view, its faces re-indexed."""
+        match = np.flatnonzero(self.solids["name"] == name)
+        if len(match) == 0:
+            raise KeyError(f"{self.path.name} has no solid '{name}'")
+        r = self.solids[match[0]]
+        v0, v1 = int(r["vertex_start"]), int(r["vertex_stop"])
+        faces = self.faces[int(r["face_start"]):int(r["face_stop"])].astype(np.int64) - v0
+        return Mesh(self.vertices[v0:v1], faces)
+
+
+def load_mesh_cache(path: Path) -> MeshCache | None:
+    """Open a mesh cache, or None if there is none at `path` (or it is being replaced)."""
+    try:
+        return MeshCache(path)
+    except FileNotFoundError:
+        return None
+
+
+def mesh_cache_path(stl_path: Path) -> Path:
+    """Cache directory kept next to an STL (`part.stl` -> `part.mesh`)."""
+    return Path(stl_path).with_suffix(MESH_SUFFIX)
+
+
+def cache_stl(stl_path: Path, name: str | None = None) -> MeshCache:
+    """Convert an STL to a mesh cache beside it (one solid) and open it."""
+    stl_path = Path(stl_path)
+    path = mesh_cache_path(stl_path)
+    write_mesh_cache(path, [(name or stl_path.stem, read_stl(stl_path))])
+    return MeshCache(path)
+
+
+def read_cached_stl(stl_path: Path) -> Mesh:
+    """
+    Mesh of an STL through its cache: mapped if the cache is at least as
+    new as the STL, otherwise parsed once and cached for next time.
+    """
+    stl_path = Path(stl_path)
+    path = mesh_cache_path(stl_path)
+    try:
+        if (path / "solids.npy").stat().st_mtime >= stl_path.stat().st_mtime:
+            return MeshCache(path).mesh
+    except FileNotFoundError:
+        pass   # no cache, or another writer is swapping it: a miss
+    try:
+        return cache_stl(stl_path).mesh
+    except OSError:
+        # Read-only build dir: fall back to parsing every time
+        return read_stl(stl_path)
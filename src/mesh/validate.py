@@ -0,0 +1,170 @@
+"""
+Printability checks on a rendered mesh: the gate after each STL render
+in `bin/render` and releases. Slicers reject, or silently "repair", a
+mesh that is
+  open            edges used by one face only
+  non-manifold    edges shared by more than two faces (typically
+                  coplanar holes leaving zero-thickness webs)
+  mis-oriented    edges traversed the same way by both faces
+  degenerate      zero-area faces
+  self-crossing   faces piercing faces they share no vertex with
+  split           more bodies than the part should have
+"""
+
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+from mesh.bvh import BVH
+from mesh.core import Mesh
+from mesh.io import read_stl
+
+DEGENERATE_AREA = 1e-9   # mm^2
+_EPS = 1e-9
+_CHUNK = 200_000          # face pairs tested per batch
+
+
+@dataclass
+class Validation:
+    faces: int
+    shells: int
+    boundary_edges: int
+    nonmanifold_edges: int
+    misoriented_edges: int
+    degenerate_faces: int
+    self_intersections: int   # pairs of crossing faces
+    expect_shells: int | None = None
+
+    @property
+    def problems(self) -> List[str]:
+        problems = []
+        if self.faces == 0:
+            problems.append("empty mesh")
+        if self.boundary_edges:
+            problems.append(f"not watertight: {self.boundary_edges} open edges")
+        if self.nonmanifold_edges:
+            problems.append(f"non-manifold: {self.nonmanifold_edges} edges shared by 3+ faces")
+        if self.misoriented_edges:
+            problems.append(f"inconsistent winding: {self.misoriented_edges} edges")
+        if self.degenerate_faces:
+            problems.append(f"{self.degenerate_faces} zero-area faces")
+        if self.self_intersections:
+            problems.append(f"self-intersecting: {self.self_intersections} face pairs")
+        if self.expect_shells is not None and self.shells != self.expect_shells:
+            problems.append(f"{self.shells} shells, expected {self.expect_shells}")
+        return problems
+
+    @property
+    def ok(self) -> bool:
+        return not self.problems
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "ok": self.ok, "problems": self.problems}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Validation":
+        return cls(**{f: data[f] for f in cls.__dataclass_fields__ if f in data})
+
+
+def edge_defects(faces: np.ndarray) -> tuple[int, int, int]:
+    """(boundary, non-manifold, mis-oriented) edge counts."""
+    n = int(faces.max()) + 1 if faces.size else 0
+    a = faces.ravel()
+    b = faces[:, [1, 2, 0]].ravel()
+    directed = a.astype(np.int64) * n + b
+    undirected = np.minimum(a, b).astype(np.int64) * n + np.maximum(a, b)
+    keys, counts = np.unique(undirected, return_counts=True)
+    # Both faces of a correctly wound edge traverse it in opposite directions
+    twice, twice_counts = np.unique(directed, return_counts=True)
+    repeated = twice[twice_counts > 1]
+    pair = np.minimum(repeated // n, repeated % n) * n + np.maximum(repeated // n, repeated % n)
+    misoriented = int((counts[np.searchsorted(keys, pair)] == 2).sum())
+    return int((counts == 1).sum()), int((counts > 2).sum()), misoriented
+
+
+def shell_count(mesh: Mesh) -> int:
+    """Connected bodies (faces linked through shared vertices)."""
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    if not len(mesh.faces):
+        return 0
+    a = mesh.faces.ravel()
+    b = mesh.faces[:, [1, 2, 0]].ravel()
+    n = len(mesh.vertices)
+    graph = coo_matrix((np.ones(len(a)), (a, b)), shape=(n, n))
+    _, labels = connected_components(graph, directed=False)
+    return len(np.unique(labels[np.unique(mesh.faces)]))
+
+
+def _segments_cross(p: np.ndarray, q: np.ndarray, tri: np.ndarray) -> np.ndarray:
+    """Whether each segment p->q passes through the interior of its triangle."""
+    d = q - p
+    e1, e2 = tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0]
+    h = np.cross(d, e2)
+    det = np.einsum("ij,ij->i", e1, h)
+    ok = np.abs(det) > _EPS   # parallel or coplanar: not a crossing
+    inv = np.divide(1.0, det, out=np.zeros_like(det), where=ok)
+    s = p - tri[:, 0]
+    u = np.einsum("ij,ij->i", s, h) * inv
+    r = np.cross(s, e1)
+    v = np.einsum("ij,ij->i", d, r) * inv
+    t = np.einsum("ij,ij->i", e2, r) * inv
+    return ok & (u > _EPS) & (v > _EPS) & (u + v < 1 - _EPS) & (t > _EPS) & (t < 1 - _EPS)
+
+
+def self_intersections(mesh: Mesh) -> int:
+    """Pairs of faces sharing no vertex whose interiors cross."""
+    if not len(mesh.faces):
+        return 0
+    tris = mesh.triangles.astype(np.float64)
+    i, j = BVH(mesh).overlapping(tris.min(axis=1), tris.max(axis=1))
+    keep = i < j
+    i, j = i[keep], j[keep]
+    f = mesh.faces
+    shared = (f[i][:, :, None] == f[j][:, None, :]).any(axis=(1, 2))
+    i, j = i[~shared], j[~shared]
+
+    crossing = 0
+    for start in range(0, len(i), _CHUNK):
+        a, b = tris[i[start:start + _CHUNK]], tris[j[start:start + _CHUNK]]
+        hit = np.zeros(len(a), dtype=bool)
+        for k in range(3):
+            hit |= _segments_cross(a[:, k], a[:, (k + 1) % 3], b)
+            hit |= _segments_cross(b[:, k], b[:, (k + 1) % 3], a)
+        crossing += int(hit.sum())
+    return crossing
+
+
+def validate(mesh: Mesh, expect_shells: int | None = None) -> Validation:
+    tris = mesh.triangles.astype(np.float64)
+    area = 0.5 * np.linalg.norm(np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0]), axis=1)
+    boundary, nonmanifold, misoriented = edge_defects(mesh.faces)
+    return Validation(
+        faces=len(mesh.faces),
+        shells=shell_count(mesh),
+        boundary_edges=boundary,
+        nonmanifold_edges=nonmanifold,
+        misoriented_edges=misoriented,
+        degenerate_faces=int((area < DEGENERATE_AREA).sum()),
+        self_intersections=self_intersections(mesh),
+        expect_shells=expect_shells,
+    )
+
+
+def validate_stl(path: Path, expect_shells: int | None = None, mesh: Mesh | None = None) -> Validation:
+    """
+    Validate an STL (or `mesh`, when it has already been parsed) and write
+    the result beside it as `<name>.validation.json`.
+    """
+    result = validate(read_stl(path) if mesh is None else mesh, expect_shells)
+    write_report(path, result)
+    return result
+
+
+def write_report(path: Path, result: Validation):
+    """`<name>.validation.json` beside the STL at `path`."""
+    Path(path).with_suffix(".validation.json").write_text(json.dumps(result.to_dict(), indent=2))
@@ -0,0 +1,106 @@
+"""Content-keyed caches for rendered artifacts (memory and on-disk LRU)."""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+SRC_ROOT = Path(__file__).resolve().parent.parent
+
+
+def source_digest(root: Path = SRC_ROOT, pattern: str = "*.py") -> str:
+    """
+    Hash of every file matching `pattern` under `root` (by default the
+    Python sources under src/); changes whenever geometry code does.
+    """
+    h = hashlib.sha256()
+    for path in sorted(Path(root).rglob(pattern)):
+        if "__pycache__" in path.parts:
+            continue
+        h.update(str(path.relative_to(root)).encode())
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def cache_key(**fields) -> str:
+    """Stable digest of a JSON-serializable description of an artifact."""
+    blob = json.dumps(fields, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+class LruCache:
+    """Thread-safe in-memory LRU bounded by total payload bytes."""
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._items: OrderedDict[str, bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: bytes):
+        with self._lock:
+            if key in self._items:
+                self._size -= len(self._items.pop(key))
+            self._items[key] = value
+            self._size += len(value)
+            while self._size > self.max_bytes and len(self._items) > 1:
+                _, evicted = self._items.popitem(last=False)
+                self._size -= len(evicted)
+
+    def __len__(self):
+        return len(self._items)
+
+
+class DiskLruCache:
+    """
+    On-disk LRU: one file per key, recency tracked by mtime.
+    Survives restarts, so a fresh server starts warm.
+    """
+
+    def __init__(self, root: Path, max_bytes: int = 2 * 1024 * 1024 * 1024):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def path(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def get(self, key: str) -> bytes | None:
+        path = self.path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        os.utime(path)
+        return data
+
+    def put(self, key: str, value: bytes):
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".tmp{threading.get_ident()}")
+        tmp.write_bytes(value)
+        os.replace(tmp, path)
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            entries = [
+                (p.stat().st_mtime, p.stat().st_size, p)
+                for p in self.root.glob("*/*") if ".tmp" not in p.name
+            ]
+            total = sum(size for _, size, _ in entries)
+            for _, size, p in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                p.unlink(missing_ok=True)
+                total -= size
@@ -0,0 +1,145 @@
+"""
+Static import graph of src/ and tests/.
+Used to map changed source files to the tests and parts they can affect,
+without importing anything.
+"""
+
+import ast
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Set
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+SRC_ROOT = REPO_ROOT / "src"
+TESTS_ROOT = REPO_ROOT / "tests"
+
+# registry.load_all_parts() imports these packages dynamically
+PART_PACKAGES = ("vitamins", "components", "assemblies")
+
+
+def module_name(path: Path, src_root: Path = SRC_ROOT, repo_root: Path = REPO_ROOT) -> str:
+    """Dotted module name; src/ files are top-level, anything else is repo-relative."""
+    path = Path(path).resolve()
+    root = src_root if path.is_relative_to(src_root) else repo_root
+    parts = list(path.relative_to(root).with_suffix("").parts)
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def _imported_names(tree: ast.AST, module: str, is_package: bool) -> Set[str]:
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base = module.split(".")
+                # A package's own __init__ counts as one level deeper.
+                drop = node.level - 1 if is_package else node.level
+                base = base[: len(base) - drop] if drop else base
+                prefix = ".".join(base + ([node.module] if node.module else []))
+            else:
+                prefix = node.module or ""
+            names.add(prefix)
+            # `from pkg import submodule` imports the submodule too.
+            names.update(f"{prefix}.{alias.name}" for alias in node.names)
+    return names
+
+
+def _loads_all_parts(tree: ast.AST) -> bool:
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            func = node.func
+            name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", None)
+            if name == "load_all_parts":
+                return True
+    return False
+
+
+def build_graph(roots: Iterable[Path] = (SRC_ROOT, TESTS_ROOT),
+                src_root: Path = SRC_ROOT) -> Dict[str, Set[str]]:
+    """
+    Map each module to the project modules it imports.
+    Importing `a.b.c` also depends on packages `a` and `a.b` (their __init__).
+    """
+    files: Dict[str, Path] = {}
+    for root in roots:
+        for path in Path(root).rglob("*.py"):
+            if "__pycache__" not in path.parts:
+                files[module_name(path, src_root)] = path
+
+    graph: Dict[str, Set[str]] = {}
+    for module, path in files.items():
+        try:
+            tree = ast.parse(path.read_text(), filename=str(path))
+        except SyntaxError:
+            graph[module] = set()
+            continue
+        deps = set()
+        for name in _imported_names(tree, module, path.name == "__init__.py"):
+            parts = name.split(".")
+            for i in range(1, len(parts) + 1):
+                candidate = ".".join(parts[:i])
+                if candidate in files and candidate != module:
+                    deps.add(candidate)
+        if _loads_all_parts(tree):
+            deps.update(
+                m for m in files
+                if m != module and m.split(".")[0] in PART_PACKAGES
+            )
+        graph[module] = deps
+    return graph
+
+
+def dependents(graph: Dict[str, Set[str]], changed: Iterable[str]) -> Set[str]:
+    """Changed modules plus every module that (transitively) imports them."""
+    reverse = defaultdict(set)
+    for module, deps in graph.items():
+        for dep in deps:
+            reverse[dep].add(module)
+
+    seen = set(changed)
+    stack = list(seen)
+    while stack:
+        for importer in reverse[stack.pop()]:
+            if importer not in seen:
+                seen.add(importer)
+                stack.append(importer)
+    return seen
+
+
+def affected_modules(changed_paths: Iterable[Path], graph: Dict[str, Set[str]] | None = None) -> Set[str]:
+    """Modules affected by a set of changed files."""
+    if graph is None:
+        graph = build_graph()
+    return dependents(graph, [module_name(p) for p in changed_paths])
+
+
+def collect_test_files(args: List[str] | None = None) -> List[Path]:
+    """
+    Test files pytest would run (honours testpaths / norecursedirs config).
+    Collected through bin/test, which sets up src/ and the headless OpenGL
+    mocks the test modules need to import.
+    """
+    result = subprocess.run(
+        [sys.executable, str(REPO_ROOT / "bin" / "test"), "--no-render", "--collect-only", "-q",
+         *(args or [])],
+        cwd=REPO_ROOT, capture_output=True, text=True,
+    )
+    files = []
+    for line in result.stdout.splitlines():
+        if "::" in line:
+            path = (REPO_ROOT / line.split("::", 1)[0]).resolve()
+            if path not in files:
+                files.append(path)
+    return files
+
+
+def affected_tests(changed_paths: Iterable[Path], test_files: Iterable[Path],
+                   graph: Dict[str, Set[str]] | None = None) -> List[Path]:
+    """Collected test files that import (transitively) any changed file."""
+    modules = affected_modules(changed_paths, graph)
+    return [p for p in test_files if module_name(p) in modules]
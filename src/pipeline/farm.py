@@ -0,0 +1,484 @@
+"""
+Render farm: a coordinator hands SCAD jobs to workers over TCP.
+Jobs are keyed by their SCAD source and the renderer (name and version),
+so parts that produce identical SCAD render once and anything already
+in the build cache is never dispatched. A worker opens its connection
+with a `hello` carrying the farm's shared token (`FARM_TOKEN`) and a
+name no other connected worker uses; anything else is rejected, and a
+result is only accepted from a worker that has leased its job.
+Workers pull one job at a time, heartbeat while rendering and send back
+the STL with its render time and, when the job asks for it, its
+mesh.validate report; a job whose worker disconnects or goes quiet is
+re-queued, and failures are retried up to a limit. A result for a job
+that already finished is dropped. The coordinator caches the report
+with the STL and only writes it out: an unprintable mesh fails its part.
+
+Wire format: every message is a 4-byte big-endian header length, a
+JSON header, then `header["size"]` bytes of payload (SCAD or STL).
+"""
+
+import hmac
+import json
+import os
+import secrets
+import shutil
+import socket
+import socketserver
+import struct
+import tempfile
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from pipeline.cache import DiskLruCache, cache_key, source_digest
+from pipeline.render import DEFAULT_QUALITY, renderer, run_openscad
+
+HEARTBEAT_INTERVAL = 2.0   # s between worker heartbeats while rendering
+LEASE_TIMEOUT = 15.0       # s without a heartbeat before a job is re-queued
+MAX_ATTEMPTS = 3           # renders of a job before it is reported failed
+WAIT_INTERVAL = 0.5        # s an idle worker waits before asking again
+TOKEN_ENV = "FARM_TOKEN"   # shared secret of coordinator and workers
+
+_LENGTH = struct.Struct(">I")
+
+
+def send_message(sock: socket.socket, header: Dict[str, Any], payload: bytes = b""):
+    blob = json.dumps({**header, "size": len(payload)}).encode()
+    sock.sendall(_LENGTH.pack(len(blob)) + blob + payload)
+
+
+def _recv_exact(sock: socket.socket, n: int) -> bytes:
+    chunks = []
+    while n:
+        chunk = sock.recv(min(n, 1 << 20))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        chunks.append(chunk)
+        n -= len(chunk)
+    return b"".join(chunks)
+
+
+def recv_message(sock: socket.socket) -> Tuple[Dict[str, Any], bytes]:
+    (length,) = _LENGTH.unpack(_recv_exact(sock, _LENGTH.size))
+    header = json.loads(_recv_exact(sock, length))
+    return header, _recv_exact(sock, header.get("size", 0))
+
+
+@dataclass(frozen=True)
+class FarmJob:
+    """
+    One output part. `part`/`params` let a worker without OpenSCAD render
+    the part in-process instead (only from the same source tree).
+    """
+    name: str
+    scad: str
+    quality: str = DEFAULT_QUALITY
+    part: str | None = None
+    params: Tuple[Tuple[str, Any], ...] = ()
+    expect_shells: int | None = None
+
+    @property
+    def key(self) -> str:
+        return cache_key(scad=self.scad, format="stl", renderer=renderer())
+
+    @property
+    def report_key(self) -> str:
+        """Cache key of the validation report of the STL under `key`."""
+        return cache_key(stl=self.key, format="validation")
+
+
+@dataclass
+class FarmResult:
+    """Outcome of one part."""
+    name: str
+    ok: bool
+    cached: bool = False
+    worker: str | None = None
+    render_s: float = 0.0
+    attempts: int = 0
+    error: str | None = None
+    validation: dict | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name, "ok": self.ok, "cached": self.cached, "worker": self.worker,
+            "render_s": round(self.render_s, 3), "attempts": self.attempts, "error": self.error,
+            "validation": self.validation,
+        }
+
+
+@dataclass
+class _Task:
+    """All jobs sharing one SCAD source."""
+    key: str
+    jobs: List[FarmJob]
+    attempts: int = 0
+    worker: str | None = None
+    holders: set = field(default_factory=set)   # every worker that has leased it
+    heartbeat: float = 0.0
+    finished: bool = False
+    errors: List[str] = field(default_factory=list)
+
+
+class Coordinator:
+    """
+    Serves a fixed set of jobs to workers holding `token` (default: a
+    fresh random one, or `FARM_TOKEN`) and writes `<name>.stl` (plus
+    its mesh cache and, with `validate`, `<name>.validation.json`) to
+    `output_dir` as results arrive.
+    """
+
+    def __init__(self, jobs: List[FarmJob], output_dir: Path, cache_dir: Path,
+                 lease_timeout: float = LEASE_TIMEOUT, max_attempts: int = MAX_ATTEMPTS,
+                 validate: bool = True, token: str | None = None):
+        self.output_dir = Path(output_dir)
+        self.token = token or os.environ.get(TOKEN_ENV) or secrets.token_hex(16)
+        self.cache = DiskLruCache(cache_dir)
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        self.validate = validate
+        self.source = source_digest()
+        self.results: Dict[str, FarmResult] = {}
+        self.stats = {"dispatched": 0, "retries": 0, "duplicates": 0, "rejected": 0, "cached": 0}
+
+        self._lock = threading.Lock()
+        self._finished = threading.Condition(self._lock)
+        self._tasks: Dict[str, _Task] = {}
+        self._pending: deque[_Task] = deque()
+        self._leased: Dict[str, _Task] = {}
+        self._workers: set = set()   # names of connected workers
+        self.address: Tuple[str, int] | None = None   # once serving
+        self._server: socketserver.ThreadingTCPServer | None = None
+        self._threads: List[threading.Thread] = []
+
+        for job in jobs:
+            self._tasks.setdefault(job.key, _Task(job.key, [])).jobs.append(job)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        for task in self._tasks.values():
+            data = self.cache.get(task.key)
+            report = self.cache.get(task.jobs[0].report_key) if self.validate else None
+            # A cached STL without the report it needs is rendered (and validated) again
+            if data is not None and (report is not None or not self.validate):
+                task.finished = True
+                validation = json.loads(report) if report is not None else None
+                for job in task.jobs:
+                    self.results[job.name] = self._write(job, data, validation, cached=True)
+                self.stats["cached"] += len(task.jobs)
+            else:
+                self._pending.append(task)
+        self._total = len(jobs)
+
+    # -- server -------------------------------------------------------------
+
+    def serve(self, host: str = "127.0.0.1", port: int = 0) -> Tuple[str, int]:
+        """Start accepting workers in background threads; returns the bound address."""
+        coordinator = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                coordinator._handle(self.request)
+
+        self._server = socketserver.ThreadingTCPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._threads = [
+            threading.Thread(target=self._server.serve_forever, daemon=True, name="farm-server"),
+            threading.Thread(target=self._reap, daemon=True, name="farm-reaper"),
+        ]
+        for t in self._threads:
+            t.start()
+        self.address = self._server.server_address[:2]
+        return self.address
+
+    def wait(self, timeout: float | None = None) -> Dict[str, FarmResult]:
+        """Block until every job has succeeded or failed (or the timeout passes)."""
+        with self._finished:
+            self._finished.wait_for(self.done, timeout)
+            return dict(self.results)
+
+    def done(self) -> bool:
+        return len(self.results) == self._total
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    # -- protocol -----------------------------------------------------------
+
+    def _hello(self, sock: socket.socket) -> str | None:
+        """Name of a worker that presented the token under a free name, else None."""
+        header, _ = recv_message(sock)
+        worker = header.get("worker")
+        if header.get("type") != "hello" or not hmac.compare_digest(
+                str(header.get("token", "")).encode(), self.token.encode()):
+            error = "bad farm token"
+        elif not isinstance(worker, str) or not worker:
+            error = "no worker name"
+        else:
+            with self._lock:
+                error = f"worker {worker} is already connected" if worker in self._workers else None
+                if error is None:
+                    self._workers.add(worker)
+        if error is not None:
+            with self._lock:
+                self.stats["rejected"] += 1
+            send_message(sock, {"type": "rejected", "error": error})
+            return None
+        try:
+            send_message(sock, {"type": "welcome"})
+        except OSError:
+            with self._lock:
+                self._workers.discard(worker)
+            raise
+        return worker
+
+    def _handle(self, sock: socket.socket):
+        worker = None
+        try:
+            worker = self._hello(sock)
+            if worker is None:
+                return
+            while True:
+                # The connection's worker, whatever a header claims
+                header, payload = recv_message(sock)
+                kind = header.get("type")
+                if kind == "get":
+                    reply, body = self._lease(worker)
+                    send_message(sock, reply, body)
+                elif kind == "heartbeat":
+                    self._heartbeat(worker, header["key"])
+                elif kind == "result":
+                    accepted = self._complete(worker, header, payload)
+                    send_message(sock, {"type": "ack", "accepted": accepted})
+        except (ConnectionError, OSError, ValueError):
+            pass
+        finally:
+            if worker is not None:
+                self._release(worker, "worker disconnected")
+                with self._lock:
+                    self._workers.discard(worker)
+
+    def _lease(self, worker: str) -> Tuple[Dict[str, Any], bytes]:
+        with self._lock:
+            if self._pending:
+                task = self._pending.popleft()
+                task.attempts += 1
+                task.worker = worker
+                task.holders.add(worker)
+                task.heartbeat = time.monotonic()
+                self._leased[task.key] = task
+                self.stats["dispatched"] += 1
+                job = task.jobs[0]
+                header = {
+                    "type": "job", "key": task.key, "name": job.name, "quality": job.quality,
+                    "part": job.part, "params": dict(job.params), "source": self.source,
+                    "renderer": renderer(), "validate": self.validate,
+                }
+                return header, job.scad.encode()
+            if self.done():
+                return {"type": "done"}, b""
+            return {"type": "wait", "retry": WAIT_INTERVAL}, b""
+
+    def _heartbeat(self, worker: str, key: str):
+        with self._lock:
+            task = self._leased.get(key)
+            if task is not None and task.worker == worker:
+                task.heartbeat = time.monotonic()
+
+    def _complete(self, worker: str, header: Dict[str, Any], payload: bytes) -> bool:
+        """Record a worker's result; False if it was dropped."""
+        key = header.get("key")
+        with self._lock:
+            task = self._tasks.get(key)
+            if task is None or worker not in task.holders:
+                # Never leased to this worker: nothing it sends may reach the cache
+                self.stats["rejected"] += 1
+                return False
+            if task.finished:
+                # Already finished by another worker after a re-queue
+                self.stats["duplicates"] += 1
+                return False
+            if not header.get("ok"):
+                if task.worker != worker:
+                    return False   # stale failure from a worker that lost the lease
+                del self._leased[key]
+                task.errors.append(f"{worker}: {header.get('error')}")
+                self._retry(task)
+                return True
+            # First good result wins, even from a worker whose lease expired
+            task.finished = True
+            self._leased.pop(key, None)
+            if task in self._pending:
+                self._pending.remove(task)
+
+        validation = header.get("validation")
+        self.cache.put(key, payload)
+        if validation is not None:
+            self.cache.put(task.jobs[0].report_key, json.dumps(validation).encode())
+        results = [
+            self._write(job, payload, validation, worker=worker, render_s=header.get("render_s", 0.0),
+                        attempts=task.attempts)
+            for job in task.jobs
+        ]
+        with self._finished:
+            for result in results:
+                self.results[result.name] = result
+            self._finished.notify_all()
+        return True
+
+    def _retry(self, task: _Task):
+        """Re-queue a task that lost its worker or failed (lock held)."""
+        task.worker = None
+        if task.attempts < self.max_attempts:
+            self.stats["retries"] += 1
+            self._pending.append(task)
+            return
+        task.finished = True
+        for job in task.jobs:
+            self.results[job.name] = FarmResult(
+                job.name, False, attempts=task.attempts, error="; ".join(task.errors),
+            )
+        self._finished.notify_all()
+
+    def _release(self, worker: str, reason: str):
+        with self._lock:
+            for key, task in list(self._leased.items()):
+                if task.worker == worker:
+                    del self._leased[key]
+                    task.errors.append(f"{worker}: {reason}")
+                    self._retry(task)
+
+    def _reap(self):
+        """Re-queue jobs whose worker stopped sending heartbeats."""
+        while self._server is not None:
+            time.sleep(min(self.lease_timeout / 4, 1.0))
+            now = time.monotonic()
+            with self._lock:
+                stale = [
+                    t for t in self._leased.values() if now - t.heartbeat > self.lease_timeout
+                ]
+                for task in stale:
+                    del self._leased[task.key]
+                    task.errors.append(f"{task.worker}: no heartbeat for {self.lease_timeout:.0f}s")
+                    self._retry(task)
+
+    def _write(self, job: FarmJob, stl: bytes, validation: Dict[str, Any] | None, **result) -> FarmResult:
+        """
+        Write one job's STL, its mesh cache and the worker's validation
+        report (checked against the job's shell count); returns its result.
+        """
+        from mesh.store import cache_stl
+        from mesh.validate import Validation, write_report
+
+        path = self.output_dir / f"{job.name}.stl"
+        tmp = path.with_suffix(f".tmp{threading.get_ident()}")
+        tmp.write_bytes(stl)
+        os.replace(tmp, path)
+        try:
+            cache_stl(path)
+        except ValueError:
+            pass   # empty or unreadable STL; the STL itself is still written
+        if not self.validate:
+            return FarmResult(job.name, True, **result)
+        if validation is None:
+            return FarmResult(job.name, False, error="STL INVALID: the worker sent no validation report",
+                              **result)
+        checked = Validation.from_dict({**validation, "expect_shells": job.expect_shells})
+        write_report(path, checked)
+        problems = checked.problems
+        return FarmResult(job.name, not problems, validation=checked.to_dict(),
+                          error=f"STL INVALID: {'; '.join(problems)}" if problems else None, **result)
+
+
+def render_job(header: Dict[str, Any], scad: bytes) -> bytes:
+    """
+    STL for a job: the shipped SCAD through OpenSCAD when installed,
+    otherwise the part rendered in-process (needs the same source tree).
+    The worker's renderer must be the one the job was keyed for.
+    """
+    if header.get("renderer") != renderer():
+        raise RuntimeError(f"worker renders with {renderer()}, the job is for {header.get('renderer')}")
+    if shutil.which("openscad"):
+        with tempfile.TemporaryDirectory() as tmp:
+            scad_path = Path(tmp) / f"{header['name']}.scad"
+            stl_path = Path(tmp) / f"{header['name']}.stl"
+            scad_path.write_bytes(scad)
+            _, ok, msg = run_openscad(scad_path, stl_path)
+            if not ok:
+                raise RuntimeError(msg)
+            return stl_path.read_bytes()
+
+    import registry
+    from pipeline.render import render_quality, stl_bytes
+
+    if not header.get("part"):
+        raise RuntimeError("OpenSCAD not installed and the part is not in the registry")
+    if header.get("source") != source_digest():
+        raise RuntimeError("OpenSCAD not installed and worker sources differ from the coordinator's")
+    parts = registry.load_all_parts()
+    with render_quality(header["quality"]):
+        shape = registry.materialize(header["part"], header.get("params"), parts)
+    return stl_bytes(shape, header["quality"])
+
+
+def run_worker(host: str, port: int, name: str | None = None,
+               render: Callable[[Dict[str, Any], bytes], bytes] = render_job,
+               heartbeat: float = HEARTBEAT_INTERVAL, token: str | None = None) -> int:
+    """
+    Pull and render jobs until the coordinator is done; returns jobs rendered.
+    `token` defaults to `FARM_TOKEN`; PermissionError if the coordinator rejects it.
+    """
+    from mesh.io import parse_stl
+    from mesh.validate import validate
+
+    name = name or f"{socket.gethostname()}:{os.getpid()}"
+    token = token or os.environ.get(TOKEN_ENV, "")
+    rendered = 0
+    with socket.create_connection((host, port)) as sock:
+        send_lock = threading.Lock()
+
+        def send(header, payload=b""):
+            with send_lock:
+                send_message(sock, {**header, "worker": name}, payload)
+
+        send({"type": "hello", "token": token})
+        reply, _ = recv_message(sock)
+        if reply["type"] != "welcome":
+            raise PermissionError(f"farm coordinator rejected {name}: {reply.get('error')}")
+
+        while True:
+            send({"type": "get"})
+            header, scad = recv_message(sock)
+            if header["type"] == "done":
+                return rendered
+            if header["type"] == "wait":
+                time.sleep(header.get("retry", WAIT_INTERVAL))
+                continue
+
+            stop = threading.Event()
+
+            def beat(key=header["key"]):
+                while not stop.wait(heartbeat):
+                    send({"type": "heartbeat", "key": key})
+
+            beater = threading.Thread(target=beat, daemon=True)
+            beater.start()
+            start = time.perf_counter()
+            try:
+                stl, result = render(header, scad), {"ok": True}
+                if header.get("validate"):
+                    # Shell counts are checked per part by the coordinator
+                    result["validation"] = validate(parse_stl(stl)).to_dict()
+            except Exception as e:
+                stl, result = b"", {"ok": False, "error": str(e).strip() or type(e).__name__}
+            finally:
+                stop.set()
+                beater.join()
+            result.update(type="result", key=header["key"], render_s=time.perf_counter() - start)
+            send(result, stl)
+            recv_message(sock)   # ack
+            rendered += result["ok"]
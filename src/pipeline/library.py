@@ -0,0 +1,124 @@
+"""
+Pre-rendered part library.
+Assemblies wrap their sub-parts with `prebuilt()`; while a MeshLibrary
+is active, each distinct sub-part is rendered once, cached as an STL
+keyed by its content hash, and the assembly references that mesh
+(OpenSCAD `import()`, or an inline polyhedron for in-process renders)
+instead of re-solving its booleans.
+"""
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict
+
+import anchorscad as ad
+from anchorscad import datatree
+
+from pipeline import trace
+from pipeline.cache import cache_key, source_digest
+from pipeline.render import DEFAULT_QUALITY, stl_bytes
+
+_ACTIVE: ContextVar["MeshLibrary | None"] = ContextVar("mesh_library", default=None)
+_INLINE: ContextVar[bool] = ContextVar("inline_meshes", default=False)
+
+
+@contextmanager
+def inline_meshes():
+    """Emit prebuilt parts as polyhedra (for renderers without import())."""
+    token = _INLINE.set(True)
+    try:
+        yield
+    finally:
+        _INLINE.reset(token)
+
+
+class MeshLibrary:
+    """Content-keyed STL cache of sub-part renders, shared by every assembly in a build."""
+
+    def __init__(self, root: Path, quality: str = DEFAULT_QUALITY):
+        # OpenSCAD resolves import() against the SCAD file's directory, not the cwd
+        self.root = Path(root).resolve()
+        self.quality = quality
+        self.source = source_digest()
+        self.renders = 0
+        self._paths: Dict[str, Path] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def key(self, shape: ad.Shape) -> str:
+        # datatree repr covers the class and every (nested) dimension field.
+        return cache_key(shape=repr(shape), quality=self.quality, source=self.source)
+
+    def stl_path(self, shape: ad.Shape) -> Path:
+        """Path of the shape's cached STL, rendering it on first use."""
+        key = self.key(shape)
+        with self._lock:
+            if key in self._paths:
+                return self._paths[key]
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock, trace.span("library", shape=type(shape).__name__, cache="hit") as span:
+            path = self.root / f"{key}.stl"
+            if not path.exists():
+                span.set(cache="miss")
+                self.root.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(f".tmp{threading.get_ident()}")
+                stl = stl_bytes(shape, self.quality)
+                tmp.write_bytes(stl)
+                tmp.replace(path)
+                span.set(bytes=len(stl))
+                with self._lock:
+                    self.renders += 1
+            with self._lock:
+                self._paths[key] = path
+        return path
+
+    @contextmanager
+    def active(self):
+        """Make `prebuilt()` use this library for shapes constructed in the block."""
+        token = _ACTIVE.set(self)
+        try:
+            yield self
+        finally:
+            _ACTIVE.reset(token)
+
+
+@ad.shape
+@datatree
+class Prebuilt(ad.Shape):
+    """
+    Cached mesh of `shape`, in `shape`'s own frame.
+    Anchors resolve against the original shape, so placement code is unchanged.
+    """
+    shape: ad.Shape
+    stl_file: str
+
+    def render(self, renderer):
+        if _INLINE.get():
+            from mesh.store import read_cached_stl
+
+            mesh = read_cached_stl(Path(self.stl_file))
+            renderer.add(renderer.model.Polyhedron(
+                points=mesh.vertices.tolist(), faces=mesh.faces.tolist()
+            ))
+        else:
+            renderer.add(renderer.model.Import(file=self.stl_file))
+        return renderer
+
+    def at(self, *args, **kwds):
+        return self.shape.at(*args, **kwds)
+
+    def has_anchor(self, name):
+        return self.shape.has_anchor(name)
+
+    def anchor_names(self):
+        return self.shape.anchor_names()
+
+
+def prebuilt(shape: ad.Shape) -> ad.Shape:
+    """`shape` itself, or its cached mesh while a MeshLibrary is active."""
+    library = _ACTIVE.get()
+    if library is None:
+        return shape
+    return Prebuilt(shape=shape, stl_file=str(library.stl_path(shape)))
@@ -0,0 +1,181 @@
+"""
+Customer orders of Pico case variants (`bin/configure --orders`).
+Each row of an order file picks a configuration: part flags declared by
+the Pico panels' registry params (variation, with_hdd, ventilation,
+center_cutout) and PicoDimensions overrides in any other column, as
+field paths (wall_thickness, mobo.pcb_thickness). Blank cells keep the
+default. A configuration expands to one job per panel, keyed like the
+mesh library by the shape's datatree repr, so identical panels are
+rendered once per day's orders however many orders or configurations
+share them (the base panel, for example, does not depend on
+`variation`). Renders are kept under `<output>/parts/<key>.stl`, each
+validated (mesh.validate) into `<key>.validation.json`, and reused by
+later runs until the geometry sources change; each order gets a zip of
+its panels and an `order.json` with their validation results. Orders
+with an invalid panel get no bundle.
+"""
+
+import csv
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from pipeline.cache import cache_key, source_digest
+from pipeline.files import file_digest, write_atomic, write_zip
+from pipeline.render import DEFAULT_QUALITY
+
+PICO_PARTS = ("pico_base_panel", "pico_back_panel", "pico_top_shell")
+ORDER_COLUMN = "order"
+QUANTITY_COLUMN = "quantity"
+# Order ids name the bundle file and its top directory
+ORDER_ID = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]*")
+
+Items = Tuple[Tuple[str, Any], ...]
+
+
+@dataclass(frozen=True)
+class PartJob:
+    """One panel of a configuration: registry params plus dimension overrides."""
+    part: str
+    params: Items = ()
+    overrides: Items = ()
+
+    def shape(self, quality: str = DEFAULT_QUALITY):
+        import registry
+        from pipeline.render import apply_overrides, render_quality
+
+        registry.load_all_parts()
+        with render_quality(quality):
+            return apply_overrides(registry.materialize(self.part, dict(self.params)), dict(self.overrides))
+
+
+@dataclass
+class Order:
+    id: str
+    line: int
+    quantity: int
+    config: Dict[str, str]   # non-blank cells as written, other than order and quantity
+    jobs: List[PartJob] = field(default_factory=list)
+    keys: List[str] = field(default_factory=list)   # render key of each job
+
+
+def part_flags() -> Dict[str, List[str]]:
+    """Registry params of each Pico panel."""
+    import registry
+
+    registry.load_all_parts()
+    return {part: list(registry.get_params(part)) for part in PICO_PARTS}
+
+
+def read_orders(path: Path) -> List[Order]:
+    """Parse an order file; errors name the offending line."""
+    flags = part_flags()
+    all_flags = {name for names in flags.values() for name in names}
+    orders, seen = [], set()
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        if ORDER_COLUMN not in (reader.fieldnames or []):
+            raise ValueError(f"{path}: needs an '{ORDER_COLUMN}' column")
+        for row in reader:
+            line = reader.line_num
+            order_id = (row.pop(ORDER_COLUMN) or "").strip()
+            if not order_id:
+                raise ValueError(f"{path}:{line}: missing order id")
+            if order_id in seen:
+                raise ValueError(f"{path}:{line}: duplicate order '{order_id}'")
+            if not ORDER_ID.fullmatch(order_id):
+                raise ValueError(f"{path}:{line}: order id '{order_id}' may only use letters, digits, "
+                                 f"'.', '_' and '-', and must start with a letter or digit")
+            seen.add(order_id)
+            quantity = (row.pop(QUANTITY_COLUMN, "") or "").strip() or "1"
+            if not quantity.isdigit() or int(quantity) < 1:
+                raise ValueError(f"{path}:{line}: quantity must be a positive integer, got '{quantity}'")
+            config = {k.strip(): v.strip() for k, v in row.items() if k and v and v.strip()}
+            overrides = tuple(sorted((k, v) for k, v in config.items() if k not in all_flags))
+            order = Order(order_id, line, int(quantity), config)
+            for part in PICO_PARTS:
+                params = tuple(sorted((k, v) for k, v in config.items() if k in flags[part]))
+                order.jobs.append(PartJob(part, params, overrides))
+            orders.append(order)
+    return orders
+
+
+def plan(orders: List[Order], quality: str = DEFAULT_QUALITY) -> Dict[str, PartJob]:
+    """Key every order's jobs; returns the unique jobs by key."""
+    source = source_digest()
+    unique: Dict[str, PartJob] = {}
+    for order in orders:
+        order.keys = []
+        for job in order.jobs:
+            try:
+                shape = job.shape(quality)
+            except (KeyError, ValueError) as e:
+                raise ValueError(f"order {order.id} (line {order.line}): {e}") from None
+            key = cache_key(shape=repr(shape), quality=quality, source=source)
+            unique.setdefault(key, job)
+            order.keys.append(key)
+    return unique
+
+
+def configurations(orders: List[Order]) -> Dict[Tuple[str, ...], List[str]]:
+    """Order ids grouped by identical panel keys."""
+    groups: Dict[Tuple[str, ...], List[str]] = {}
+    for order in orders:
+        groups.setdefault(tuple(order.keys), []).append(order.id)
+    return groups
+
+
+def part_path(parts_dir: Path, key: str) -> Path:
+    return Path(parts_dir) / f"{key}.stl"
+
+
+def part_validation(parts_dir: Path, key: str) -> Dict[str, Any]:
+    """Validation result of a rendered panel."""
+    return json.loads(part_path(parts_dir, key).with_suffix(".validation.json").read_text())
+
+
+def render_job(job: PartJob, path: Path, quality: str = DEFAULT_QUALITY) -> Tuple[Path, bool, str]:
+    """
+    Render and validate one unique panel to `path` (worker entry point).
+    The report is written first, so every panel STL has one.
+    """
+    import cadeng
+    from mesh.io import parse_stl
+    from mesh.validate import validate_stl
+    from pipeline.render import stl_bytes
+
+    label = f"{job.part} {dict(job.params + job.overrides) or ''}".strip()
+    try:
+        stl = stl_bytes(job.shape(quality), quality)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        result = validate_stl(path, cadeng.expected_shells().get(job.part), parse_stl(stl))
+        write_atomic(path, stl)
+    except Exception as e:
+        return (path, False, f"STL ERROR: {label} - {e}")
+    if not result.ok:
+        return (path, False, f"STL INVALID: {label} - {'; '.join(result.problems)}")
+    return (path, True, f"STL OK: {label}")
+
+
+def write_bundle(order: Order, parts_dir: Path, output: Path, quality: str = DEFAULT_QUALITY) -> Path:
+    """`<output>/<order>.zip`: the order's panels and an order.json describing them."""
+    manifest = {
+        "order": order.id,
+        "quantity": order.quantity,
+        "config": order.config,
+        "quality": quality,
+        "parts": {
+            job.part: {"file": f"{job.part}.stl", "key": key, "sha256": file_digest(part_path(parts_dir, key)),
+                       "validation": part_validation(parts_dir, key)}
+            for job, key in zip(order.jobs, order.keys)
+        },
+    }
+    files = {f"{job.part}.stl": part_path(parts_dir, key).read_bytes()
+             for job, key in zip(order.jobs, order.keys)}
+    files["order.json"] = json.dumps(manifest, indent=2).encode()
+
+    path = Path(output) / f"{order.id}.zip"
+    write_zip(path, {f"{order.id}/{name}": data for name, data in files.items()})
+    return path
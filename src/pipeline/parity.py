@@ -0,0 +1,159 @@
+"""
+Parity between the legacy OpenSCAD library (modules/) and the AnchorSCAD
+port in src/.
+Legacy modules are rendered with OpenSCAD (cached by the content of the
+whole legacy tree, which rarely changes), Python parts in-process with
+manifold3d, and the two meshes compared by volume, bounding box and
+symmetric Hausdorff distance.
+"""
+
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator
+
+from mesh.compare import MeshComparison, compare
+from mesh.core import Mesh
+from mesh.store import read_cached_stl
+from pipeline.cache import cache_key, source_digest
+from pipeline.render import (
+    DEFAULT_QUALITY, QUALITY_PROFILES, model_attributes, render_quality, run_openscad,
+)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+LEGACY_ROOT = REPO_ROOT / "modules"
+
+
+@dataclass(frozen=True)
+class LegacyModule:
+    """A legacy SCAD module call equivalent to a registered part."""
+    file: str   # relative to modules/
+    call: str   # SCAD statement instantiating it
+
+
+LEGACY_PARTS: Dict[str, LegacyModule] = {
+    "ram_stick": LegacyModule("components/ram.scad", "ram_stick();"),
+    "ssd_2_5": LegacyModule("components/storage/ssd_2_5.scad", "ssd_2_5();"),
+    "hdd_3_5": LegacyModule("components/storage/hdd_3_5.scad", "hdd_3_5();"),
+    "fan_120_25": LegacyModule("components/cooling/fan_120.scad", "fan_120();"),
+    "fan_120_15": LegacyModule("components/cooling/fan_120mm_15mm.scad", "fan_120mm_15mm();"),
+    "psu_sfx": LegacyModule("components/power/psu_sfx.scad", "power_supply_sfx();"),
+    "psu_flex_atx": LegacyModule("components/power/psu_flex_atx.scad", "power_supply_flex_atx();"),
+    "pico_psu": LegacyModule("components/power/psu_pico.scad", "psu_pico();"),
+    "motherboard_mini_itx": LegacyModule("components/motherboard/motherboard.scad", "motherboard();"),
+    "atx24_pin_connector": LegacyModule(
+        "components/motherboard/atx_24pin_connector.scad", "atx_24pin_connector();"),
+    "noctua_l9": LegacyModule("components/cpu_cooler_nh_l9.scad", "noctua_nh_l9();"),
+    "noctua_l12s": LegacyModule("components/NH-L12S/heatsink.scad", "noctua_nh_l12s();"),
+    "cpu_base": LegacyModule("components/NH-L12S/cpu_base.scad", "nh_l12s_cpu_base();"),
+    "heatpipes": LegacyModule("components/NH-L12S/heatpipes.scad", "nh_l12s_heatpipes();"),
+    "heatsink_fins": LegacyModule("components/NH-L12S/heatsink_fins.scad", "nh_l12s_fins();"),
+    "dovetail_male": LegacyModule("util/dovetail/male_dovetail.scad", "male_dovetail();"),
+    "dovetail_female": LegacyModule("util/dovetail/female_dovetail.scad", "female_dovetail();"),
+}
+
+
+def legacy_scad(module: LegacyModule, quality: str = DEFAULT_QUALITY,
+                root: Path = LEGACY_ROOT) -> str:
+    """Wrapper source instantiating a legacy module (`use` skips its previews)."""
+    lines = []
+    fn = QUALITY_PROFILES[quality].fn
+    if fn is not None:
+        lines.append(f"$fn = {fn};")
+    lines.append(f"use <{(Path(root) / module.file).resolve()}>")
+    lines.append(module.call)
+    return "\n".join(lines) + "\n"
+
+
+def legacy_mesh(module: LegacyModule, cache_dir: Path, quality: str = DEFAULT_QUALITY,
+                root: Path = LEGACY_ROOT) -> Mesh:
+    """Render a legacy module with OpenSCAD, reusing the cached STL if present."""
+    source = legacy_scad(module, quality, root)
+    key = cache_key(scad=source, legacy=source_digest(root, "*.scad"))
+    stl_path = Path(cache_dir) / f"{key}.stl"
+    if not stl_path.exists():
+        stl_path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory() as tmp:
+            scad_path = Path(tmp) / "legacy.scad"
+            scad_path.write_text(source)
+            tmp_stl = Path(tmp) / "legacy.stl"
+            _, ok, msg = run_openscad(scad_path, tmp_stl)
+            if not ok:
+                raise RuntimeError(msg)
+            tmp_stl.replace(stl_path)
+    return read_cached_stl(stl_path)
+
+
+def python_mesh(name: str, quality: str = DEFAULT_QUALITY) -> Mesh:
+    """Render a registered part in-process."""
+    import registry
+    from mesh.parts import render_shape
+
+    factory, _ = registry.load_all_parts()[name]
+    with render_quality(quality):
+        shape = factory()
+    return render_shape(shape, model_attributes(quality))
+
+
+@dataclass(frozen=True)
+class Tolerances:
+    """Limits for a part to count as matching its legacy module."""
+    volume: float = 0.01      # relative
+    extents: float = 0.1      # mm
+    hausdorff: float = 0.5    # mm, on top of the sampling resolution
+
+
+@dataclass(frozen=True)
+class ParityResult:
+    """Parity of one part (`comparison` is legacy -> Python)."""
+    name: str
+    comparison: MeshComparison | None = None
+    error: str | None = None
+
+    def matches(self, tol: Tolerances = Tolerances()) -> bool:
+        c = self.comparison
+        return (
+            c is not None
+            and c.volume_error <= tol.volume
+            and c.extents_error <= tol.extents
+            and c.hausdorff <= tol.hausdorff + c.resolution
+        )
+
+    def to_dict(self, tol: Tolerances = Tolerances()) -> dict:
+        return {
+            "name": self.name,
+            "match": self.matches(tol),
+            "error": self.error,
+            **(self.comparison.to_dict() if self.comparison else {}),
+        }
+
+
+def check_parity(names: Iterable[str], cache_dir: Path, quality: str = DEFAULT_QUALITY,
+                 jobs: int | None = None, samples: int = 100_000) -> Iterator[ParityResult]:
+    """
+    Render every legacy module and Python part in a process pool and
+    yield each part's result as soon as both of its meshes are ready.
+    """
+    names = list(names)
+    with ProcessPoolExecutor(max_workers=jobs) as ex:
+        futures = {}
+        for name in names:
+            futures[ex.submit(legacy_mesh, LEGACY_PARTS[name], cache_dir, quality)] = (name, "legacy")
+            futures[ex.submit(python_mesh, name, quality)] = (name, "python")
+
+        meshes: Dict[str, Dict[str, Mesh]] = {name: {} for name in names}
+        failed = set()
+        for future in as_completed(futures):
+            name, side = futures[future]
+            if name in failed:
+                continue
+            try:
+                meshes[name][side] = future.result()
+            except Exception as e:
+                failed.add(name)
+                yield ParityResult(name, error=f"{side}: {str(e).strip() or type(e).__name__}")
+                continue
+            if len(meshes[name]) == 2:
+                pair = meshes.pop(name)
+                yield ParityResult(name, compare(pair["legacy"], pair["python"], samples))
@@ -0,0 +1,263 @@
+"""
+Per-part profiler for `bin/render --profile`.
+A sampling thread records the Python stack of the factory (and every
+build() it triggers) and of ad.render; the geometry stage is OpenSCAD,
+timed as a subprocess with its own timing and cache statistics parsed
+from stderr, or manifold3d in-process when OpenSCAD is not installed.
+Output per part, in one time scale so Python and CGAL compare directly:
+  <name>.folded  collapsed stacks ("a;b;c <microseconds>", flamegraph.pl input)
+  <name>.svg     flame graph
+  <name>.json    stage times, hotspots and OpenSCAD statistics
+"""
+
+import json
+import re
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from pipeline import trace
+
+DEFAULT_INTERVAL = 0.001  # seconds between stack samples
+
+
+def _label(code) -> str:
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+def _profiled(fn, args):
+    # Stack walks stop at this frame, so samples start at `fn`
+    return fn(*args)
+
+
+class Sampler:
+    """Samples the calling thread's stack every `interval` seconds while `run()` executes."""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        self.interval = interval
+        self.samples: Dict[str, Counter] = {}   # stage -> Counter[stack]
+        self.wall: Dict[str, float] = {}         # stage -> seconds
+
+    def run(self, stage: str, fn: Callable, *args):
+        """fn(*args), sampled under `stage`."""
+        counts = self.samples.setdefault(stage, Counter())
+        target = threading.get_ident()
+        stop = threading.Event()
+
+        def sample():
+            while not stop.wait(self.interval):
+                frame = sys._current_frames().get(target)
+                stack = []
+                while frame is not None and frame.f_code is not _profiled.__code__:
+                    stack.append(_label(frame.f_code))
+                    frame = frame.f_back
+                if frame is not None:   # inside fn, not still starting up
+                    counts[tuple(reversed(stack))] += 1
+
+        switch = sys.getswitchinterval()
+        sys.setswitchinterval(min(switch, self.interval))
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        start = time.perf_counter()
+        try:
+            return _profiled(fn, args)
+        finally:
+            self.wall[stage] = self.wall.get(stage, 0.0) + time.perf_counter() - start
+            stop.set()
+            sampler.join()
+            sys.setswitchinterval(switch)
+
+
+def parse_openscad_stats(stderr: str) -> Dict[str, Any]:
+    """Timing and cache statistics from OpenSCAD's console output."""
+    stats: Dict[str, Any] = {}
+    m = re.search(r"Total rendering time:\s*(\d+):(\d+):(\d+(?:\.\d+)?)", stderr)
+    if m:
+        stats["total_rendering_s"] = int(m[1]) * 3600 + int(m[2]) * 60 + float(m[3])
+    else:
+        # Releases before 2021: "0 hours, 0 minutes, 12 seconds"
+        m = re.search(r"Total rendering time:\s*(\d+) hours?, (\d+) minutes?, (\d+) seconds?", stderr)
+        if m:
+            stats["total_rendering_s"] = int(m[1]) * 3600 + int(m[2]) * 60 + int(m[3])
+    for key, pattern in {
+        "cgal_polyhedrons_in_cache": r"CGAL Polyhedrons in cache:\s*(\d+)",
+        "cgal_cache_bytes": r"CGAL cache size in bytes:\s*(\d+)",
+        "geometries_in_cache": r"Geometries in cache:\s*(\d+)",
+        "geometry_cache_bytes": r"Geometry cache size in bytes:\s*(\d+)",
+        "csg_tree_elements": r"Normalized (?:CSG )?tree has (\d+) elements",
+    }.items():
+        m = re.search(pattern, stderr)
+        if m:
+            stats[key] = int(m[1])
+    hits = len(re.findall(r"CGAL Cache hit", stderr))
+    inserts = len(re.findall(r"CGAL Cache insert", stderr))
+    if hits or inserts:
+        stats["cgal_cache_hits"], stats["cgal_cache_inserts"] = hits, inserts
+    return stats
+
+
+@dataclass
+class PartProfile:
+    """Sampled stacks and stage times of one part."""
+    name: str
+    stacks: Counter = field(default_factory=Counter)   # stack -> microseconds
+    stages: Dict[str, float] = field(default_factory=dict)   # stage -> wall seconds
+    openscad: Dict[str, Any] | None = None
+    error: str | None = None
+
+    @classmethod
+    def from_sampler(cls, name: str, sampler: Sampler) -> "PartProfile":
+        """Weight each stage's samples by that stage's wall time."""
+        result = cls(name, stages=dict(sampler.wall))
+        for stage, counts in sampler.samples.items():
+            total = sum(counts.values())
+            wall_us = sampler.wall.get(stage, 0.0) * 1e6
+            if not total:
+                result.stacks[(stage,)] += round(wall_us)
+                continue
+            for stack, count in counts.items():
+                result.stacks[(stage, *stack)] += round(wall_us * count / total)
+        return result
+
+    @property
+    def python_s(self) -> float:
+        return sum(s for stage, s in self.stages.items() if stage in ("factory", "render"))
+
+    @property
+    def build_s(self) -> float:
+        """Time inside any build() (part of the factory stage)."""
+        return sum(us for stack, us in self.stacks.items()
+                   if any(f.startswith("build (") for f in stack)) / 1e6
+
+    def hotspots(self, top: int = 15) -> List[Tuple[str, float, float]]:
+        """(function, self s, total s), slowest self time first."""
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, us in self.stacks.items():
+            own[stack[-1]] += us
+            for label in set(stack):
+                total[label] += us
+        return [(label, us / 1e6, total[label] / 1e6) for label, us in own.most_common(top)]
+
+    def collapsed(self) -> str:
+        return "".join(f"{';'.join(stack)} {us}\n" for stack, us in sorted(self.stacks.items()) if us)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "stages_s": {k: round(v, 6) for k, v in self.stages.items()},
+            "build_s": round(self.build_s, 6),
+            "openscad": self.openscad,
+            "hotspots": [
+                {"function": f, "self_s": round(s, 6), "total_s": round(t, 6)}
+                for f, s, t in self.hotspots()
+            ],
+            "error": self.error,
+        }
+
+
+def flame_svg(stacks: Counter, title: str, width: int = 1200, row: int = 17) -> str:
+    """Flame graph of collapsed stacks (root at the bottom, width by weight)."""
+    tree: Dict = {}
+    for stack, weight in stacks.items():
+        node = tree
+        for frame in stack:
+            entry = node.setdefault(frame, [0, {}])
+            entry[0] += weight
+            node = entry[1]
+    total = sum(stacks.values()) or 1
+
+    def depth(node):
+        return 1 + max((depth(child) for _, child in node.values()), default=0)
+
+    height = (depth(tree) + 1) * row + 20
+    scale = (width - 20) / total
+    rects = []
+
+    def place(node, x, level):
+        for frame, (weight, children) in sorted(node.items()):
+            w = weight * scale
+            if w >= 0.5:
+                y = height - (level + 1) * row - 10
+                hue = zlib.crc32(frame.encode()) % 50 if level else 200
+                text = frame if len(frame) * 7 < w else frame[:int(w / 7) - 2] + ".." if w > 28 else ""
+                rects.append(
+                    f'<g><title>{_xml(frame)} ({weight / 1e3:.1f} ms, {100 * weight / total:.1f}%)</title>'
+                    f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{row - 1}" '
+                    f'fill="hsl({hue},80%,60%)" rx="2"/>'
+                    f'<text x="{x + 3:.1f}" y="{y + row - 5}">{_xml(text)}</text></g>'
+                )
+                place(children, x, level + 1)
+            x += w
+
+    place(tree, 10, 0)
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'font-family="monospace" font-size="11">'
+        f'<rect width="100%" height="100%" fill="#fdfdf6"/>'
+        f'<text x="10" y="16" font-size="14">{_xml(title)}</text>'
+        + "".join(rects) + "</svg>\n"
+    )
+
+
+def _xml(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _run_openscad(scad: str, name: str) -> Tuple[float, Dict[str, Any]]:
+    with tempfile.TemporaryDirectory() as tmp:
+        scad_path = Path(tmp) / f"{name}.scad"
+        scad_path.write_text(scad)
+        start = time.perf_counter()
+        with trace.span("openscad", part=name) as span:
+            result = trace.run(["openscad", "-o", str(Path(tmp) / f"{name}.stl"), str(scad_path)],
+                               timeout=300)
+        elapsed = time.perf_counter() - start
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip() or f"openscad exit {result.returncode}")
+        stats = parse_openscad_stats(result.stderr)
+        stats["wall_s"] = round(elapsed, 6)
+        stats["peak_rss_kb"] = span.attributes.get("peak_rss_kb")
+        return elapsed, stats
+
+
+def profile_part(name: str, factory: Callable, output_dir: Path, quality: str,
+                 interval: float = DEFAULT_INTERVAL) -> PartProfile:
+    """Profile construction, SCAD render and geometry of one part; write its reports."""
+    import shutil
+    from mesh.parts import render_shape
+    from pipeline.render import model_attributes, render_quality, scad_source
+
+    sampler = Sampler(interval)
+    openscad = None
+    error = None
+    try:
+        with render_quality(quality):
+            shape = sampler.run("factory", factory)
+        scad = sampler.run("render", scad_source, shape, quality)
+        if shutil.which("openscad"):
+            elapsed, openscad = _run_openscad(scad, name)
+        else:
+            sampler.run("manifold", render_shape, shape, model_attributes(quality))
+    except Exception as e:
+        error = str(e).strip() or type(e).__name__
+
+    result = PartProfile.from_sampler(name, sampler)
+    result.openscad, result.error = openscad, error
+    if openscad is not None:
+        # The subprocess is one opaque frame on the same time scale
+        result.stages["openscad"] = elapsed
+        result.stacks[("openscad", "openscad (subprocess)")] += round(elapsed * 1e6)
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    (output_dir / f"{name}.folded").write_text(result.collapsed())
+    (output_dir / f"{name}.svg").write_text(flame_svg(result.stacks, f"{name} ({quality})"))
+    (output_dir / f"{name}.json").write_text(json.dumps(result.to_dict(), indent=2))
+    return result
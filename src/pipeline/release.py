@@ -0,0 +1,578 @@
+"""
+Resumable release builds (`bin/render --release major|minor|patch`, SPEC §1.5).
+A release is a DAG of tasks: per part SCAD -> STL -> scaled STLs,
+gallery screenshots, then packaging, upload and publishing. Each STL
+is validated (mesh.validate) on the worker that rendered it, and an
+invalid mesh stops the release at packaging. Work
+happens in `<output>/release/.<tag>.partial/`, where `state.json`
+checkpoints every finished task with a key over its inputs (task
+arguments, release settings, the source digest and the digests of its
+dependencies' outputs) and the sha256 of each file it wrote. Running the release
+again resumes it: tasks whose key still matches and whose outputs are
+intact are skipped, so an OpenSCAD timeout or OOM near the end only
+costs the tasks that had not finished. Once every task has succeeded
+the staged outputs move to `<output>/release/<tag>/` in one rename.
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from pipeline import trace
+from pipeline.cache import SRC_ROOT, cache_key, source_digest
+from pipeline.files import file_digest, write_atomic, write_zip
+
+REPO_ROOT = SRC_ROOT.parent
+BUMPS = ("major", "minor", "patch")
+STATE_VERSION = 1
+# Settings a resumed release keeps; asking for other values is an error
+FIXED_SETTINGS = ("quality", "emboss_version")
+
+# runner(task, staging, release, inputs) -> output paths relative to staging
+Runner = Callable[["Task", Path, Dict[str, Any], List[str]], List[str]]
+
+
+@dataclass
+class Task:
+    """One node of the release DAG; `kind` selects its runner."""
+    id: str
+    kind: str
+    deps: Tuple[str, ...] = ()
+    args: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class DagResult:
+    ran: List[str] = field(default_factory=list)
+    resumed: List[str] = field(default_factory=list)   # checkpointed by an earlier attempt
+    failed: Dict[str, str] = field(default_factory=dict)   # task id -> error
+    blocked: List[str] = field(default_factory=list)   # a dependency failed
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed and not self.blocked
+
+
+class Checkpoint:
+    """
+    Persisted release state: the release settings and, per task, its key,
+    output digests, duration and last error. Saved atomically after every
+    task, so a killed process leaves the last consistent state behind.
+    """
+
+    def __init__(self, path: Path, release: Dict[str, Any] | None = None):
+        self.path = Path(path)
+        self.release: Dict[str, Any] = dict(release or {})
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            state = json.loads(self.path.read_text())
+            if state.get("version") != STATE_VERSION:
+                raise ValueError(f"{self.path}: unsupported release state version {state.get('version')}")
+            self.release = state["release"]
+            self.tasks = state["tasks"]
+
+    def save(self):
+        state = {"version": STATE_VERSION, "release": self.release, "tasks": self.tasks}
+        write_atomic(self.path, json.dumps(state, indent=2, sort_keys=True).encode())
+
+    def outputs(self, task_id: str) -> Dict[str, str]:
+        """Relative path -> sha256 of a finished task's outputs."""
+        return self.tasks.get(task_id, {}).get("outputs", {})
+
+    def is_done(self, task_id: str, key: str, staging: Path) -> bool:
+        """Finished with the same key, and every output still on disk unchanged."""
+        record = self.tasks.get(task_id)
+        if not record or record.get("key") != key or record.get("error"):
+            return False
+        for rel, digest in record["outputs"].items():
+            path = Path(staging) / rel
+            if not path.is_file() or file_digest(path) != digest:
+                return False
+        return True
+
+    def complete(self, task_id: str, key: str, outputs: Dict[str, str], duration: float):
+        self.tasks[task_id] = {"key": key, "outputs": outputs, "duration_s": round(duration, 3)}
+        self.save()
+
+    def fail(self, task_id: str, key: str, error: str):
+        self.tasks[task_id] = {"key": key, "outputs": {}, "error": error}
+        self.save()
+
+
+def topological_order(tasks: List[Task]) -> List[Task]:
+    """Tasks with every dependency before its dependents (ValueError on unknown ids or cycles)."""
+    by_id = {t.id: t for t in tasks}
+    if len(by_id) != len(tasks):
+        raise ValueError("duplicate task ids")
+    order: List[Task] = []
+    state: Dict[str, int] = {}   # 1 visiting, 2 done
+
+    def visit(task: Task, path: Tuple[str, ...]):
+        if state.get(task.id) == 2:
+            return
+        if state.get(task.id) == 1:
+            raise ValueError(f"dependency cycle: {' -> '.join(path + (task.id,))}")
+        state[task.id] = 1
+        for dep in task.deps:
+            if dep not in by_id:
+                raise ValueError(f"{task.id} depends on unknown task {dep}")
+            visit(by_id[dep], path + (task.id,))
+        state[task.id] = 2
+        order.append(task)
+
+    for task in tasks:
+        visit(task, ())
+    return order
+
+
+def task_key(task: Task, release: Dict[str, Any], checkpoint: Checkpoint, source: str) -> str:
+    """Key over a task's inputs; `source` is the source_digest() of the tree rendering it."""
+    inputs = {dep: checkpoint.outputs(dep) for dep in task.deps}
+    settings = {k: release.get(k) for k in ("tag", "commit", "quality", "emboss_version")}
+    settings["source"] = source
+    return cache_key(id=task.id, kind=task.kind, args=task.args, release=settings, inputs=inputs)
+
+
+def _timed(runner: Runner, task: Task, staging: Path, release: Dict[str, Any],
+           inputs: List[str]) -> Tuple[List[str], float]:
+    start = time.perf_counter()
+    with trace.span("release", part=task.args.get("part"), task=task.id):
+        outputs = runner(task, staging, release, inputs)
+    return outputs, time.perf_counter() - start
+
+
+def run_dag(tasks: List[Task], checkpoint: Checkpoint, staging: Path,
+            runners: Dict[str, Runner] | None = None, jobs: int = 1,
+            executor: Executor | None = None,
+            progress: Callable[[str], None] = print) -> DagResult:
+    """
+    Run every task whose checkpoint is missing or stale, dependencies
+    first, up to `jobs` at a time, checkpointing each as it finishes.
+    A failed task blocks its dependents; independent tasks still run.
+    """
+    runners = RUNNERS if runners is None else runners
+    order = topological_order(tasks)
+    # The commit alone misses edits to a checked-out tree
+    source = source_digest()
+    staging = Path(staging)
+    staging.mkdir(parents=True, exist_ok=True)
+    result = DagResult()
+    finished: set = set()
+    pending = list(order)
+    running: Dict[Any, Tuple[Task, str]] = {}
+    own = executor is None
+    if own:
+        executor = ProcessPoolExecutor(max_workers=jobs)
+
+    def schedule():
+        for task in list(pending):
+            if any(dep in result.failed or dep in result.blocked for dep in task.deps):
+                pending.remove(task)
+                result.blocked.append(task.id)
+                progress(f"BLOCKED: {task.id}")
+                continue
+            if not all(dep in finished for dep in task.deps):
+                continue
+            pending.remove(task)
+            key = task_key(task, checkpoint.release, checkpoint, source)
+            if checkpoint.is_done(task.id, key, staging):
+                finished.add(task.id)
+                result.resumed.append(task.id)
+                continue
+            inputs = sorted(rel for dep in task.deps for rel in checkpoint.outputs(dep))
+            future = executor.submit(_timed, runners[task.kind], task, staging,
+                                     checkpoint.release, inputs)
+            running[future] = (task, key)
+
+    try:
+        schedule()
+        while running:
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                task, key = running.pop(future)
+                try:
+                    outputs, duration = future.result()
+                    digests = {rel: file_digest(staging / rel) for rel in outputs}
+                except Exception as e:
+                    error = str(e).strip() or type(e).__name__
+                    checkpoint.fail(task.id, key, error)
+                    result.failed[task.id] = error
+                    progress(f"FAILED: {task.id} - {error}")
+                    continue
+                checkpoint.complete(task.id, key, digests, duration)
+                finished.add(task.id)
+                result.ran.append(task.id)
+                progress(f"OK: {task.id} ({duration:.1f}s)")
+            schedule()
+    except BaseException:
+        # Interrupted: finished tasks are already checkpointed; drop the rest
+        for future in running:
+            future.cancel()
+        if own:
+            executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    if own:
+        executor.shutdown()
+    return result
+
+
+# -- Plan -------------------------------------------------------------------
+
+
+def plan(parts: List[str], scales: List[int], gallery: Dict[str, Dict[str, str]],
+         sizes: List[Tuple[int, int]], upload: bool = True) -> List[Task]:
+    """
+    Tasks of a release: SCAD -> STL -> scaled STLs for each printed part,
+    screenshots for each gallery model (name -> camera name -> camera
+    string), a package of everything, then the upload and publish steps.
+    """
+    tasks: List[Task] = []
+    packaged = []
+    for part in parts:
+        tasks.append(Task(f"scad:{part}", "scad", args={"part": part}))
+        tasks.append(Task(f"stl:{part}", "stl", (f"scad:{part}",), {"part": part}))
+        packaged.append(f"stl:{part}")
+        scaled = [s for s in scales if s != 100]
+        if scaled:
+            tasks.append(Task(f"scaled:{part}", "scaled", (f"stl:{part}",),
+                              {"part": part, "scales": scaled}))
+            packaged.append(f"scaled:{part}")
+    for model, views in sorted(gallery.items()):
+        tasks.append(Task(f"screenshots:{model}", "screenshots",
+                          args={"part": model, "views": views, "sizes": [list(s) for s in sizes]}))
+        packaged.append(f"screenshots:{model}")
+    tasks.append(Task("package", "package", tuple(packaged)))
+    if upload:
+        tasks.append(Task("upload", "upload", ("package", *packaged)))
+        tasks.append(Task("github", "github", ("package",)))
+        tasks.append(Task("publish", "publish", ("upload", "github")))
+    return tasks
+
+
+# -- Runners ----------------------------------------------------------------
+# Module-level so a ProcessPoolExecutor can pickle them. Each writes its
+# outputs atomically under `staging` and returns their relative paths.
+
+
+def _shape(part: str, release: Dict[str, Any]):
+    import registry
+    from pipeline.render import emboss_version, render_quality
+
+    factory, _ = registry.load_all_parts()[part]
+    with render_quality(release["quality"]), emboss_version(release["emboss_version"]):
+        return factory()
+
+
+def run_scad(task: Task, staging: Path, release: Dict[str, Any], inputs: List[str]) -> List[str]:
+    from pipeline.render import scad_source
+
+    rel = f"scad/{task.args['part']}.scad"
+    shape = _shape(task.args["part"], release)
+    write_atomic(staging / rel, scad_source(shape, release["quality"]).encode())
+    return [rel]
+
+
+def run_stl(task: Task, staging: Path, release: Dict[str, Any], inputs: List[str]) -> List[str]:
+    """OpenSCAD on the staged SCAD, or manifold3d in-process when it is not installed."""
+    from pipeline.render import run_openscad, stl_bytes
+
+    part = task.args["part"]
+    rel = f"stl/{part}.stl"
+    target = staging / rel
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if shutil.which("openscad"):
+        tmp = target.with_name(f".{part}.tmp{os.getpid()}.stl")
+        _, ok, msg = run_openscad(staging / f"scad/{part}.scad", tmp)
+        if not ok:
+            tmp.unlink(missing_ok=True)
+            raise RuntimeError(msg)
+        os.replace(tmp, target)
+    else:
+        write_atomic(target, stl_bytes(_shape(part, release), release["quality"]))
+    return [rel, _validate(part, staging)]
+
+
+def _validate(part: str, staging: Path) -> str:
+    """Check the part's STL on this worker; package() gathers the reports into the manifest."""
+    import cadeng
+    from mesh.io import read_stl
+    from mesh.validate import validate
+
+    rel = f"validation/{part}.json"
+    result = validate(read_stl(staging / f"stl/{part}.stl"), cadeng.expected_shells().get(part))
+    write_atomic(staging / rel, json.dumps(result.to_dict(), indent=2).encode())
+    return rel
+
+
+def run_scaled(task: Task, staging: Path, release: Dict[str, Any], inputs: List[str]) -> List[str]:
+    import io
+
+    import numpy as np
+
+    from mesh.io import read_stl, write_stl
+
+    part = task.args["part"]
+    mesh = read_stl(staging / f"stl/{part}.stl")
+    outputs = []
+    for scale in task.args["scales"]:
+        f = scale / 100
+        buf = io.BytesIO()
+        write_stl(buf, mesh.transformed(np.diag([f, f, f, 1.0])))
+        rel = f"stl/scaled/{part}_{scale}pct.stl"
+        write_atomic(staging / rel, buf.getvalue())
+        outputs.append(rel)
+    return outputs
+
+
+def run_screenshots(task: Task, staging: Path, release: Dict[str, Any], inputs: List[str]) -> List[str]:
+    """Gallery PNGs from the in-process rasterizer (as `bin/render --thumbnails`)."""
+    from pipeline.render import emboss_version, render_thumbnails
+
+    with emboss_version(release["emboss_version"]):
+        paths, ok, msg = render_thumbnails(
+            task.args["part"], task.args["views"], [tuple(s) for s in task.args["sizes"]],
+            staging / "screenshots", release["quality"], release.get("colorscheme"),
+        )
+    if not ok:
+        raise RuntimeError(msg)
+    return [str(Path(p).relative_to(staging)) for p in paths]
+
+
+def release_notes(release: Dict[str, Any], stls: List[str], screenshots: List[str]) -> str:
+    tag = release["tag"]
+    lines = [
+        f"# {tag}", "",
+        f"Built from `{release['commit'][:12]}` at `{release['quality']}` quality; "
+        f"parts are embossed `{release['emboss_version']}`.", "",
+        "## STLs", "",
+        *(f"- `{Path(s).name}`" for s in stls), "",
+    ]
+    if screenshots:
+        lines += ["## Screenshots", ""]
+        base = release.get("public_url")
+        for shot in screenshots:
+            name = Path(shot).name
+            lines.append(f"![{Path(shot).stem}]({base}/releases/{tag}/{shot})" if base else f"- `{name}`")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def run_package(task: Task, staging: Path, release: Dict[str, Any], inputs: List[str]) -> List[str]:
+    """
+    STL and screenshot archives, a sha256 manifest and the release notes.
+    Fails, after writing the manifest, if any STL did not validate.
+    """
+    tag = release["tag"]
+    stls = [r for r in inputs if r.startswith("stl/")]
+    validation = {Path(r).stem: json.loads((staging / r).read_text())
+                  for r in inputs if r.startswith("validation/")}
+    invalid = sorted(part for part, report in validation.items() if not report["ok"])
+    shots = [r for r in inputs if r.startswith("screenshots/")]
+    outputs = []
+    for name, files in ((f"dist/keystone-{tag}-stl.zip", stls),
+                        (f"dist/keystone-{tag}-screenshots.zip", shots)):
+        if files:
+            write_zip(staging / name, {rel: (staging / rel).read_bytes() for rel in files})
+            outputs.append(name)
+    manifest = {
+        "tag": tag,
+        "commit": release["commit"],
+        "emboss_version": release["emboss_version"],
+        "quality": release["quality"],
+        "files": {rel: {"sha256": file_digest(staging / rel), "bytes": (staging / rel).stat().st_size}
+                  for rel in sorted(inputs + outputs)},
+        "validation": validation,
+        "invalid": invalid,
+    }
+    write_atomic(staging / "dist/manifest.json", json.dumps(manifest, indent=2).encode())
+    if invalid:
+        raise RuntimeError(f"invalid meshes: {', '.join(invalid)} (see dist/manifest.json)")
+    write_atomic(staging / "dist/release-notes.md", release_notes(release, stls, shots).encode())
+    return outputs + ["dist/manifest.json", "dist/release-notes.md"]
+
+
+def _command(cmd: List[str], env: Dict[str, str] | None = None) -> str:
+    with trace.span(cmd[0]) as span:
+        result = trace.run(cmd, timeout=600, env=env)
+        if result.returncode != 0:
+            error = result.stderr.strip() or f"{cmd[0]} exit {result.returncode}"
+            span.fail(error)
+            raise RuntimeError(error)
+    return result.stdout
+
+
+def _r2_put(bucket: str, key: str, path: Path):
+    _command(["wrangler", "r2", "object", "put", f"{bucket}/{key}", "--file", str(path), "--remote"])
+
+
+def run_upload(task: Task, staging: Path, release: Dict[str, Any], inputs: List[str]) -> List[str]:
+    """Every packaged file to R2 under releases/<tag>/ (not yet `latest`)."""
+    for rel in inputs:
+        _r2_put(release["bucket"], f"releases/{release['tag']}/{rel}", staging / rel)
+    return []
+
+
+def run_github(task: Task, staging: Path, release: Dict[str, Any], inputs: List[str]) -> List[str]:
+    """Draft GitHub release with the archives and manifest; re-runs replace the assets."""
+    tag = release["tag"]
+    notes = str(staging / "dist/release-notes.md")
+    assets = [str(staging / rel) for rel in inputs if rel.endswith((".zip", ".json"))]
+    exists = subprocess.run(["gh", "release", "view", tag], cwd=REPO_ROOT,
+                            capture_output=True).returncode == 0
+    if exists:
+        _command(["gh", "release", "upload", tag, *assets, "--clobber"])
+        _command(["gh", "release", "edit", tag, "--notes-file", notes])
+    else:
+        _command(["gh", "release", "create", tag, *assets, "--draft", "--title", tag,
+                  "--notes-file", notes, "--target", release["commit"]])
+    return []
+
+
+def run_publish(task: Task, staging: Path, release: Dict[str, Any], inputs: List[str]) -> List[str]:
+    """Push the annotated tag, publish the draft and point R2 `latest` at it, last of all."""
+    tag = release["tag"]
+    if subprocess.run(["git", "rev-parse", "--verify", "--quiet", f"refs/tags/{tag}"],
+                      cwd=REPO_ROOT, capture_output=True).returncode != 0:
+        _git("tag", "-a", tag, release["commit"], "-m", f"Release {tag}")
+    _git("push", "origin", f"refs/tags/{tag}")
+    _command(["gh", "release", "edit", tag, "--draft=false"])
+    latest = staging / ".latest.json"
+    write_atomic(latest, json.dumps({"tag": tag, "commit": release["commit"]}).encode())
+    _r2_put(release["bucket"], "releases/latest.json", latest)
+    latest.unlink()
+    return []
+
+
+RUNNERS: Dict[str, Runner] = {
+    "scad": run_scad,
+    "stl": run_stl,
+    "scaled": run_scaled,
+    "screenshots": run_screenshots,
+    "package": run_package,
+    "upload": run_upload,
+    "github": run_github,
+    "publish": run_publish,
+}
+
+
+# -- Release ----------------------------------------------------------------
+
+
+def _git(*args: str) -> str:
+    result = subprocess.run(["git", *args], cwd=REPO_ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise ValueError(result.stderr.strip() or f"git {' '.join(args)} failed")
+    return result.stdout.strip()
+
+
+def next_version(bump: str, tags: List[str]) -> str:
+    """Next `vX.Y.Z` after the highest semver tag (v0.0.0 if there is none)."""
+    if bump not in BUMPS:
+        raise ValueError(f"bump must be one of {', '.join(BUMPS)}, got '{bump}'")
+    versions = [tuple(int(n) for n in m.groups())
+                for m in (re.fullmatch(r"v(\d+)\.(\d+)\.(\d+)", t) for t in tags) if m]
+    major, minor, patch = max(versions, default=(0, 0, 0))
+    if bump == "major":
+        return f"v{major + 1}.0.0"
+    if bump == "minor":
+        return f"v{major}.{minor + 1}.0"
+    return f"v{major}.{minor}.{patch + 1}"
+
+
+def load_env(path: Path = REPO_ROOT / ".env"):
+    """KEY=VALUE lines of .env into os.environ (existing variables win)."""
+    if Path(path).exists():
+        for line in Path(path).read_text().splitlines():
+            line = line.strip()
+            if line and not line.startswith("#") and "=" in line:
+                key, value = line.split("=", 1)
+                os.environ.setdefault(key.strip(), value.strip())
+
+
+def find_partial(root: Path) -> Checkpoint | None:
+    """The checkpoint of an unfinished release under `root`, if any."""
+    for state in sorted(Path(root).glob(".v*.partial/state.json")):
+        return Checkpoint(state)
+    return None
+
+
+def begin(bump: str, root: Path, settings: Dict[str, Any], restart: bool = False,
+          check_git: bool = True, defaults: Dict[str, Any] | None = None) -> Checkpoint:
+    """
+    Resume the unfinished release of this commit, or start a new one
+    (next semver tag); either way from a clean tree on main.
+    `settings` (quality, emboss_version, bucket, ...) are fixed when it
+    starts, so a resumed release embosses the same version; resuming
+    with a different quality or emboss_version fails. Settings left None
+    come from the checkpoint on a resume and from `defaults` otherwise.
+    """
+    root = Path(root)
+    commit = _git("rev-parse", "HEAD")
+    if check_git:
+        if _git("status", "--porcelain", "--untracked-files=no"):
+            raise ValueError("working tree has uncommitted changes")
+        branch = _git("rev-parse", "--abbrev-ref", "HEAD")
+        if branch != "main":
+            raise ValueError(f"releases are made from main, not {branch}")
+    partial = find_partial(root)
+    if partial is not None:
+        started = partial.release
+        if restart:
+            shutil.rmtree(partial.path.parent)
+        elif started["commit"] != commit:
+            raise ValueError(
+                f"release {started['tag']} of {started['commit'][:12]} is unfinished; "
+                f"check that commit out to resume it, or pass --restart-release"
+            )
+        elif started["bump"] != bump:
+            raise ValueError(f"release {started['tag']} is an unfinished {started['bump']} release")
+        else:
+            changed = [f"{key} {started.get(key)}, not {settings[key]}" for key in FIXED_SETTINGS
+                       if settings.get(key) is not None and settings[key] != started.get(key)]
+            if changed:
+                raise ValueError(
+                    f"release {started['tag']} was started with {'; '.join(changed)}; "
+                    f"resume it without them, or pass --restart-release"
+                )
+            return partial
+
+    if check_git:
+        # Tags made elsewhere count too; offline is fine
+        subprocess.run(["git", "fetch", "--tags", "--quiet"], cwd=REPO_ROOT, capture_output=True)
+    tag = next_version(bump, _git("tag", "--list", "v*").split())
+    if (root / tag).exists():
+        raise ValueError(f"{root / tag} already exists")
+
+    defaults = defaults or {}
+    settings = {key: defaults.get(key) if value is None else value for key, value in settings.items()}
+    checkpoint = Checkpoint(root / f".{tag}.partial" / "state.json", {
+        "tag": tag,
+        "bump": bump,
+        "commit": commit,
+        **settings,
+        "started": time.time(),
+    })
+    checkpoint.save()
+    return checkpoint
+
+
+def staging_dir(checkpoint: Checkpoint) -> Path:
+    return checkpoint.path.parent / "staging"
+
+
+def finish(checkpoint: Checkpoint) -> Path:
+    """Publish the staged outputs as `<root>/<tag>/` in one rename and drop the partial state."""
+    partial = checkpoint.path.parent
+    final = partial.parent / checkpoint.release["tag"]
+    staging = staging_dir(checkpoint)
+    shutil.copy2(checkpoint.path, staging / "release-state.json")
+    os.replace(staging, final)
+    shutil.rmtree(partial)
+    return final
@@ -0,0 +1,288 @@
+"""Shared render steps: parts -> SCAD source -> STL."""
+
+import dataclasses
+import functools
+import io
+import shutil
+import subprocess
+import tempfile
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import anchorscad as ad
+
+from pipeline import trace
+from vitamins.detail import BBOX, DETAILED, PROXY
+
+
+@dataclass(frozen=True)
+class QualityProfile:
+    """Render quality preset."""
+    name: str
+    fn: int | None  # default segment count for arcs that do not set their own
+    vitamin_detail: str = DETAILED  # level of detail for vitamins inside assemblies
+
+
+# standard keeps the detailed vitamins it always rendered; preview opts
+# assemblies into the cheap proxies
+QUALITY_PROFILES: Dict[str, QualityProfile] = {
+    q.name: q for q in [
+        QualityProfile("draft", fn=16, vitamin_detail=BBOX),
+        QualityProfile("preview", fn=None, vitamin_detail=PROXY),
+        QualityProfile("standard", fn=None, vitamin_detail=DETAILED),
+        QualityProfile("final", fn=128, vitamin_detail=DETAILED),
+    ]
+}
+DEFAULT_QUALITY = "standard"
+
+_QUALITY: ContextVar[str] = ContextVar("render_quality", default=DEFAULT_QUALITY)
+
+
+@contextmanager
+def render_quality(quality: str):
+    """Quality profile seen by shapes constructed in the block."""
+    if quality not in QUALITY_PROFILES:
+        raise ValueError(f"unknown quality '{quality}'")
+    token = _QUALITY.set(quality)
+    try:
+        yield QUALITY_PROFILES[quality]
+    finally:
+        _QUALITY.reset(token)
+
+
+def vitamin_detail() -> str:
+    """Vitamin level of detail for assemblies under the current quality profile."""
+    return QUALITY_PROFILES[_QUALITY.get()].vitamin_detail
+
+
+_EMBOSS_VERSION: ContextVar[str] = ContextVar("emboss_version", default="DEV")
+
+
+@contextmanager
+def emboss_version(version: str):
+    """Version stamp embossed by InfoEmbossers constructed in the block (SPEC §1.4)."""
+    token = _EMBOSS_VERSION.set(version)
+    try:
+        yield version
+    finally:
+        _EMBOSS_VERSION.reset(token)
+
+
+def current_emboss_version() -> str:
+    return _EMBOSS_VERSION.get()
+
+
+def _coerce(value: Any, current: Any) -> Any:
+    """Convert a (possibly string) override to the type of the field it replaces."""
+    if isinstance(current, float) and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    if not isinstance(value, str) or isinstance(current, str):
+        return value
+    if isinstance(current, bool):
+        if value.lower() in ("1", "true", "yes", "on"):
+            return True
+        if value.lower() in ("0", "false", "no", "off"):
+            return False
+        raise ValueError(f"not a boolean: {value!r}")
+    if isinstance(current, int):
+        return int(value)
+    if isinstance(current, float):
+        return float(value)
+    return value
+
+
+def _field(obj: Any, name: str) -> Any:
+    if not dataclasses.is_dataclass(obj) or name not in {f.name for f in dataclasses.fields(obj)}:
+        raise KeyError(f"{type(obj).__name__} has no field '{name}'")
+    return getattr(obj, name)
+
+
+def _replace_path(obj: Any, path: list[str], value: Any) -> Any:
+    name, rest = path[0], path[1:]
+    current = _field(obj, name)
+    new = _replace_path(current, rest, value) if rest else _coerce(value, current)
+    return dataclasses.replace(obj, **{name: new})
+
+
+def _override_path(key: str) -> list[str]:
+    path = key.split(".")
+    return path[1:] if path[0] == "shape" else ["dim"] + path
+
+
+def parse_overrides(shape: ad.Shape, overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Overrides converted to the types of the fields of `shape` they replace
+    (KeyError for unknown fields), so "2.5" and 2.5 are the same override.
+    """
+    parsed = {}
+    for key, value in overrides.items():
+        current = shape
+        for name in _override_path(key):
+            current = _field(current, name)
+        parsed[key] = _coerce(value, current)
+    return parsed
+
+
+def apply_overrides(shape: ad.Shape, overrides: Dict[str, Any]) -> ad.Shape:
+    """
+    Return a copy of `shape` with dimension overrides applied.
+    Keys are field paths relative to the shape's `dim`
+    (e.g. "wall_thickness", "mobo.pcb_thickness"); a leading "shape."
+    targets the shape's own fields instead (e.g. "shape.with_hdd").
+    """
+    for key, value in sorted(overrides.items()):
+        shape = _replace_path(shape, _override_path(key), value)
+    return shape
+
+
+def model_attributes(quality: str = DEFAULT_QUALITY) -> ad.ModelAttributes:
+    """Initial render attributes of a quality profile."""
+    profile = QUALITY_PROFILES[quality]
+    attrs = ad.ModelAttributes()
+    if profile.fn is not None:
+        attrs = attrs.with_fn(profile.fn)
+    return attrs
+
+
+def scad_source(shape: ad.Shape, quality: str = DEFAULT_QUALITY) -> str:
+    """Render a shape to OpenSCAD source."""
+    with trace.span("render"):
+        return str(ad.render(shape, initial_attrs=model_attributes(quality)).rendered_shape)
+
+
+def run_openscad(scad_path: Path, stl_path: Path) -> tuple[Path, bool, str]:
+    """Run OpenSCAD to convert SCAD to STL."""
+    with trace.span("openscad", part=Path(stl_path).stem) as span:
+        try:
+            result = trace.run(["openscad", "-o", str(stl_path), str(scad_path)], timeout=300)
+            if result.returncode == 0:
+                span.set(bytes=Path(stl_path).stat().st_size)
+                return (scad_path, True, f"STL OK: {stl_path.name}")
+            else:
+                span.fail(result.stderr.strip() or f"exit {result.returncode}")
+                return (scad_path, False, f"STL FAIL: {stl_path.name}\n{result.stderr}")
+        except Exception as e:
+            span.fail(str(e))
+            return (scad_path, False, f"STL ERROR: {stl_path.name} - {e}")
+
+
+def render_stl(scad_path: Path, stl_path: Path, expect_shells: int | None = None,
+               check: bool = True) -> tuple[Path, bool, str]:
+    """
+    run_openscad(), then write the STL's memory-mapped mesh cache beside
+    it and (with `check`) gate it on mesh.validate, writing
+    `<name>.validation.json`; an unprintable mesh fails the render.
+    """
+    from mesh.store import cache_stl
+    from mesh.validate import validate_stl
+
+    scad_path, ok, msg = run_openscad(scad_path, stl_path)
+    if not ok:
+        return (scad_path, ok, msg)
+    try:
+        with trace.span("write", part=Path(stl_path).stem, kind="mesh_cache") as span:
+            cache = cache_stl(stl_path)
+            span.set(bytes=sum(f.stat().st_size for f in cache.path.iterdir()))
+    except Exception as e:
+        return (scad_path, False, f"MESH CACHE ERROR: {stl_path.name} - {e}")
+    if check:
+        with trace.span("validate", part=Path(stl_path).stem) as span:
+            result = validate_stl(stl_path, expect_shells, cache.mesh)
+            if not result.ok:
+                span.fail("; ".join(result.problems))
+        if not result.ok:
+            return (scad_path, False, f"STL INVALID: {stl_path.name} - {'; '.join(result.problems)}")
+    return (scad_path, ok, msg)
+
+
+@functools.lru_cache(maxsize=None)
+def renderer() -> str:
+    """Name and version of the renderer stl_bytes() uses ("openscad 2021.01", "manifold3d 3.0.1")."""
+    if shutil.which("openscad"):
+        result = subprocess.run(["openscad", "--version"], capture_output=True, text=True, timeout=30)
+        words = (result.stderr or result.stdout).split()
+        return f"openscad {words[-1] if words else 'unknown'}"
+    from importlib.metadata import version
+
+    return f"manifold3d {version('manifold3d')}"
+
+
+def stl_bytes(shape: ad.Shape, quality: str = DEFAULT_QUALITY) -> bytes:
+    """
+    Render a shape to STL bytes.
+    Uses OpenSCAD when installed; otherwise evaluates in-process with manifold3d.
+    """
+    if shutil.which("openscad"):
+        with tempfile.TemporaryDirectory() as tmp:
+            scad_path = Path(tmp) / "part.scad"
+            stl_path = Path(tmp) / "part.stl"
+            scad_path.write_text(scad_source(shape, quality))
+            _, ok, msg = run_openscad(scad_path, stl_path)
+            if not ok:
+                raise RuntimeError(msg)
+            return stl_path.read_bytes()
+
+    from mesh.io import write_stl
+    from mesh.parts import render_shape
+
+    buf = io.BytesIO()
+    write_stl(buf, render_shape(shape, model_attributes(quality)))
+    return buf.getvalue()
+
+
+def render_thumbnails(name: str, views: Dict[str, str], sizes: List[Tuple[int, int]],
+                      output_dir: Path, quality: str = DEFAULT_QUALITY,
+                      colorscheme: str | None = None) -> tuple[List[Path], bool, str]:
+    """
+    Render a registered part once in-process and rasterize it for every
+    camera (name -> OpenSCAD camera string) and size into
+    `<output_dir>/<name>-<camera>-<W>x<H>.png`.
+    """
+    import registry
+    from analysis.images import write_png
+    from mesh.parts import render_coloured
+    from mesh.raster import COLOUR_SCHEMES, DEFAULT_SCHEME, parse_camera, rasterize
+
+    try:
+        factory, _ = registry.load_all_parts()[name]
+        with render_quality(quality):
+            shape = factory()
+        mesh, colours = render_coloured(shape, model_attributes(quality))
+        scheme = COLOUR_SCHEMES.get(colorscheme or DEFAULT_SCHEME, COLOUR_SCHEMES[DEFAULT_SCHEME])
+
+        paths = []
+        for camera, spec in views.items():
+            rotation = parse_camera(spec)
+            for width, height in sizes:
+                path = Path(output_dir) / f"{name}-{camera}-{width}x{height}.png"
+                write_png(path, rasterize(mesh, rotation, (width, height), colours, scheme))
+                paths.append(path)
+        return (paths, True, f"PNG OK: {name} ({len(paths)} images)")
+    except Exception as e:
+        return ([], False, f"PNG ERROR: {name} - {e}")
+
+
+def render_colour_3mf(name: str, output_dir: Path, quality: str = DEFAULT_QUALITY
+                      ) -> tuple[Path, bool, str]:
+    """
+    Render a registered part once, split by colour, into a multi-object
+    `<output_dir>/<name>.3mf` (one coloured object per material).
+    """
+    import registry
+    from mesh.io import write_3mf
+    from mesh.parts import render_colour_split
+
+    path = Path(output_dir) / f"{name}.3mf"
+    try:
+        factory, _ = registry.load_all_parts()[name]
+        with render_quality(quality):
+            shape = factory()
+        bodies = render_colour_split(shape, model_attributes(quality))
+        write_3mf(path, [(f"{name}-{colour}", mesh) for colour, _, mesh in bodies],
+                  [rgba for _, rgba, _ in bodies])
+        return (path, True, f"3MF OK: {name} ({', '.join(c for c, _, _ in bodies)})")
+    except Exception as e:
+        return (path, False, f"3MF ERROR: {name} - {e}")
@@ -0,0 +1,209 @@
+"""
+Parts as they were at other git revisions.
+A revision's src/ tree is exported once and each part is rendered from
+it with manifold3d in a child process (its modules can't share an
+interpreter with the working tree's). Meshes go through the mesh cache,
+keyed by the src/ tree hash, so unchanged trees and repeat diffs reuse
+earlier renders.
+"""
+
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+
+from mesh.compare import MeshDiff, diff as mesh_diff
+from mesh.core import Mesh
+from mesh.io import write_ply
+from mesh.store import load_mesh_cache, write_mesh_cache
+from pipeline.cache import cache_key, source_digest
+from pipeline.render import DEFAULT_QUALITY
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# Revision for the uncommitted working tree, rendered in this process
+WORKTREE = "WORKTREE"
+
+# Runs with the revision's src/ first on sys.path; must only rely on what
+# every revision has (registry and anchorscad), hence the fallbacks.
+_RENDER_SCRIPT = """
+import importlib, pkgutil, sys
+from unittest.mock import MagicMock
+sys.modules["OpenGL"] = MagicMock()
+sys.modules["OpenGL.GL"] = MagicMock()
+import numpy as np
+import anchorscad as ad
+from pythonopenscad.m3dapi import M3dRenderer
+import registry
+
+name, quality, out = sys.argv[1:4]
+if hasattr(registry, "load_all_parts"):
+    registry.load_all_parts()
+else:
+    for package, kind in (("vitamins", "vitamin"), ("components", "component"),
+                          ("assemblies", "assembly")):
+        pkg = importlib.import_module(package)
+        for _, mod, _ in pkgutil.walk_packages(pkg.__path__, package + "."):
+            registry.auto_register_module(importlib.import_module(mod), part_type=kind)
+factory, _ = registry.get_registry()[name]
+try:
+    from pipeline.render import render_quality
+except ImportError:
+    shape = factory()
+else:
+    with render_quality(quality):
+        shape = factory()
+try:
+    from pipeline.render import model_attributes
+    attrs = model_attributes(quality)
+except ImportError:
+    attrs = None
+m = ad.render(shape, initial_attrs=attrs).rendered_shape.renderObj(M3dRenderer())
+m = m.get_solid_manifold().to_mesh()
+np.save(out + ".vertices.npy", np.asarray(m.vert_properties)[:, :3])
+np.save(out + ".faces.npy", np.asarray(m.tri_verts))
+"""
+
+
+def _git(*args: str) -> bytes:
+    result = subprocess.run(["git", *args], cwd=REPO_ROOT, capture_output=True)
+    if result.returncode != 0:
+        raise ValueError(result.stderr.decode().strip() or f"git {' '.join(args)} failed")
+    return result.stdout
+
+
+def src_tree(rev: str) -> str:
+    """Hash of the src/ tree at a revision (shared by commits that leave src/ alone)."""
+    return _git("rev-parse", "--verify", f"{rev}^{{commit}}:src").decode().strip()
+
+
+def export_src(rev: str, cache_dir: Path) -> Path:
+    """
+    Directory holding the revision's src/, exported on first use.
+    Processes exporting the same tree race benignly: the first rename
+    wins and the others find the tree in place.
+    """
+    tree = src_tree(rev)
+    root = Path(cache_dir) / "src" / tree
+    if not (root / "src").exists():
+        data = _git("archive", "--format=tar", tree)
+        tmp = Path(tempfile.mkdtemp(dir=Path(cache_dir)))
+        try:
+            with tarfile.open(fileobj=io.BytesIO(data)) as tar:
+                tar.extractall(tmp / "src", filter="data")
+            root.mkdir(parents=True, exist_ok=True)
+            try:
+                (tmp / "src").replace(root / "src")
+            except OSError:
+                if not (root / "src").is_dir():
+                    raise
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+    return root / "src"
+
+
+def revision_mesh(name: str, rev: str, cache_dir: Path, quality: str = DEFAULT_QUALITY) -> Mesh:
+    """Mesh of a registered part at `rev` (or WORKTREE), cached by source tree."""
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    if rev == WORKTREE:
+        tree = source_digest()
+    else:
+        tree = src_tree(rev)
+    path = cache_dir / f"{cache_key(tree=tree, part=name, quality=quality)}.mesh"
+    cached = load_mesh_cache(path)
+    if cached is not None:
+        return cached.mesh
+
+    if rev == WORKTREE:
+        from pipeline.parity import python_mesh
+
+        mesh = python_mesh(name, quality)
+    else:
+        src = export_src(rev, cache_dir)
+        with tempfile.TemporaryDirectory() as tmp:
+            out = str(Path(tmp) / "mesh")
+            result = subprocess.run(
+                [sys.executable, "-c", _RENDER_SCRIPT, name, quality, out],
+                cwd=src.parent, capture_output=True, text=True,
+                env={**os.environ, "PYTHONPATH": str(src)},
+            )
+            if result.returncode != 0:
+                lines = result.stderr.strip().splitlines() or ["render failed"]
+                raise RuntimeError(f"{name} at {rev}: {lines[-1]}")
+            mesh = Mesh(np.load(out + ".vertices.npy"), np.load(out + ".faces.npy"))
+    write_mesh_cache(path, [(name, mesh)])
+    return mesh
+
+
+def parse_revisions(spec: str) -> Tuple[str, str]:
+    """"A..B" -> (A, B); a single revision is compared with the working tree."""
+    old, sep, new = spec.partition("..")
+    if not sep:
+        return spec, WORKTREE
+    return old or "HEAD", new or WORKTREE
+
+
+@dataclass(frozen=True)
+class PartDiff:
+    """A part's geometric change between two revisions."""
+    name: str
+    old: str
+    new: str
+    diff: MeshDiff | None = None
+    error: str | None = None
+
+    def to_dict(self) -> dict:
+        result = {"name": self.name, "old": self.old, "new": self.new, "error": self.error}
+        if self.diff is not None:
+            c = self.diff.comparison
+            result.update(
+                changed=self.diff.changed,
+                volume_delta=round(c.volume_b - c.volume_a, 3),
+                extents_delta=[round(b - a, 3) for a, b in zip(c.extents_a, c.extents_b)],
+                **c.to_dict(),
+            )
+        return result
+
+
+def write_heatmaps(result: PartDiff, output_dir: Path) -> Tuple[Path, Path]:
+    """
+    PLY heatmaps of where the surface moved: the new mesh coloured by
+    distance from the old one, and the old mesh by distance from the new
+    (shows removed material). Both share one scale, 0 to the Hausdorff distance.
+    """
+    from analysis.images import heatmap
+
+    d = result.diff
+    vmax = max(d.comparison.hausdorff, d.comparison.resolution)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    new_path = output_dir / f"{result.name}-added.ply"
+    old_path = output_dir / f"{result.name}-removed.ply"
+    write_ply(new_path, d.b, heatmap(d.added, 0.0, vmax))
+    write_ply(old_path, d.a, heatmap(d.removed, 0.0, vmax))
+    return new_path, old_path
+
+
+def diff_part(name: str, old: str, new: str, cache_dir: Path, output_dir: Path,
+              quality: str = DEFAULT_QUALITY, samples: int = 100_000) -> PartDiff:
+    """Render a part at both revisions, diff them and write the heatmaps and JSON."""
+    try:
+        a = revision_mesh(name, old, cache_dir, quality)
+        b = revision_mesh(name, new, cache_dir, quality)
+    except (RuntimeError, KeyError) as e:
+        # The part failed to render, or does not exist, at one of the revisions
+        return PartDiff(name, old, new, error=str(e).strip() or type(e).__name__)
+    result = PartDiff(name, old, new, mesh_diff(a, b, samples))
+    write_heatmaps(result, output_dir)
+    (Path(output_dir) / f"{name}.json").write_text(json.dumps(result.to_dict(), indent=2))
+    return result
@@ -0,0 +1,309 @@
+"""
+Long-lived render server.
+Keeps the part registry imported and serves SCAD/STL for
+"part + dimension overrides + quality" requests from a memory + disk
+LRU. Concurrent requests for the same artifact share one render, and
+interactive requests jump ahead of background prewarm work.
+"""
+
+import functools
+import itertools
+import json
+import os
+import queue
+import threading
+from collections import Counter
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterable, Tuple
+from urllib.parse import parse_qsl, urlparse
+
+import registry as part_registry
+from pipeline.cache import DiskLruCache, LruCache, cache_key, source_digest
+from pipeline.render import (
+    DEFAULT_QUALITY, QUALITY_PROFILES, apply_overrides, parse_overrides, render_quality, scad_source,
+    stl_bytes,
+)
+
+INTERACTIVE = 0
+PREWARM = 1
+
+FORMATS = {"scad": "text/plain; charset=utf-8", "stl": "model/stl"}
+
+
+class UnknownPart(LookupError):
+    """The request names a part that is not registered (HTTP 404)."""
+
+
+class UnknownField(LookupError):
+    """An override names a dimension field the part does not have (HTTP 404)."""
+
+
+@functools.lru_cache(maxsize=None)
+def _default_shape(factory) -> Any:
+    """A part at its default params: the field types overrides are parsed against."""
+    return factory()
+
+
+@dataclass(frozen=True)
+class RenderRequest:
+    """
+    One artifact: a part, its factory params, dimension overrides,
+    quality and output format.
+    """
+    part: str
+    overrides: Tuple[Tuple[str, Any], ...] = ()
+    quality: str = DEFAULT_QUALITY
+    format: str = "scad"
+    params: Tuple[Tuple[str, Any], ...] = ()
+
+    @classmethod
+    def create(cls, part: str, overrides: Dict[str, Any] | None = None,
+               quality: str = DEFAULT_QUALITY, format: str = "scad",
+               params: Dict[str, Any] | None = None,
+               registry: Dict[str, tuple] | None = None) -> "RenderRequest":
+        """
+        UnknownPart if `registry` is given and lacks the part, UnknownField
+        for overrides of fields the part does not have, ValueError for bad values.
+        """
+        if registry is not None and part not in registry:
+            raise UnknownPart(part)
+        if quality not in QUALITY_PROFILES:
+            raise ValueError(f"unknown quality '{quality}'")
+        if format not in FORMATS:
+            raise ValueError(f"unknown format '{format}'")
+        # Params and overrides are parsed (defaults filled in, values typed)
+        # so equivalent requests share a cache entry.
+        resolved = part_registry.resolve_params(part, params)
+        if overrides:
+            factory, _ = (registry or part_registry.get_registry()).get(part, (None, None))
+            if factory is None:
+                raise UnknownPart(part)
+            try:
+                overrides = parse_overrides(_default_shape(factory), overrides)
+            except KeyError as e:
+                raise UnknownField(e.args[0]) from None
+        return cls(
+            part, tuple(sorted((overrides or {}).items())), quality, format,
+            tuple(sorted(resolved.items())),
+        )
+
+    def key(self, source: str) -> str:
+        return cache_key(
+            part=self.part, params=self.params, overrides=self.overrides,
+            quality=self.quality, format=self.format, source=source,
+        )
+
+
+@dataclass
+class _Job:
+    request: RenderRequest
+    key: str
+    priority: int
+    future: Future = field(default_factory=Future)
+    started: bool = False
+
+
+class RenderService:
+    """Render worker pool with memory/disk caching and request coalescing."""
+
+    def __init__(self, registry: Dict[str, tuple], cache_dir: Path,
+                 workers: int | None = None,
+                 memory_bytes: int = 256 * 1024 * 1024,
+                 disk_bytes: int = 2 * 1024 * 1024 * 1024):
+        self.registry = registry
+        self.source = source_digest()
+        self.memory = LruCache(memory_bytes)
+        self.disk = DiskLruCache(cache_dir, disk_bytes)
+        self.stats: Counter = Counter()
+
+        self._queue: queue.PriorityQueue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._inflight: Dict[str, _Job] = {}
+        self._lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._work, daemon=True, name=f"render-{i}")
+            for i in range(workers or os.cpu_count() or 1)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, request: RenderRequest, priority: int = INTERACTIVE) -> Tuple[Future, str]:
+        """Queue a render; returns (future of bytes, cache status)."""
+        if request.part not in self.registry:
+            raise UnknownPart(request.part)
+        key = request.key(self.source)
+
+        data = self.memory.get(key)
+        if data is not None:
+            return self._done(data), self._count("memory")
+        data = self.disk.get(key)
+        if data is not None:
+            self.memory.put(key, data)
+            return self._done(data), self._count("disk")
+
+        with self._lock:
+            job = self._inflight.get(key)
+            if job is not None:
+                if priority < job.priority and not job.started:
+                    # Re-queue at the higher priority; the stale entry is skipped.
+                    job.priority = priority
+                    self._queue.put((priority, next(self._seq), job))
+                return job.future, self._count("coalesced")
+
+            job = _Job(request, key, priority)
+            self._inflight[key] = job
+            self._queue.put((priority, next(self._seq), job))
+        return job.future, self._count("miss")
+
+    def render(self, request: RenderRequest, timeout: float | None = None) -> Tuple[bytes, str]:
+        """Blocking interactive render."""
+        future, status = self.submit(request, INTERACTIVE)
+        return future.result(timeout), status
+
+    def prewarm(self, parts: Iterable[str], formats: Iterable[str] = ("scad",),
+                quality: str = DEFAULT_QUALITY):
+        """Queue default-parameter renders at background priority."""
+        for part in parts:
+            for fmt in formats:
+                self.submit(RenderRequest.create(part, quality=quality, format=fmt,
+                                                 registry=self.registry), PREWARM)
+
+    def close(self):
+        for _ in self._threads:
+            self._queue.put((float("inf"), next(self._seq), None))
+        for t in self._threads:
+            t.join()
+
+    def _count(self, status: str) -> str:
+        self.stats[status] += 1
+        return status
+
+    @staticmethod
+    def _done(data: bytes) -> Future:
+        f = Future()
+        f.set_result(data)
+        return f
+
+    def _work(self):
+        while True:
+            _, _, job = self._queue.get()
+            if job is None:
+                return
+            with self._lock:
+                if job.started:
+                    continue
+                job.started = True
+            try:
+                data = self._render(job.request)
+                self.memory.put(job.key, data)
+                self.disk.put(job.key, data)
+                job.future.set_result(data)
+            except Exception as e:
+                job.future.set_exception(e)
+            finally:
+                with self._lock:
+                    self._inflight.pop(job.key, None)
+
+    def _render(self, request: RenderRequest) -> bytes:
+        with render_quality(request.quality):
+            shape = part_registry.materialize(request.part, dict(request.params), self.registry)
+        shape = apply_overrides(shape, dict(request.overrides))
+        if request.format == "scad":
+            return scad_source(shape, request.quality).encode()
+        return stl_bytes(shape, request.quality)
+
+
+def _make_handler(service: RenderService):
+    class RenderHandler(BaseHTTPRequestHandler):
+        """
+        GET  /parts                           -> JSON list of parts
+        GET  /stats                           -> cache counters
+        GET  /render/<part>.<scad|stl>?quality=draft&with_hdd=true&wall_thickness=2.5
+             (query keys in the part's param schema are factory params,
+             the rest are dimension overrides)
+        POST /render  {"part", "format", "quality", "params": {...}, "overrides": {...}}
+        """
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/parts":
+                parts = [
+                    {
+                        "name": name,
+                        "type": ptype,
+                        "params": {k: p.schema() for k, p in part_registry.get_params(name).items()},
+                    }
+                    for name, (_, ptype) in sorted(service.registry.items())
+                ]
+                return self._send_json(parts)
+            if url.path == "/stats":
+                return self._send_json(dict(service.stats))
+            if url.path.startswith("/render/"):
+                part, _, fmt = url.path[len("/render/"):].rpartition(".")
+                params = dict(parse_qsl(url.query))
+                quality = params.pop("quality", DEFAULT_QUALITY)
+                schema = part_registry.get_params(part)
+                factory_params = {k: v for k, v in params.items() if k in schema}
+                overrides = {k: v for k, v in params.items() if k not in schema}
+                return self._render(part, fmt, quality, overrides, factory_params)
+            self._send_error(HTTPStatus.NOT_FOUND, f"no route for {url.path}")
+
+        def do_POST(self):
+            if urlparse(self.path).path != "/render":
+                return self._send_error(HTTPStatus.NOT_FOUND, f"no route for {self.path}")
+            length = int(self.headers.get("Content-Length", 0))
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+            except json.JSONDecodeError as e:
+                return self._send_error(HTTPStatus.BAD_REQUEST, f"invalid JSON: {e}")
+            self._render(
+                body.get("part", ""), body.get("format", "scad"),
+                body.get("quality", DEFAULT_QUALITY), body.get("overrides", {}),
+                body.get("params", {}),
+            )
+
+        def _render(self, part, fmt, quality, overrides, params=None):
+            try:
+                request = RenderRequest.create(part, overrides, quality, fmt, params, service.registry)
+                data, status = service.render(request)
+            except UnknownPart as e:
+                return self._send_error(HTTPStatus.NOT_FOUND, f"unknown part: {e}")
+            except UnknownField as e:
+                return self._send_error(HTTPStatus.NOT_FOUND, f"unknown field: {e}")
+            except (ValueError, TypeError) as e:
+                return self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+            except Exception as e:
+                return self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f"render failed: {e}")
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", FORMATS[fmt])
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header("X-Cache", status)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _send_json(self, payload, status=HTTPStatus.OK):
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _send_error(self, status, message):
+            self._send_json({"error": message}, status)
+
+        def log_message(self, format, *args):
+            pass
+
+    return RenderHandler
+
+
+def make_server(service: RenderService, host: str = "127.0.0.1", port: int = 9092) -> ThreadingHTTPServer:
+    """HTTP front end for a RenderService (port 0 picks a free port)."""
+    server = ThreadingHTTPServer((host, port), _make_handler(service))
+    server.daemon_threads = True
+    return server
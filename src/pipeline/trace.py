@@ -0,0 +1,302 @@
+"""
+Structured span events for the render scripts.
+`span(stage, part)` times one pipeline stage. While a trace is started
+(`start()`, or inherited through $KEYSTONE_TRACE by worker processes)
+each finished span is appended to a JSON lines file as one event:
+
+  {"trace": "...", "span": "...", "parent": "...", "stage": "openscad",
+   "part": "base", "start": 1760000000.1, "duration_s": 1.52, "ok": true,
+   "cache": "miss", "bytes": 183204, "peak_rss_kb": 412000, "pid": 4242}
+
+`summary_table()` aggregates a trace per stage and `write_otlp()`
+converts it to OTLP/JSON for an OpenTelemetry collector. Standard
+library only, so bin/screenshots can use it too.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+TRACE_ENV = "KEYSTONE_TRACE"
+TRACE_ID_ENV = "KEYSTONE_TRACE_ID"
+
+
+class Span:
+    """A running stage; `set()` attaches attributes to its event, `fail()` marks it failed."""
+
+    def __init__(self, stage: str, part: str | None, parent: "Span | None", attributes: Dict[str, Any]):
+        self.stage = stage
+        self.part = part if part is not None else (parent.part if parent else None)
+        self.id = os.urandom(8).hex()
+        self.parent = parent
+        self.attributes = attributes
+        self.error: str | None = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def fail(self, error: str):
+        self.error = error
+
+
+_CURRENT: ContextVar[Span | None] = ContextVar("trace_span", default=None)
+
+
+def start(path: Path) -> Path:
+    """Begin a new trace in `path` (truncated); child processes append to it."""
+    path = Path(path).resolve()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("")
+    os.environ[TRACE_ENV] = str(path)
+    os.environ[TRACE_ID_ENV] = os.urandom(16).hex()
+    return path
+
+
+def stop():
+    """Stop recording spans in this process and the processes it starts."""
+    os.environ.pop(TRACE_ENV, None)
+    os.environ.pop(TRACE_ID_ENV, None)
+
+
+def _emit(event: Dict[str, Any]):
+    path = os.environ.get(TRACE_ENV)
+    if not path:
+        return
+    line = (json.dumps(event, default=str) + "\n").encode()
+    # One O_APPEND write per event keeps lines from concurrent processes whole
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def span(stage: str, part: str | None = None, **attributes) -> Iterator[Span]:
+    """
+    Time the block as `stage` of `part` (default: the enclosing span's part).
+    An exception marks the event failed and propagates.
+    """
+    current = Span(stage, part, _CURRENT.get(), attributes)
+    token = _CURRENT.set(current)
+    started = time.time()
+    clock = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.fail(str(e).strip() or type(e).__name__)
+        raise
+    finally:
+        duration = time.perf_counter() - clock
+        _CURRENT.reset(token)
+        if os.environ.get(TRACE_ENV):
+            event = {
+                "trace": os.environ.get(TRACE_ID_ENV),
+                "span": current.id,
+                "parent": current.parent.id if current.parent else None,
+                "stage": stage,
+                "part": current.part,
+                "start": round(started, 6),
+                "duration_s": round(duration, 6),
+                "ok": current.error is None,
+                **current.attributes,
+                "pid": os.getpid(),
+            }
+            if current.error is not None:
+                event["error"] = current.error
+            _emit(event)
+
+
+def annotate(**attributes):
+    """Attach attributes to the innermost running span, if any."""
+    current = _CURRENT.get()
+    if current is not None:
+        current.set(**attributes)
+
+
+def run(cmd: List[str], timeout: float | None = None, env: Dict[str, str] | None = None
+        ) -> subprocess.CompletedProcess:
+    """
+    subprocess.run(cmd, capture_output=True, text=True, ...) that also
+    records the child's peak RSS as `peak_rss_kb` on the running span.
+    """
+    if not hasattr(os, "wait4"):
+        return subprocess.run(cmd, capture_output=True, text=True, timeout=timeout, env=env)
+
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        proc = subprocess.Popen(cmd, stdout=out, stderr=err, env=env)
+        expired = threading.Event()
+
+        def kill():
+            expired.set()
+            proc.kill()
+
+        timer = threading.Timer(timeout, kill) if timeout else None
+        if timer:
+            timer.start()
+        try:
+            _, status, usage = os.wait4(proc.pid, 0)
+        finally:
+            if timer:
+                timer.cancel()
+        proc.returncode = os.waitstatus_to_exitcode(status)
+
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        peak = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+        current = _CURRENT.get()
+        if current is not None:
+            current.set(peak_rss_kb=max(peak, current.attributes.get("peak_rss_kb", 0)))
+        if expired.is_set():
+            raise subprocess.TimeoutExpired(cmd, timeout)
+
+        out.seek(0)
+        err.seek(0)
+        return subprocess.CompletedProcess(
+            cmd, proc.returncode,
+            out.read().decode(errors="replace"), err.read().decode(errors="replace"),
+        )
+
+
+def read_events(path: Path) -> List[Dict[str, Any]]:
+    """Events of a trace file, skipping a torn final line."""
+    events = []
+    for line in Path(path).read_text().splitlines():
+        try:
+            events.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return events
+
+
+def _outermost(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Events that are not nested inside a span of their own stage."""
+    by_id = {e["span"]: e for e in events}
+
+    def nested(event):
+        parent = by_id.get(event.get("parent"))
+        while parent is not None:
+            if parent["stage"] == event["stage"]:
+                return True
+            parent = by_id.get(parent.get("parent"))
+        return False
+
+    return [e for e in events if not nested(e)]
+
+
+def summarize(events: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Per-stage totals. Stages overlap (factory contains build, build may
+    contain render), but a stage nested in itself, like the builds of
+    sub-shapes, only counts its outermost span.
+    """
+    stages: Dict[str, Dict[str, Any]] = {}
+    for event in _outermost(events):
+        s = stages.setdefault(event["stage"], {
+            "count": 0, "total_s": 0.0, "max_s": 0.0, "failed": 0,
+            "hits": 0, "misses": 0, "bytes": 0, "peak_rss_kb": 0,
+        })
+        s["count"] += 1
+        s["total_s"] += event["duration_s"]
+        s["max_s"] = max(s["max_s"], event["duration_s"])
+        s["failed"] += not event["ok"]
+        s["hits"] += event.get("cache") == "hit"
+        s["misses"] += event.get("cache") == "miss"
+        s["bytes"] += event.get("bytes", 0)
+        s["peak_rss_kb"] = max(s["peak_rss_kb"], event.get("peak_rss_kb", 0))
+    return stages
+
+
+def summary_table(events: List[Dict[str, Any]], slowest: int = 5) -> str:
+    """Per-stage summary and the slowest part stages, as printable text."""
+    lines = [
+        f"{'stage':<10} {'count':>6} {'total s':>9} {'max s':>8} {'cache hit/miss':>15} "
+        f"{'written MB':>11} {'peak RSS MB':>12} {'failed':>7}"
+    ]
+    for stage, s in sorted(summarize(events).items(), key=lambda kv: -kv[1]["total_s"]):
+        cache = f"{s['hits']}/{s['misses']}" if s["hits"] or s["misses"] else "-"
+        written = f"{s['bytes'] / 1e6:.2f}" if s["bytes"] else "-"
+        rss = f"{s['peak_rss_kb'] / 1024:.0f}" if s["peak_rss_kb"] else "-"
+        lines.append(
+            f"{stage:<10} {s['count']:>6} {s['total_s']:>9.2f} {s['max_s']:>8.2f} {cache:>15} "
+            f"{written:>11} {rss:>12} {s['failed']:>7}"
+        )
+    parts = sorted((e for e in _outermost(events) if e.get("part")), key=lambda e: -e["duration_s"])
+    if parts and slowest:
+        lines.append("slowest: " + ", ".join(
+            f"{e['stage']} {e['part']} {e['duration_s']:.2f}s" for e in parts[:slowest]
+        ))
+    return "\n".join(lines)
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+_SPAN_FIELDS = {"trace", "span", "parent", "stage", "start", "duration_s", "ok", "error"}
+
+
+def write_otlp(events: List[Dict[str, Any]], path: Path, service: str):
+    """Write events as an OTLP/JSON ExportTraceServiceRequest (one resource, one scope)."""
+    spans = []
+    for e in events:
+        start_ns = int(e["start"] * 1e9)
+        spans.append({
+            "traceId": e["trace"] or "0" * 32,
+            "spanId": e["span"],
+            **({"parentSpanId": e["parent"]} if e.get("parent") else {}),
+            "name": e["stage"],
+            "kind": 1,   # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(start_ns),
+            "endTimeUnixNano": str(start_ns + int(e["duration_s"] * 1e9)),
+            "attributes": [
+                {"key": k, "value": _otlp_value(v)}
+                for k, v in e.items() if k not in _SPAN_FIELDS and v is not None
+            ],
+            "status": {"code": 1} if e["ok"] else {"code": 2, "message": e.get("error", "")},
+        })
+    request = {"resourceSpans": [{
+        "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service}}]},
+        "scopeSpans": [{"scope": {"name": "keystone.pipeline"}, "spans": spans}],
+    }]}
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps(request))
+
+
+@contextmanager
+def trace_builds() -> Iterator[None]:
+    """
+    Within the block, record every CompositeShape.build() as a "build" span
+    (attribute `shape`: the class name). Patches anchorscad and restores
+    the original on exit; nested uses are no-ops.
+    """
+    import anchorscad as ad
+
+    post_init = ad.CompositeShape.__post_init__
+    if getattr(post_init, "_traced", False):
+        yield
+        return
+
+    def traced_post_init(self):
+        with span("build", shape=type(self).__name__):
+            post_init(self)
+
+    traced_post_init._traced = True
+    ad.CompositeShape.__post_init__ = traced_post_init
+    try:
+        yield
+    finally:
+        ad.CompositeShape.__post_init__ = post_init
@@ -1,28 +1,180 @@
 """Part registration system for AnchorSCAD shapes."""
 
 import anchorscad as ad
+import importlib
 import inspect
+import math
+import pkgutil
 import re
-from typing import Dict, Callable, List
+from dataclasses import dataclass
+from typing import Any, Dict, Callable, List, Tuple
+
+from pipeline import trace
 
 # Simple Registry — stores (factory, part_type) tuples
 _PART_REGISTRY: Dict[str, tuple[Callable, str]] = {}
 
+# Parameter schemas for factories that accept keyword arguments
+_PART_PARAMS: Dict[str, Dict[str, "Param"]] = {}
+
+# Module that defines each part (for mapping source changes to parts)
+_PART_MODULES: Dict[str, str] = {}
+
+
+@dataclass(frozen=True)
+class BoolParam:
+    """On/off factory option."""
+    default: bool = False
+    doc: str = ""
+
+    def parse(self, value: Any) -> bool:
+        if isinstance(value, bool):
+            return value
+        if str(value).lower() in ("1", "true", "yes", "on"):
+            return True
+        if str(value).lower() in ("0", "false", "no", "off"):
+            return False
+        raise ValueError(f"expected a boolean, got {value!r}")
+
+    def schema(self) -> dict:
+        return {"type": "bool", "default": self.default, "doc": self.doc}
+
+
+@dataclass(frozen=True)
+class EnumParam:
+    """One of a fixed set of string choices."""
+    choices: Tuple[str, ...]
+    default: str
+    doc: str = ""
+
+    def parse(self, value: Any) -> str:
+        if value not in self.choices:
+            raise ValueError(f"expected one of {', '.join(self.choices)}, got {value!r}")
+        return value
+
+    def schema(self) -> dict:
+        return {"type": "enum", "choices": list(self.choices), "default": self.default, "doc": self.doc}
+
+
+@dataclass(frozen=True)
+class FloatParam:
+    """Number within an optional [min, max] range."""
+    default: float
+    min: float | None = None
+    max: float | None = None
+    doc: str = ""
 
-def register_part(name: str, part_type: str = "component"):
-    """Decorator to register a part factory with its type."""
+    def parse(self, value: Any) -> float:
+        number = float(value)
+        # NaN compares False with both bounds, so it must be caught here
+        if not math.isfinite(number):
+            raise ValueError(f"expected a finite number, got {value!r}")
+        if (self.min is not None and number < self.min) or (self.max is not None and number > self.max):
+            raise ValueError(f"{number} outside range [{self.min}, {self.max}]")
+        return number
+
+    def schema(self) -> dict:
+        return {"type": "float", "default": self.default, "min": self.min, "max": self.max, "doc": self.doc}
+
+
+@dataclass(frozen=True)
+class IntParam:
+    """Whole number within an optional [min, max] range."""
+    default: int
+    min: int | None = None
+    max: int | None = None
+    doc: str = ""
+
+    def parse(self, value: Any) -> int:
+        if isinstance(value, float):
+            if not value.is_integer():
+                raise ValueError(f"expected a whole number, got {value!r}")
+            number = int(value)
+        else:
+            # int() of a string is exact; going through float is not above 2**53
+            try:
+                number = int(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"expected a whole number, got {value!r}") from None
+        if (self.min is not None and number < self.min) or (self.max is not None and number > self.max):
+            raise ValueError(f"{number} outside range [{self.min}, {self.max}]")
+        return number
+
+    def schema(self) -> dict:
+        return {"type": "int", "default": self.default, "min": self.min, "max": self.max, "doc": self.doc}
+
+
+Param = BoolParam | EnumParam | FloatParam | IntParam
+
+
+def register_part(name: str, part_type: str = "component", params: Dict[str, Param] | None = None):
+    """
+    Decorator to register a part factory with its type.
+    `params` declares the keyword arguments the factory accepts; only the
+    combinations actually requested are ever materialized.
+    """
 
     def decorator(cls_or_func):
         _PART_REGISTRY[name] = (cls_or_func, part_type)
+        _PART_MODULES[name] = cls_or_func.__module__
+        if params:
+            _PART_PARAMS[name] = dict(params)
         return cls_or_func
 
     return decorator
 
 
+def register_variant(name: str, base: str, **params):
+    """Register a named preset of a parameterized part (e.g. for the cadeng gallery)."""
+    _, part_type = _PART_REGISTRY[base]
+    resolved = resolve_params(base, params)
+    _PART_REGISTRY[name] = (lambda: materialize(base, resolved), part_type)
+    _PART_MODULES[name] = _PART_MODULES[base]
+
+
 def get_registry():
     return _PART_REGISTRY
 
 
+def get_params(name: str) -> Dict[str, Param]:
+    """Parameter schema of a part (empty for zero-argument factories)."""
+    return _PART_PARAMS.get(name, {})
+
+
+def part_module(name: str) -> str | None:
+    """Dotted name of the module a part is defined in."""
+    return _PART_MODULES.get(name)
+
+
+def resolve_params(name: str, params: Dict[str, Any] | None) -> Dict[str, Any]:
+    """Validate and coerce requested params, filling in defaults."""
+    schema = get_params(name)
+    params = dict(params or {})
+    unknown = set(params) - set(schema)
+    if unknown:
+        raise ValueError(f"{name} has no parameter(s): {', '.join(sorted(unknown))}")
+    return {key: p.parse(params[key]) if key in params else p.default for key, p in schema.items()}
+
+
+def materialize(name: str, params: Dict[str, Any] | None = None, registry: Dict | None = None) -> ad.Shape:
+    """Instantiate a registered part for one parameter combination."""
+    factory, _ = (registry or _PART_REGISTRY)[name]
+    resolved = resolve_params(name, params)
+    return factory(**resolved) if resolved else factory()
+
+
+def variant_name(name: str, params: Dict[str, Any] | None) -> str:
+    """File-safe name for a part + params; defaults are omitted."""
+    resolved = resolve_params(name, params)
+    schema = get_params(name)
+    parts = [
+        f"{key}-{str(value).lower()}"
+        for key, value in sorted(resolved.items())
+        if value != schema[key].default
+    ]
+    return "__".join([name] + parts)
+
+
 def camel_to_snake(name):
     name = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", name)
     return re.sub("([a-z0-9])([A-Z])", r"\1_\2", name).lower()
@@ -58,6 +210,7 @@ def auto_register_module(module, part_type: str = "component"):
                 if not required_args:
                     if part_name not in _PART_REGISTRY:
                         _PART_REGISTRY[part_name] = (lambda cls=obj: cls(), part_type)
+                        _PART_MODULES[part_name] = module.__name__
             except Exception:
                 pass
 
@@ -66,6 +219,44 @@ def list_parts() -> List[dict]:
     """Return JSON-serializable list with type from registry."""
     registry = get_registry()
     return [
-        {"name": name, "type": ptype, "stl": True}
+        {
+            "name": name,
+            "type": ptype,
+            "stl": True,
+            "params": {k: p.schema() for k, p in get_params(name).items()},
+        }
         for name, (factory, ptype) in sorted(registry.items())
     ]
+
+
+def _walk(package):
+    """Yield all submodules of a package."""
+    path = list(package.__path__)
+    prefix = package.__name__ + "."
+    for _, name, _ in pkgutil.walk_packages(path, prefix):
+        with trace.span("import", module=name):
+            module = importlib.import_module(name)
+        yield module
+
+
+def load_all_parts():
+    """Recursively import all modules in vitamins, components, and assemblies."""
+    with trace.span("registry"):
+        return _load_all_parts()
+
+
+def _load_all_parts():
+    import vitamins
+    import components
+    import assemblies
+
+    for mod in _walk(vitamins):
+        auto_register_module(mod, part_type="vitamin")
+
+    for mod in _walk(components):
+        auto_register_module(mod, part_type="component")
+
+    for mod in _walk(assemblies):
+        auto_register_module(mod, part_type="assembly")
+
+    return get_registry()
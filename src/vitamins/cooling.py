@@ -3,6 +3,8 @@ from anchorscad import datatree
 from typing import List, Tuple
 from dataclasses import field
 
+from vitamins.detail import BBOX, DETAILED, PROXY, check_detail
+
 @datatree
 class CoolingDimensions:
     """Dimensions for CPU Coolers and other cooling components."""
@@ -41,10 +43,16 @@ class FanDimensions:
 @ad.shape
 @datatree
 class Fan(ad.CompositeShape):
-    """A parametric case fan."""
+    """
+    A parametric case fan.
+    Proxy keeps the frame and airflow opening; bbox is the frame only.
+    """
     dim: FanDimensions
+    detail: str = DETAILED
     
     def build(self) -> ad.Maker:
+        check_detail(self.detail)
+
         # Frame
         frame = ad.Box([self.dim.size, self.dim.size, self.dim.thickness])
         
@@ -61,9 +69,13 @@ class Fan(ad.CompositeShape):
         # Assembly
         # Frame
         shape = frame.solid("frame").colour("tan" if self.dim.thickness == 15 else "dimgray").at("centre")
+        if self.detail == BBOX:
+            return shape
         
         # Subtract Center Hole
         shape.add_at(center_hole.hole("airflow").at("centre"))
+        if self.detail == PROXY:
+            return shape
         
         # Subtract Mounting Holes
         # Positions relative to center
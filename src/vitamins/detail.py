@@ -0,0 +1,21 @@
+"""
+Level-of-detail names shared by vitamin models.
+Vitamins keep their root solid (and so their anchors) at every level;
+cheaper levels only drop or merge the geometry added on top of it.
+"""
+
+from registry import EnumParam
+
+DETAILED = "detailed"  # standalone gallery renders
+PROXY = "proxy"        # envelope boxes plus key features, for assemblies
+BBOX = "bbox"          # each component as its bounding box, for fit checks
+
+DETAIL_LEVELS = (DETAILED, PROXY, BBOX)
+
+DETAIL = EnumParam(DETAIL_LEVELS, default=DETAILED, doc="Level of detail")
+
+
+def check_detail(detail: str) -> str:
+    if detail not in DETAIL_LEVELS:
+        raise ValueError(f"detail must be one of {', '.join(DETAIL_LEVELS)}, got {detail!r}")
+    return detail
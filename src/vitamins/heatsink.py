@@ -3,6 +3,7 @@ from anchorscad import datatree
 from dataclasses import field
 from registry import register_part
 from vitamins.cooling import CoolingDimensions, Fan, FanDimensions
+from vitamins.detail import BBOX, DETAIL, DETAILED, check_detail
 
 from dataclasses import dataclass
 
@@ -40,15 +41,15 @@ class NoctuaL12SConstants:
 
 NOCTUA_L12S = NoctuaL12SConstants()
 
-@register_part("noctua_l12s", part_type="vitamin")
-def create_noctua_l12s() -> ad.Shape:
+@register_part("noctua_l12s", part_type="vitamin", params={"detail": DETAIL})
+def create_noctua_l12s(detail=DETAILED) -> ad.Shape:
     """Creates a Noctua NH-L12S heatsink for rendering."""
-    return NoctuaL12S()
+    return NoctuaL12S(detail=detail)
 
-@register_part("noctua_l9", part_type="vitamin")
-def create_noctua_l9() -> ad.Shape:
+@register_part("noctua_l9", part_type="vitamin", params={"detail": DETAIL})
+def create_noctua_l9(detail=DETAILED) -> ad.Shape:
     """Creates a Noctua NH-L9 low-profile heatsink for rendering."""
-    return NoctuaL9()
+    return NoctuaL9(detail=detail)
 
 @ad.shape
 @datatree
@@ -96,8 +97,10 @@ class Heatpipes(ad.CompositeShape):
 class Fan120x15(ad.CompositeShape):
     size: float = 120.0
     thickness: float = 15.0
+    detail: str = DETAILED
     
     def build(self) -> ad.Maker:
+        check_detail(self.detail)
         # Frame Shape
         frame_shape = ad.Box([self.size, self.size, self.thickness])
         # Hole Shape
@@ -107,6 +110,8 @@ class Fan120x15(ad.CompositeShape):
         # Create Makers
         # Main body is solid, colored
         m_frame = frame_shape.solid("frame").colour("tan").at("centre")
+        if self.detail == BBOX:
+            return m_frame
         
         # Hole is a hole (subtraction)
         m_hole = hole_shape.hole("hole").at("centre")
@@ -123,8 +128,10 @@ class HeatsinkFins(ad.CompositeShape):
     d: float = 146.0
     h: float = 20.0
     cutout_depth: float = 13.0
+    detail: str = DETAILED
     
     def build(self) -> ad.Maker:
+        check_detail(self.detail)
         # Main block shape
         block_shape = ad.Box([self.w, self.d, self.h])
         
@@ -134,6 +141,8 @@ class HeatsinkFins(ad.CompositeShape):
         
         # Create Makers
         m_block = block_shape.solid("block").colour("silver").at("centre")
+        if self.detail == BBOX:
+            return m_block
         
         cutout_y = -(self.d / 2) + (self.cutout_depth / 2)
         m_cutout = cutout_shape.hole("cutout").at("centre", post=ad.translate([0, cutout_y, 0]))
@@ -156,8 +165,11 @@ class NoctuaL9(ad.CompositeShape):
     
     The assembly is anchored such that the CPU contact surface (bottom of Base)
     is at the origin (Z=0).
+
+    The fan follows `detail`; fins and base are plain boxes at every level.
     """
     dim: CoolingDimensions = field(default_factory=CoolingDimensions)
+    detail: str = DETAILED
 
     def build(self) -> ad.Maker:
         """
@@ -186,6 +198,8 @@ class NoctuaL9(ad.CompositeShape):
            - Fix: Applying `post=ad.translate([0, 0, -base_h / 2])` shifts the
              center to Z=+2.5, correctly placing the bottom face at Z=0.
         """
+        check_detail(self.detail)
+
         # Prioritize self.dim if provided, but default to constants if not set 
         # (Assuming self.dim always has values, we use them, but we expect config.py to inject these constants)
         base_h = self.dim.nh_l9_base_height
@@ -210,7 +224,7 @@ class NoctuaL9(ad.CompositeShape):
         )
 
         fan_dim = FanDimensions(size=fan_size, thickness=fan_h)
-        fan = Fan(dim=fan_dim)
+        fan = Fan(dim=fan_dim, detail=self.detail)
         assembly.add_at(
             fan.solid("fan").at("centre"),
             post=ad.translate([0, 0, base_h + fins_h + fan_h / 2])
@@ -226,10 +240,17 @@ class NoctuaL9(ad.CompositeShape):
 @ad.shape
 @datatree
 class NoctuaL12S(ad.CompositeShape):
-    """Noctua NH-L12S Low Profile Cooler."""
+    """
+    Noctua NH-L12S Low Profile Cooler.
+    Proxy replaces the heatpipes with their envelope box; bbox also fills
+    the fan opening and the fin cutout.
+    """
     dim: CoolingDimensions = field(default_factory=CoolingDimensions)
+    detail: str = DETAILED
     
     def build(self) -> ad.Maker:
+        check_detail(self.detail)
+
         # Dimensions
         base_h = NOCTUA_L12S.base_height
         pipes_h = NOCTUA_L12S.pipes_height
@@ -265,15 +286,26 @@ class NoctuaL12S(ad.CompositeShape):
         # So Heatpipes origin is at Z=0 (bottom of pipes).
         # We place Heatpipes origin at Z=base_h.
         
-        assembly.add_at(
-            pipes.solid("pipes").at("centre"), 
-            post=ad.translate([0, -53, base_h])
-        )
+        if self.detail != DETAILED:
+            # Envelope of the pipe row, placed exactly where the pipes would
+            # be (the row is centred at Z=-height/2 in Heatpipes' own frame).
+            pipes_w = (pipes.count - 1) * pipes.spacing + pipes.diameter
+            pipes_envelope = ad.Box([pipes_w, pipes.diameter, pipes_h])
+            assembly.add_at(
+                pipes_envelope.solid("pipes").colour([0.72, 0.45, 0.2]).at("centre"),
+                post=ad.translate([0, -53, base_h]) * pipes.at("centre").I
+                * ad.translate([0, 0, -pipes_h / 2])
+            )
+        else:
+            assembly.add_at(
+                pipes.solid("pipes").at("centre"), 
+                post=ad.translate([0, -53, base_h])
+            )
         
         # 3. Fan
         # Sits on top of pipes (Z = base_h + pipes_h = 35)
         # Centered in cooler (X=0, Y=0).
-        fan = Fan120x15()
+        fan = Fan120x15(detail=self.detail)
         # Fan.build() returns centered box.
         # Z_center = 35 + 15/2 = 42.5
         assembly.add_at(
@@ -284,7 +316,7 @@ class NoctuaL12S(ad.CompositeShape):
         # 4. Fins
         # Sit on top of fan (Z = 50)
         # Centered in cooler (X=0, Y=0).
-        fins = HeatsinkFins(h=fins_h)
+        fins = HeatsinkFins(h=fins_h, detail=self.detail)
         # Z_center = 50 + 20/2 = 60
         assembly.add_at(
             fins.solid("fins").at("centre"),
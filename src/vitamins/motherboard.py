@@ -3,6 +3,8 @@ from anchorscad import datatree
 from typing import Tuple, List
 from dataclasses import field
 
+from vitamins.detail import DETAILED, check_detail
+
 @datatree
 class MiniItxDimensions:
     """Standard Mini-ITX Motherboard Dimensions."""
@@ -47,10 +49,16 @@ class Atx24PinConnector(ad.CompositeShape):
 @ad.shape
 @datatree
 class MiniItxMotherboard(ad.CompositeShape):
-    """A mock shape for a Mini-ITX motherboard."""
+    """
+    A mock shape for a Mini-ITX motherboard.
+    Proxy and bbox levels use a plain box for the ATX connector.
+    """
     dim: MiniItxDimensions = field(default_factory=MiniItxDimensions)
+    detail: str = DETAILED
     
     def build(self) -> ad.Maker:
+        check_detail(self.detail)
+
         # PCB
         pcb = ad.Box([self.dim.width, self.dim.depth, self.dim.pcb_thickness])
         
@@ -64,6 +72,8 @@ class MiniItxMotherboard(ad.CompositeShape):
         
         # ATX Connector
         atx = Atx24PinConnector()
+        if self.detail != DETAILED:
+            atx = ad.Box([atx.length, atx.width, atx.height])
         
         # Assembly
         # PCB is base, centered at (0,0,0)
@@ -5,14 +5,16 @@ from dataclasses import field
 
 from config import PicoDimensions
 from registry import register_part
+from pipeline.library import prebuilt
+from vitamins.detail import DETAIL, DETAILED, check_detail
 from vitamins.motherboard import MiniItxMotherboard
 from vitamins.ram import RamStick
 from vitamins.psu import PicoPsu
 from vitamins.heatsink import NoctuaL9
 
-@register_part("motherboard_assembly_pico", part_type="vitamin")
-def create_motherboard_assembly_pico() -> ad.Shape:
-    return MotherboardAssemblyPico(dim=PicoDimensions())
+@register_part("motherboard_assembly_pico", part_type="vitamin", params={"detail": DETAIL})
+def create_motherboard_assembly_pico(detail=DETAILED) -> ad.Shape:
+    return MotherboardAssemblyPico(dim=PicoDimensions(), detail=detail)
 
 @ad.shape
 @datatree
@@ -20,13 +22,18 @@ class MotherboardAssemblyPico(ad.CompositeShape):
     """
     Assembly of Motherboard + RAM + Cooler + PicoPSU.
     Used for the Pico case configuration.
+    `detail` is passed on to the motherboard and cooler; assemblies set it
+    from the render quality profile (see pipeline.render).
     """
     dim: PicoDimensions
+    detail: str = DETAILED
     
     def build(self) -> ad.Maker:
+        detail = check_detail(self.detail)
+
         # 1. Motherboard
-        mobo = MiniItxMotherboard(dim=self.dim.mobo)
-        assembly = mobo.solid("motherboard").at("centre")
+        mobo = MiniItxMotherboard(dim=self.dim.mobo, detail=detail)
+        assembly = prebuilt(mobo).solid("motherboard").at("centre")
         
         # 2. RAM Stick (Slot 1)
         # Position approx: X=110, Y=50 (relative to corner). 
@@ -50,14 +57,14 @@ class MotherboardAssemblyPico(ad.CompositeShape):
         
         # First RAM stick
         assembly.add_at(
-            ram.solid("ram_stick_1").at("centre"),
+            prebuilt(ram).solid("ram_stick_1").at("centre"),
             post=ad.translate([ram_x1, ram_y1, ram_z])
         )
         
         # Second RAM stick (offset by 8mm in Y from the first)
         ram_y2 = ram_y1 + 8.0
         assembly.add_at(
-            ram.solid("ram_stick_2").at("centre"),
+            prebuilt(ram).solid("ram_stick_2").at("centre"),
             post=ad.translate([ram_x1, ram_y2, ram_z])
         )
         
@@ -68,7 +75,7 @@ class MotherboardAssemblyPico(ad.CompositeShape):
         # Cooler sits on top of CPU (on top of PCB).
         # We need to rotate it? "Rotated 90 deg CCW" in legacy scad.
         
-        cooler = NoctuaL9(dim=self.dim.cooling)
+        cooler = NoctuaL9(dim=self.dim.cooling, detail=detail)
         cooler_z = self.dim.mobo.pcb_thickness / 2
         
         # OpenSCAD: translate([115, 20, mobo_pcb_thickness]) -> relative to mobo bottom-front-left
@@ -80,7 +87,7 @@ class MotherboardAssemblyPico(ad.CompositeShape):
         # Motherboard front edge at Y=-85. Heatsink front edge at Y=-85 + 20 = -65.
         # Heatsink Y center = -65 + (95/2) = -65 + 47.5 = -17.5.
         assembly.add_at(
-            cooler.solid("cooler").at("base"), # Base anchor is contact surface
+            prebuilt(cooler).solid("cooler").at("base"), # Base anchor is contact surface
             post=ad.translate([-17.5, -17.5, cooler_z]) * ad.rotZ(90)
         )
         
@@ -108,7 +115,7 @@ class MotherboardAssemblyPico(ad.CompositeShape):
         psu_z = self.dim.mobo.pcb_thickness + psu.dim.connector_height / 2
         
         assembly.add_at(
-            psu.solid("pico_psu").at("centre"),
+            prebuilt(psu).solid("pico_psu").at("centre"),
             post=ad.translate([psu_x, psu_y, psu_z]) * ad.rotZ(90)
         )
         
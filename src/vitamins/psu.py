@@ -3,6 +3,8 @@ from anchorscad import datatree
 from typing import List, Tuple
 from dataclasses import field
 
+from vitamins.detail import DETAILED, check_detail
+
 @datatree
 class SfxDimensions:
     width: float = 125.0
@@ -34,9 +36,17 @@ class FlexAtxDimensions:
 @ad.shape
 @datatree
 class FlexAtxPsu(ad.CompositeShape):
+    """
+    Flex ATX PSU: body plus C14 inlet.
+    Both are already envelope boxes, so every detail level is the same
+    geometry; finer features belong to DETAILED only.
+    """
     dim: FlexAtxDimensions = field(default_factory=FlexAtxDimensions)
+    detail: str = DETAILED
     
     def build(self) -> ad.Maker:
+        check_detail(self.detail)
+
         # Main Body
         body = ad.Box([self.dim.width, self.dim.length, self.dim.height])
         
@@ -85,3 +85,49 @@ class SSD25(ad.CompositeShape):
         
         # Let's just place the point for now. Orientation can be refined.
         return ad.translate((x, y, z))
+
+
+@datatree
+class HDD35Dimensions:
+    """Standard 3.5" HDD Dimensions (SFF-8301)."""
+    width: float = 101.6
+    length: float = 147.0
+    height: float = 26.1
+
+    # Side mounting holes (6-32 UNC)
+    # Measured from front edge (y=0)
+    hole_front_y: float = 28.5
+    hole_rear_y: float = 130.1   # 101.6 spacing
+    # Measured from bottom surface (z=0)
+    hole_z: float = 6.35
+
+    @property
+    def side_hole_locations(self) -> List[Tuple[float, float, float]]:
+        """(x, y, z) side hole centres relative to the bottom-front-left corner, as SSD25Dimensions."""
+        return [
+            (0, self.hole_front_y, self.hole_z),            # Left Front
+            (0, self.hole_rear_y, self.hole_z),             # Left Rear
+            (self.width, self.hole_front_y, self.hole_z),   # Right Front
+            (self.width, self.hole_rear_y, self.hole_z)     # Right Rear
+        ]
+
+
+@ad.shape
+@datatree
+class HDD35(ad.CompositeShape):
+    """A mock shape for a 3.5" HDD."""
+    dim: HDD35Dimensions = field(default_factory=HDD35Dimensions)
+
+    def build(self) -> ad.Maker:
+        body = ad.Box([self.dim.width, self.dim.length, self.dim.height])
+        return body.solid("hdd_body").colour("dimgrey").at("centre")
+
+    @ad.anchor("side_hole")
+    def side_hole(self, index: int):
+        """Side mounting hole (0-3, same order as SSD25), relative to the centre."""
+        cx, cy, cz = self.dim.side_hole_locations[index]
+        return ad.translate((
+            cx - self.dim.width / 2,
+            cy - self.dim.length / 2,
+            cz - self.dim.height / 2,
+        ))
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from analysis.clearance import analyze, pico_meshes, write_report
+from analysis.voxel import Grid, signed_distance, voxelize, voxelize_union
+from mesh.core import Mesh
+
+
+def _hollow_box(outer, wall):
+    """Closed box shell as six non-overlapping wall slabs centred on the origin."""
+    x, y, z = outer
+    return Mesh.concatenate([
+        Mesh.box([x, y, wall], [0, 0, -(z - wall) / 2]),
+        Mesh.box([x, y, wall], [0, 0, (z - wall) / 2]),
+        Mesh.box([wall, y, z - 2 * wall], [-(x - wall) / 2, 0, 0]),
+        Mesh.box([wall, y, z - 2 * wall], [(x - wall) / 2, 0, 0]),
+        Mesh.box([x - 2 * wall, wall, z - 2 * wall], [0, -(y - wall) / 2, 0]),
+        Mesh.box([x - 2 * wall, wall, z - 2 * wall], [0, (y - wall) / 2, 0]),
+    ])
+
+
+def test_grid_around_aligns_to_pitch():
+    grid = Grid.around(np.array([[-1.2, 0, 0], [3.1, 2, 1]]), 0.5, pad=0)
+    assert grid.origin == (-1.5, 0.0, 0.0)
+    assert grid.shape == (10, 4, 2)
+
+
+def test_voxelized_box_volume_is_exact_on_aligned_grid():
+    box = Mesh.box([10, 20, 30], [1, 2, 3])
+    grid = Grid.around(box.bounds, 0.5)
+    assert voxelize(box, grid).sum() * grid.voxel_volume == pytest.approx(6000)
+
+
+def test_overlapping_parts_are_unioned():
+    a = Mesh.box([10, 10, 10], [0, 0, 0])
+    b = Mesh.box([10, 10, 10], [5, 0, 0])
+    grid = Grid.around(np.array([[-5, -5, -5], [10, 5, 5]]), 0.5)
+    union = voxelize_union([a, b], grid)
+    assert union.sum() * grid.voxel_volume == pytest.approx(1500)
+    # One parity fill of both shells cancels where they overlap
+    assert voxelize(Mesh.concatenate([a, b]), grid).sum() * grid.voxel_volume == pytest.approx(1000)
+
+    result = analyze([a, b], Mesh.box([1, 1, 1], [20, 0, 0]), pitch=0.5)
+    assert result.case.sum() * result.grid.voxel_volume == pytest.approx(1500)
+
+
+def test_signed_distance_sign_and_scale():
+    solid = np.zeros((20, 20, 20), dtype=bool)
+    solid[5:15, 5:15, 5:15] = True
+    sdf = signed_distance(solid, 0.5)
+    assert sdf[5, 10, 10] == 0 and sdf[10, 10, 10] < 0
+    assert sdf[10, 10, 19] == pytest.approx(2.5)
+
+
+def test_free_volume_and_min_clearance_of_boxed_contents():
+    case = _hollow_box([40, 40, 40], 2)
+    contents = Mesh.box([10, 10, 10], [0, 0, -8])  # 5 mm above the floor
+    result = analyze(case, contents, pitch=0.5)
+    assert result.free_volume() == pytest.approx(36 ** 3 - 1000, rel=0.01)
+    gap, where = result.min_clearance()
+    assert gap == pytest.approx(5.0, abs=0.6)
+    assert where[2] < -12
+    assert np.nanmax(result.clearance_map()) <= 36
+
+
+def test_pico_report_at_coarse_pitch(tmp_path):
+    case, contents = pico_meshes()
+    result = analyze(case, contents, pitch=2.0)
+    summary = write_report(result, tmp_path, slice_step=10)
+    assert 0 < summary["free_volume_cm3"] < summary["interior_volume_cm3"]
+    assert (tmp_path / "free_height.png").read_bytes().startswith(b"\x89PNG")
+    assert summary["slices"] and (tmp_path / "slices" / summary["slices"][0]).exists()
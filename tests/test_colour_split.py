@@ -0,0 +1,77 @@
+import xml.etree.ElementTree as ET
+import zipfile
+
+import anchorscad as ad
+import numpy as np
+import pytest
+
+from mesh.io import write_3mf
+from mesh.parts import colour_name, render_colour_split, render_shape
+
+
+def _volume(mesh) -> float:
+    a, b, c = mesh.triangles.transpose(1, 0, 2)
+    return float(np.einsum("ij,ij->i", a, np.cross(b, c)).sum() / 6)
+
+
+@ad.shape
+@ad.datatree
+class BossedPlate(ad.CompositeShape):
+    """Gray 20x20x2 plate with a dimgray 6x6x4 boss; one 2x2 hole through both."""
+
+    def build(self) -> ad.Maker:
+        maker = ad.Box([20, 20, 2]).solid("plate").colour("gray").at("centre")
+        maker.add_at(
+            ad.Box([6, 6, 4]).solid("boss").colour("dimgray").at("centre"),
+            "centre", post=ad.translate([0, 0, 2]),
+        )
+        maker.add_at(ad.Box([2, 2, 20]).hole("hole").at("centre"), "centre")
+        return maker
+
+
+def test_split_cuts_holes_through_every_colour():
+    bodies = {name: mesh for name, _, mesh in render_colour_split(BossedPlate())}
+    assert set(bodies) == {"gray", "dimgray"}
+    # The boss (added later) wins where it overlaps the plate
+    assert _volume(bodies["gray"]) == pytest.approx(20 * 20 * 2 - 6 * 6 * 1 - 2 * 2 * 1)
+    assert _volume(bodies["dimgray"]) == pytest.approx(6 * 6 * 4 - 2 * 2 * 4)
+    # Same solid as the single-material render, partitioned
+    total = sum(_volume(m) for m in bodies.values())
+    assert total == pytest.approx(_volume(render_shape(BossedPlate())))
+
+
+def test_colour_names():
+    assert colour_name((0.5019607843137255,) * 3 + (1.0,)) == "gray"
+    assert colour_name((0.72, 0.45, 0.2, 1.0)) == "#b87333"
+    assert colour_name((1.0, 0.0, 0.0, 0.5)) == "#ff000080"
+
+
+def test_3mf_objects_carry_colours(tmp_path):
+    bodies = render_colour_split(BossedPlate())
+    path = tmp_path / "plate.3mf"
+    write_3mf(path, [(name, mesh) for name, _, mesh in bodies], [rgba for _, rgba, _ in bodies])
+
+    ns = {"m": "http://schemas.microsoft.com/3dmanufacturing/core/2015/02"}
+    with zipfile.ZipFile(path) as z:
+        model = ET.fromstring(z.read("3D/3dmodel.model"))
+    bases = model.findall("m:resources/m:basematerials/m:base", ns)
+    objects = model.findall("m:resources/m:object", ns)
+    assert [b.get("displaycolor") for b in bases] == ["#808080FF", "#696969FF"]
+    assert [(o.get("name"), o.get("pindex")) for o in objects] == [("gray", "0"), ("dimgray", "1")]
+    assert len(model.findall("m:build/m:item", ns)) == 2
+
+
+def test_private_pythonopenscad_api_is_unchanged():
+    """render_colour_split() relies on these (pythonopenscad is pinned in pyproject.toml for them)."""
+    import manifold3d as m3d
+    from pythonopenscad.m3dapi import M3dRenderer, RenderContextManifold
+
+    renderer = M3dRenderer()._color_renderer("red", 0.5)
+    assert isinstance(renderer, M3dRenderer)
+    assert np.allclose(renderer.color_prop, [1, 0, 0, 0.5])
+
+    ctx = RenderContextManifold.with_manifold(renderer, m3d.Manifold.cube([1, 1, 1]))
+    for method in ("transform", "translate", "rotate", "scale", "mirror"):
+        assert callable(getattr(ctx, method, None)), method
+    moved = ctx.translate([2, 0, 0]).get_solid_manifold()
+    assert np.allclose(moved.bounding_box(), (2, 0, 0, 3, 1, 1))
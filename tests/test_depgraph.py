@@ -0,0 +1,69 @@
+from pathlib import Path
+
+from pipeline.depgraph import (
+    REPO_ROOT, affected_tests, build_graph, collect_test_files, dependents, module_name,
+)
+
+
+def _tree(tmp_path, files):
+    for name, text in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+    return tmp_path
+
+
+def test_module_name_for_src_and_tests():
+    assert module_name(REPO_ROOT / "src" / "vitamins" / "cooling.py") == "vitamins.cooling"
+    assert module_name(REPO_ROOT / "src" / "mesh" / "__init__.py") == "mesh"
+    assert module_name(REPO_ROOT / "tests" / "test_depgraph.py") == "tests.test_depgraph"
+
+
+def test_dependents_are_transitive():
+    graph = {"a": set(), "b": {"a"}, "c": {"b"}, "d": set()}
+    assert dependents(graph, ["a"]) == {"a", "b", "c"}
+    assert dependents(graph, ["d"]) == {"d"}
+
+
+def test_graph_resolves_from_and_relative_imports(tmp_path):
+    root = _tree(tmp_path, {
+        "pkg/__init__.py": "from .base import X\n",
+        "pkg/base.py": "X = 1\n",
+        "pkg/user.py": "from .base import X\nimport numpy\n",
+        "pkg/other.py": "from pkg import user\n",
+        "solo.py": "import pkg.other\n",
+    })
+    graph = build_graph([root], src_root=root)
+    assert graph["pkg"] == {"pkg.base"}
+    assert graph["pkg.user"] == {"pkg", "pkg.base"}
+    assert graph["pkg.other"] == {"pkg", "pkg.user"}
+    assert graph["solo"] == {"pkg", "pkg.other"}
+    assert dependents(graph, ["pkg.user"]) == {"pkg.user", "pkg.other", "solo"}
+
+
+def test_vitamin_change_selects_only_importing_tests():
+    graph = build_graph()
+    tests = sorted((REPO_ROOT / "tests").glob("*test*.py"))
+    heatsink = REPO_ROOT / "src" / "vitamins" / "heatsink.py"
+    selected = {p.name for p in affected_tests([heatsink], tests, graph)}
+    assert "test_heatsink_gap.py" in selected
+    assert "test_plate_packing.py" not in selected
+    assert "test_depgraph.py" not in selected
+
+
+def test_load_all_parts_depends_on_every_part_module():
+    graph = build_graph()
+    assert "components.case_pico" in graph["tests.test_part_params"]
+    # Part modules import registry but do not load the other parts.
+    assert "components.case_pico" not in graph["vitamins.heatsink"]
+
+
+def test_changed_test_file_selects_itself():
+    me = Path(__file__).resolve()
+    assert affected_tests([me], [me]) == [me]
+
+
+def test_collects_tests_that_import_src_without_pythonpath(monkeypatch):
+    monkeypatch.delenv("PYTHONPATH", raising=False)
+    files = collect_test_files([str(REPO_ROOT / "tests" / "test_pico_dimensions.py")])
+    assert files == [REPO_ROOT / "tests" / "test_pico_dimensions.py"]
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from components.drive_bay import DriveBayArray, DriveBayCell
+from config import MinimalDimensions
+from mesh.bvh import BVH
+from mesh.core import Mesh
+from mesh.parts import instanced_mesh, render_shape
+from mesh.properties import mass_properties
+from pipeline.library import MeshLibrary
+from pipeline.render import scad_source
+from registry import IntParam
+
+
+def test_two_hdd_bays_match_nas_2disk_width():
+    dim = MinimalDimensions()
+    array = DriveBayArray(dim=dim, columns=2, rows=1)
+    assert array.inner_width == pytest.approx(
+        dim.nas_2disk_width - 2 * (dim.wall_thickness + dim.nas_2disk_padding)
+    )
+
+
+def test_rails_have_screw_holes_on_drive_holes():
+    cell = DriveBayCell(with_drive=False)
+    bvh = BVH(render_shape(cell))
+    drive = cell.drive_dim
+    rail_w = cell.dim.nas_2disk_rail_width
+    floor_top = -cell.height / 2 + cell.bay.floor_thickness
+    origins, directions = [], []
+    # SFF-8301 side holes, cast inward from 1 mm outside each rail: through
+    # the hole centre, and 0.5 mm beyond the hole radius
+    for x, y, z in drive.side_hole_locations:
+        sign = 1 if x > 0 else -1
+        for dy in (0.0, cell.bay.screw_clearance_hole / 2 + 0.5):
+            origins.append([sign * (drive.width / 2 + rail_w + 1), y - cell.length / 2 + dy, floor_top + z])
+            directions.append([-sign, 0, 0])
+    t, _ = bvh.intersect(np.array(origins, dtype=float), np.array(directions, dtype=float))
+    assert np.all(np.isinf(t[0::2]))                    # clear through every hole
+    assert t[1::2] == pytest.approx(1.0)                # solid rail beside it
+
+
+def test_rails_stand_on_the_floor():
+    cell = DriveBayCell(with_drive=False)
+    bvh = BVH(render_shape(cell))
+    rail_x = (cell.drive_dim.width + cell.dim.nas_2disk_rail_width) / 2
+    # Upward from just inside the floor's underside: the first surface is
+    # the rail top, so there is no gap or internal face between them
+    origins = np.array([[sign * rail_x, 0.0, -cell.height / 2 + 0.01] for sign in (-1, 1)])
+    t, _ = bvh.intersect(origins, np.array([[0.0, 0.0, 1.0]] * 2))
+    assert t == pytest.approx(cell.bay.floor_thickness + cell.bay.rail_height - 0.01)
+
+
+def _shells(mesh) -> int:
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    n = len(mesh.vertices)
+    a, b = mesh.faces.ravel(), mesh.faces[:, [1, 2, 0]].ravel()
+    _, labels = connected_components(coo_matrix((np.ones(len(a)), (a, b)), shape=(n, n)), directed=False)
+    return len(np.unique(labels[mesh.faces.ravel()]))
+
+
+@pytest.mark.parametrize("with_drive", [False, True])
+def test_cell_is_one_body_centred_on_origin(with_drive):
+    cell = DriveBayCell(with_drive=with_drive)
+    mesh = Mesh.from_triangles(render_shape(cell).triangles)
+    assert _shells(mesh) == 1
+    # Floor at the bottom of the cell, rails standing on it
+    assert mesh.bounds[0][2] == pytest.approx(-cell.height / 2)
+    if with_drive:
+        assert mesh.bounds[1][2] == pytest.approx(cell.height / 2)
+
+
+def test_instanced_mesh_matches_direct_render():
+    array = DriveBayArray(columns=3, rows=2, drive="ssd25")
+    direct = render_shape(array)
+    instanced = instanced_mesh(array.layout())
+    assert np.allclose(direct.bounds, instanced.bounds, atol=1e-4)
+    assert mass_properties(instanced).volume == pytest.approx(mass_properties(direct).volume)
+    assert direct.extents[0] == pytest.approx(3 * array.pitch[0] - array.dim.nas_2disk_gap)
+
+
+def test_library_renders_cell_once(tmp_path):
+    library = MeshLibrary(tmp_path)
+    with library.active():
+        array = DriveBayArray(columns=4, rows=4)
+    assert library.renders == 1
+    assert scad_source(array).count("import(") == 16
+
+
+def test_int_param():
+    param = IntParam(2, min=1, max=16)
+    assert param.parse("4") == 4
+    with pytest.raises(ValueError):
+        param.parse("2.5")
+    with pytest.raises(ValueError):
+        param.parse(17)
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from mesh import glyphs
+from mesh.glyphs import GlyphLibrary, _signed_area, parse_font, resolve_font
+
+FONT = "Liberation Sans:style=Bold"
+
+
+@pytest.fixture(autouse=True)
+def glyph_cache(tmp_path, monkeypatch):
+    try:
+        resolve_font(FONT)
+    except FileNotFoundError:
+        pytest.skip("no fonts installed")
+    monkeypatch.setattr(glyphs, "GLYPH_CACHE_DIR", tmp_path / "glyphs")
+    glyphs.glyph_library.cache_clear()
+    yield tmp_path / "glyphs"
+    glyphs.glyph_library.cache_clear()
+
+
+def test_parse_font():
+    assert parse_font("Liberation Sans:style=Bold") == ("Liberation Sans", "Bold")
+    assert parse_font("DejaVu Sans") == ("DejaVu Sans", "Regular")
+
+
+def test_glyph_outlines_are_cached_on_disk(glyph_cache):
+    first = GlyphLibrary(FONT, 3.0, cache_dir=glyph_cache)
+    points, paths = first.layout(["PART: DEV"])
+    assert first.flattened == len(set("PART: DEV"))
+
+    again = GlyphLibrary(FONT, 3.0, cache_dir=glyph_cache)
+    cached_points, cached_paths = again.layout(["PART: DEV"])
+    assert again.flattened == 0
+    assert np.array_equal(points, cached_points)
+    assert [p.tolist() for p in paths] == [p.tolist() for p in cached_paths]
+
+    again.layout(["PARTS"])
+    assert again.flattened == 1                                   # only "S" is new
+    assert GlyphLibrary(FONT, 4.0, cache_dir=glyph_cache).path != again.path
+
+
+def test_holes_wind_opposite_to_outlines(glyph_cache):
+    library = GlyphLibrary(FONT, 10.0, cache_dir=glyph_cache)
+    _, contours = library.glyphs("O")["O"]
+    areas = sorted(_signed_area(c) for c in contours)
+    assert len(areas) == 2 and areas[0] < 0 < areas[1] and abs(areas[1]) > abs(areas[0])
+
+
+def test_layout_alignment_and_line_steps(glyph_cache):
+    library = GlyphLibrary(FONT, 3.0, cache_dir=glyph_cache)
+    advance = sum(library.glyphs("AB")[ch][0] for ch in "AB")
+    left, _ = library.layout(["AB"])
+    right, _ = library.layout(["AB"], halign="right")
+    assert np.allclose(right, left - [advance, 0])
+    wide, _ = library.layout(["AB"], spacing=2.0)
+    assert wide[:, 0].max() > left[:, 0].max()
+
+    two_lines, paths = library.layout(["A", "A"], line_spacing=2.0)
+    half = len(paths) // 2
+    first = np.concatenate([two_lines[p] for p in paths[:half]])
+    second = np.concatenate([two_lines[p] for p in paths[half:]])
+    assert np.allclose(second, first - [0, 6.0])   # size * line_spacing lower
+
+
+def test_info_embosser_is_one_extruded_polygon():
+    from components.info_embosser import InfoEmbosser
+    from mesh.parts import render_shape
+    from pipeline.render import emboss_version, scad_source
+
+    with emboss_version("v2026-10-19"):
+        embosser = InfoEmbosser(part_name="CASE-FP-PICO")
+    assert embosser.lines[0] == "PART: v2026-10-19 CASE-FP-PICO"
+    assert InfoEmbosser().version == "DEV"
+
+    source = scad_source(embosser)
+    assert source.count("polygon(") == 1 and "text(" not in source
+
+    # Legacy orientation: mirrored in X, reads upward in +Z, emboss depth along +Y
+    (x0, y0, z0), (x1, y1, z1) = render_shape(embosser).bounds
+    assert x1 <= 0 < -x0
+    assert (y0, y1) == pytest.approx((0, 0.4))
+    assert z1 == pytest.approx(embosser.text_size * 0.75, abs=0.5)   # cap height above baseline
+    assert z0 < -embosser.text_size * embosser.line_spacing            # second line below
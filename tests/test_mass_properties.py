@@ -0,0 +1,59 @@
+import numpy as np
+
+from mesh.core import Mesh
+from mesh.cost import MATERIALS, PrintSettings, cached_mass_properties, estimate
+from mesh.properties import mass_properties
+
+
+def test_box_volume_area_and_centre():
+    box = Mesh.box([10, 20, 30], centre=[5, -5, 15])
+    props = mass_properties(box)
+    assert np.isclose(props.volume, 6000.0)
+    assert np.isclose(props.area, 2 * (10 * 20 + 20 * 30 + 10 * 30))
+    assert np.allclose(props.centre_of_mass, [5, -5, 15])
+
+
+def test_inverted_winding_gives_negative_volume():
+    box = Mesh.box([10, 10, 10])
+    flipped = Mesh(box.vertices, box.faces[:, ::-1])
+    assert np.isclose(mass_properties(flipped).volume, -1000.0)
+
+
+def test_centre_of_mass_of_two_boxes_is_volume_weighted():
+    small = Mesh.box([10, 10, 10], centre=[0, 0, 0])
+    large = Mesh.box([20, 10, 10], centre=[100, 0, 0])
+    props = mass_properties(Mesh.concatenate([small, large]))
+    assert np.isclose(props.centre_of_mass[0], (0 * 1000 + 100 * 2000) / 3000)
+
+
+def test_estimate_grid_scales_with_infill_and_density():
+    props = mass_properties(Mesh.box([50, 50, 20]))
+    mats = [MATERIALS["PLA"], MATERIALS["ASA"]]
+    results = estimate(props, mats, [0.1, 0.5], PrintSettings())
+    assert len(results) == 4
+
+    by_key = {(r.material, r.infill): r for r in results}
+    assert by_key[("PLA", 0.5)].mass_g > by_key[("PLA", 0.1)].mass_g
+    assert by_key[("PLA", 0.5)].time_s > by_key[("PLA", 0.1)].time_s
+    # ASA is less dense than PLA
+    assert by_key[("ASA", 0.1)].mass_g < by_key[("PLA", 0.1)].mass_g
+
+
+def test_full_infill_matches_solid_volume():
+    props = mass_properties(Mesh.box([10, 10, 10]))
+    (pla,) = estimate(props, [MATERIALS["PLA"]], [1.0])
+    assert np.isclose(pla.mass_g, 1000 * 1.24 / 1000)
+
+
+def test_mass_properties_are_cached_by_key(tmp_path):
+    loads = []
+
+    def load():
+        loads.append(1)
+        return Mesh.box([10, 10, 10])
+
+    first = cached_mass_properties("box", load, tmp_path)
+    assert len(list(tmp_path.glob("*.json"))) == 1
+    second = cached_mass_properties("box", load, tmp_path)
+    assert second == first
+    assert len(loads) == 1, "a cache hit must not load the mesh"
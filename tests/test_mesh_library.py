@@ -0,0 +1,70 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import anchorscad as ad
+import numpy as np
+
+from config import PicoDimensions
+from components.case_pico import PicoBasePanel
+from mesh.parts import render_shape
+from mesh.properties import mass_properties
+from pipeline.library import MeshLibrary, Prebuilt, prebuilt
+from pipeline.render import scad_source
+from vitamins.motherboard_assembly import MotherboardAssemblyPico
+
+
+def test_prebuilt_is_a_no_op_without_library():
+    panel = PicoBasePanel(dim=PicoDimensions())
+    assert prebuilt(panel) is panel
+
+
+def test_prebuilt_keeps_anchors_and_geometry(tmp_path):
+    panel = PicoBasePanel(dim=PicoDimensions())
+    with MeshLibrary(tmp_path).active():
+        cached = prebuilt(panel)
+    assert isinstance(cached, Prebuilt)
+    assert np.allclose(cached.at("centre").A, panel.at("centre").A)
+    direct, placed = render_shape(panel), render_shape(cached)
+    assert np.allclose(direct.bounds, placed.bounds)
+    assert np.isclose(mass_properties(direct).volume, mass_properties(placed).volume)
+
+
+def test_assembly_renders_each_sub_part_once(tmp_path):
+    library = MeshLibrary(tmp_path)
+    with library.active():
+        first = MotherboardAssemblyPico(dim=PicoDimensions())
+        renders = library.renders
+        MotherboardAssemblyPico(dim=PicoDimensions())
+    # motherboard, one RAM stick (used twice), cooler, PSU
+    assert renders == 4
+    assert library.renders == renders
+    assert scad_source(first).count("import(") == 5
+
+    fresh = MeshLibrary(tmp_path)
+    with fresh.active():
+        MotherboardAssemblyPico(dim=PicoDimensions())
+    assert fresh.renders == 0
+
+
+def test_threads_count_every_render(tmp_path):
+    library = MeshLibrary(tmp_path)
+    boxes = [ad.Box([1, 1, 1 + i % 12]) for i in range(48)]
+    with ThreadPoolExecutor(8) as ex:
+        paths = list(ex.map(library.stl_path, boxes))
+    assert library.renders == 12
+    assert len(set(paths)) == 12
+
+
+def test_imports_are_absolute(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with MeshLibrary(Path("build/.cache/library")).active():
+        source = scad_source(prebuilt(ad.Box([1, 2, 3])))
+    assert f'import(file="{tmp_path / "build/.cache/library"}' in source
+
+
+def test_library_key_tracks_dimensions(tmp_path):
+    library = MeshLibrary(tmp_path)
+    assert library.key(ad.Box([1, 2, 3])) != library.key(ad.Box([1, 2, 4]))
+    assert library.key(PicoBasePanel(dim=PicoDimensions())) != library.key(
+        PicoBasePanel(dim=PicoDimensions(wall_thickness=2.5))
+    )
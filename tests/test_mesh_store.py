@@ -0,0 +1,90 @@
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from mesh.core import Mesh, translation
+from mesh.io import write_stl
+from mesh.store import (
+    MeshCache, load_mesh_cache, mesh_cache_path, read_cached_stl, write_mesh_cache,
+)
+
+
+def _solids():
+    return [
+        ("left", Mesh.box([10, 10, 10])),
+        ("right", Mesh.box([4, 6, 8]).transformed(translation([20, 0, 0]))),
+    ]
+
+
+def test_round_trip_is_memory_mapped(tmp_path):
+    write_mesh_cache(tmp_path / "pair.mesh", _solids())
+    cache = load_mesh_cache(tmp_path / "pair.mesh")
+    assert isinstance(cache.vertices, np.memmap) and isinstance(cache.faces, np.memmap)
+    assert cache.vertices.dtype == np.float32 and cache.faces.dtype == np.uint32
+    assert cache.names == ["left", "right"]
+    assert len(cache.mesh.faces) == 24
+    assert np.shares_memory(cache.mesh.vertices, cache.vertices)
+
+
+def test_solid_ranges(tmp_path):
+    write_mesh_cache(tmp_path / "pair.mesh", _solids())
+    right = MeshCache(tmp_path / "pair.mesh").solid("right")
+    expected = dict(_solids())["right"]
+    assert right.triangles == pytest.approx(expected.triangles)
+    with pytest.raises(KeyError):
+        MeshCache(tmp_path / "pair.mesh").solid("middle")
+
+
+def test_pickles_as_path(tmp_path):
+    write_mesh_cache(tmp_path / "pair.mesh", _solids())
+    cache = MeshCache(tmp_path / "pair.mesh")
+    data = pickle.dumps(cache)
+    assert len(data) < 500
+    assert pickle.loads(data).solid("left").extents == pytest.approx([10, 10, 10])
+
+
+def test_rewrite_replaces_cache(tmp_path):
+    path = tmp_path / "part.mesh"
+    write_mesh_cache(path, _solids())
+    write_mesh_cache(path, [("only", Mesh.box([1, 2, 3]))])
+    assert MeshCache(path).names == ["only"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["part.mesh"]
+
+
+def test_threads_rewriting_one_cache(tmp_path):
+    path = tmp_path / "part.mesh"
+    sizes = [[1 + i % 3, 2, 3] for i in range(32)]
+    with ThreadPoolExecutor(8) as ex:
+        list(ex.map(lambda size: write_mesh_cache(path, [("box", Mesh.box(size))]), sizes))
+    assert MeshCache(path).names == ["box"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["part.mesh"]
+
+
+def test_cache_being_replaced_is_a_miss(tmp_path):
+    stl = tmp_path / "part.stl"
+    write_stl(stl, Mesh.box([10, 20, 30]))
+    read_cached_stl(stl)
+    # Between the two renames of a rewrite the files are briefly gone
+    (mesh_cache_path(stl) / "vertices.npy").unlink()
+    assert read_cached_stl(stl).extents == pytest.approx([10, 20, 30])
+    assert load_mesh_cache(tmp_path / "part.mesh") is not None   # re-cached
+
+
+def test_missing_cache():
+    assert load_mesh_cache("/nonexistent/part.mesh") is None
+
+
+def test_stl_cache_follows_stl(tmp_path):
+    stl = tmp_path / "part.stl"
+    write_stl(stl, Mesh.box([10, 20, 30]))
+    assert read_cached_stl(stl).extents == pytest.approx([10, 20, 30])
+    assert mesh_cache_path(stl).is_dir()
+
+    # A newer STL invalidates the cache
+    write_stl(stl, Mesh.box([5, 5, 5]))
+    later = os.stat(mesh_cache_path(stl) / "solids.npy").st_mtime + 1
+    os.utime(stl, (later, later))
+    assert read_cached_stl(stl).extents == pytest.approx([5, 5, 5])
@@ -0,0 +1,74 @@
+import json
+import zipfile
+
+import pytest
+
+from pipeline.orders import configurations, part_path, plan, read_orders, render_job, write_bundle
+
+ORDERS = """order,quantity,variation,with_hdd,ventilation,wall_thickness
+A-1,1,normal,false,,
+A-2,2,server,,,
+A-3,1,normal,no,,3.0
+A-4,1,,,true,3.5
+"""
+
+
+def _orders(tmp_path, text=ORDERS):
+    path = tmp_path / "orders.csv"
+    path.write_text(text)
+    return read_orders(path)
+
+
+def test_rows_map_to_flags_and_overrides(tmp_path):
+    orders = _orders(tmp_path)
+    base, back, top = orders[3].jobs
+    assert base.params == (("ventilation", "true"),) and back.params == top.params == ()
+    assert base.overrides == back.overrides == (("wall_thickness", "3.5"),)
+    assert orders[1].quantity == 2 and orders[1].config == {"variation": "server"}
+    assert orders[3].jobs[0].shape().dim.wall_thickness == 3.5
+
+
+def test_identical_parts_are_planned_once(tmp_path):
+    orders = _orders(tmp_path)
+    unique = plan(orders)
+    # A-1 and A-3 spell the same configuration differently
+    assert list(configurations(orders).values()) == [["A-1", "A-3"], ["A-2"], ["A-4"]]
+    # The base panel does not depend on the variation, so A-2 shares A-1's
+    assert orders[1].keys[0] == orders[0].keys[0]
+    assert len(unique) == 3 + 2 + 3
+
+
+@pytest.mark.parametrize("text, match", [
+    ("id,variation\nA-1,normal\n", "'order' column"),
+    ("order\nA-1\nA-1\n", "duplicate order 'A-1'"),
+    ("order,quantity\nA-1,0\n", "positive integer"),
+    ("order,no_such_field\nA-1,2\n", "line 2.*no field 'no_such_field'"),
+    ("order,variation\nA-1,tower\n", "line 2"),
+    ("order\n../A-1\n", r"csv:2: order id .* may only use"),
+    ("order\nA 1\n", r"csv:2: order id .* may only use"),
+    ("order\n.A-1\n", r"csv:2: order id .* start with"),
+    ("order\nA:1\n", r"csv:2: order id .* may only use"),
+])
+def test_bad_orders_name_the_line(tmp_path, text, match):
+    with pytest.raises(ValueError, match=match):
+        plan(_orders(tmp_path, text))
+
+
+def test_bundle_holds_the_order_parts(tmp_path):
+    orders = _orders(tmp_path, "order,variation\nB-7,server\n")
+    unique = plan(orders)
+    parts = tmp_path / "parts"
+    for key, job in unique.items():
+        assert render_job(job, part_path(parts, key))[1]
+
+    path = write_bundle(orders[0], parts, tmp_path / "out")
+    with zipfile.ZipFile(path) as z:
+        assert z.namelist() == ["B-7/order.json", "B-7/pico_back_panel.stl",
+                                "B-7/pico_base_panel.stl", "B-7/pico_top_shell.stl"]
+        manifest = json.loads(z.read("B-7/order.json"))
+        top = part_path(parts, manifest["parts"]["pico_top_shell"]["key"])
+        assert z.read("B-7/pico_top_shell.stl") == top.read_bytes()
+    assert manifest["config"] == {"variation": "server"} and manifest["quantity"] == 1
+    assert all(part["validation"]["ok"] for part in manifest["parts"].values())
+    first = path.read_bytes()
+    assert write_bundle(orders[0], parts, tmp_path / "out").read_bytes() == first
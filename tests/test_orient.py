@@ -0,0 +1,55 @@
+import manifold3d as m3d
+import numpy as np
+import pytest
+
+from mesh.core import Mesh
+from mesh.orient import (
+    best_orientation, rotation_to, score_orientations, sphere_directions,
+)
+
+
+def _cup(size=40.0, wall=2.0) -> Mesh:
+    """Open box modelled upside down: floor at +Z, open at -Z."""
+    outer = m3d.Manifold.cube([size] * 3, center=True)
+    inner = m3d.Manifold.cube([size - 2 * wall] * 3, center=True).translate([0, 0, -wall])
+    return Mesh.from_manifold(outer - inner)
+
+
+def test_rotation_to_maps_direction():
+    for a in ([0, 0, -1], [0, 0, 1], [1, 2, 3], [-1, 0, 0]):
+        a = np.asarray(a, dtype=float) / np.linalg.norm(a)
+        m = rotation_to(a, np.array([0.0, 0.0, -1.0]))
+        assert m[:3, :3] @ a == pytest.approx([0, 0, -1], abs=1e-9)
+        assert np.linalg.det(m[:3, :3]) == pytest.approx(1.0)
+
+
+def test_scores_are_vectorized_per_candidate():
+    plate = Mesh.box([100, 60, 2])
+    down = np.array([[0, 0, -1.0], [0, 0, 1.0], [1.0, 0, 0]])
+    support, contact, height, score = score_orientations(plate, down)
+    assert contact == pytest.approx([6000, 6000, 120])
+    assert height == pytest.approx([2, 2, 100])
+    assert support == pytest.approx([0, 0, 0])
+    assert score[0] == score[1] < score[2]
+    assert len(score_orientations(plate, sphere_directions(50))[0]) == 51
+
+
+def test_cup_is_flipped_onto_its_floor():
+    cup = _cup()
+    # As modelled the floor is at the top: its underside overhangs the bed
+    support, *_ = score_orientations(cup, np.array([[0, 0, -1.0]]))
+    assert support[0] == pytest.approx(36 * 36)
+
+    best = best_orientation(cup)
+    assert best.down == pytest.approx((0, 0, 1))
+    assert best.support_area == pytest.approx(0)
+    assert best.contact_area == pytest.approx(40 * 40)
+
+    placed = cup.transformed(best.transform(cup))
+    assert placed.bounds[0][2] == pytest.approx(0)
+
+
+def test_flat_plate_keeps_modelled_orientation():
+    best = best_orientation(Mesh.box([100, 60, 2]))
+    assert best.down == (0.0, 0.0, -1.0)
+    assert best.transform(Mesh.box([100, 60, 2]))[:3, :3] == pytest.approx(np.eye(3))
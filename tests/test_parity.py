@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from mesh.compare import compare, point_triangle_distance
+from mesh.core import Mesh, translation
+from mesh.io import write_stl
+from pipeline.cache import cache_key, source_digest
+from pipeline.parity import (
+    LEGACY_PARTS, LEGACY_ROOT, LegacyModule, Tolerances, check_parity, legacy_mesh, legacy_scad,
+)
+import registry
+
+
+def _seed_legacy_cache(cache_dir, module, mesh):
+    """Store a legacy render where legacy_mesh() will find it (no OpenSCAD needed)."""
+    key = cache_key(scad=legacy_scad(module), legacy=source_digest(LEGACY_ROOT, "*.scad"))
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    write_stl(cache_dir / f"{key}.stl", mesh)
+
+
+def test_legacy_parts_exist():
+    parts = registry.load_all_parts()
+    for name, module in LEGACY_PARTS.items():
+        assert name in parts
+        assert (LEGACY_ROOT / module.file).exists()
+
+
+def test_legacy_scad_uses_module_file():
+    source = legacy_scad(LegacyModule("components/ram.scad", "ram_stick();"), "final")
+    assert source.splitlines()[0] == "$fn = 128;"
+    assert source.splitlines()[1].startswith("use <") and "ram.scad>" in source
+    assert source.splitlines()[2] == "ram_stick();"
+
+
+def test_compare_ignores_origin_but_reports_offset():
+    a = Mesh.box([10, 20, 30])
+    b = Mesh.box([10, 20, 30]).transformed(translation([5, 10, 15]))
+    result = compare(a, b, samples=5000)
+    assert result.volume_error == pytest.approx(0)
+    assert result.extents_error == pytest.approx(0)
+    assert result.offset == pytest.approx((5, 10, 15))
+    assert result.hausdorff <= result.resolution
+
+
+def test_compare_detects_shape_change():
+    result = compare(Mesh.box([10, 10, 10]), Mesh.box([10, 10, 12]), samples=5000)
+    assert result.extents_error == pytest.approx(2)
+    assert result.hausdorff == pytest.approx(1, abs=result.resolution)
+    assert result.volume_error == pytest.approx(0.2)
+
+
+def test_cached_legacy_render_is_reused(tmp_path):
+    module = LEGACY_PARTS["ram_stick"]
+    legacy = Mesh.box([133.35, 1.2, 31.25], [66.675, 0.6, 15.625])  # corner origin
+    _seed_legacy_cache(tmp_path, module, legacy)
+    assert legacy_mesh(module, tmp_path).extents == pytest.approx([133.35, 1.2, 31.25])
+
+
+def test_check_parity_table(tmp_path):
+    _seed_legacy_cache(tmp_path, LEGACY_PARTS["ram_stick"],
+                       Mesh.box([133.35, 1.2, 31.25], [66.675, 0.6, 15.625]))
+    _seed_legacy_cache(tmp_path, LEGACY_PARTS["ssd_2_5"], Mesh.box([70, 100, 7]))
+
+    results = {r.name: r for r in check_parity(["ram_stick", "ssd_2_5"], tmp_path, jobs=1, samples=5000)}
+    assert results["ram_stick"].matches()
+    assert results["ram_stick"].comparison.offset == pytest.approx((-66.675, -0.6, -15.625))
+    assert not results["ssd_2_5"].matches(Tolerances())
+    assert results["ssd_2_5"].to_dict()["match"] is False
+
+
+def test_point_triangle_distance_regions():
+    tri = np.array([[0, 0, 0], [4, 0, 0], [0, 4, 0]], dtype=float)
+    points = np.array([
+        [1, 1, 3],     # above the face
+        [-3, -4, 0],   # beyond vertex a
+        [2, -2, 0],    # beyond edge ab
+        [3, 3, 0],     # beyond edge bc
+    ], dtype=float)
+    a, b, c = (np.repeat(tri[i][None], len(points), axis=0) for i in range(3))
+    assert point_triangle_distance(points, a, b, c) == pytest.approx([3, 5, 2, np.sqrt(2)])
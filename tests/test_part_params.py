@@ -0,0 +1,77 @@
+import pytest
+
+import registry
+from pipeline.render import scad_source
+from pipeline.server import RenderRequest
+
+
+@pytest.fixture(scope="module", autouse=True)
+def parts():
+    return registry.load_all_parts()
+
+
+def test_resolve_params_fills_defaults_and_coerces():
+    resolved = registry.resolve_params("pico_base_panel", {"ventilation": "true"})
+    assert resolved == {"with_hdd": False, "ventilation": True, "center_cutout": False}
+
+
+def test_resolve_params_rejects_bad_values():
+    with pytest.raises(ValueError):
+        registry.resolve_params("pico_top_shell", {"variation": "tower"})
+    with pytest.raises(ValueError):
+        registry.resolve_params("pico_assembly", {"explode": 500})
+    with pytest.raises(ValueError):
+        registry.resolve_params("pico_top_shell", {"no_such_param": 1})
+
+
+@pytest.mark.parametrize("value", ["nan", float("nan"), "inf", "-inf", float("inf")])
+def test_float_params_must_be_finite(value):
+    with pytest.raises(ValueError, match="finite"):
+        registry.FloatParam(1.0).parse(value)
+    with pytest.raises(ValueError, match="finite"):
+        registry.FloatParam(1.0, min=0.0, max=10.0).parse(value)
+
+
+def test_int_params_parse_exactly():
+    big = 2**53 + 1
+    assert registry.IntParam(0).parse(str(big)) == big
+    assert registry.IntParam(0).parse(4.0) == 4
+    for bad in ("4.5", 4.5, "nan", float("inf"), None):
+        with pytest.raises(ValueError, match="whole number"):
+            registry.IntParam(0).parse(bad)
+
+
+def test_zero_argument_parts_have_no_schema():
+    assert registry.get_params("ram_stick") == {}
+    assert registry.resolve_params("ram_stick", None) == {}
+
+
+def test_variant_name_omits_defaults():
+    assert registry.variant_name("pico_top_shell", {}) == "pico_top_shell"
+    assert registry.variant_name("pico_top_shell", {"with_hdd": False}) == "pico_top_shell"
+    assert (
+        registry.variant_name("pico_base_panel", {"ventilation": True, "center_cutout": True})
+        == "pico_base_panel__center_cutout-true__ventilation-true"
+    )
+
+
+def test_gallery_presets_match_parameterized_factory(parts):
+    preset_factory, _ = parts["pico_top_shell_hdd"]
+    preset = scad_source(preset_factory())
+    direct = scad_source(registry.materialize("pico_top_shell", {"with_hdd": True}))
+    assert preset == direct
+
+
+def test_ventilation_param_adds_vent_holes():
+    plain = scad_source(registry.materialize("pico_base_panel", {}))
+    vented = scad_source(registry.materialize("pico_base_panel", {"ventilation": True}))
+    assert "vent_0_0" not in plain
+    assert "vent_0_0" in vented
+
+
+def test_render_requests_with_default_params_share_a_key():
+    implicit = RenderRequest.create("pico_top_shell")
+    explicit = RenderRequest.create("pico_top_shell", params={"with_hdd": "false"})
+    other = RenderRequest.create("pico_top_shell", params={"with_hdd": "true"})
+    assert implicit.key("src") == explicit.key("src")
+    assert implicit.key("src") != other.key("src")
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from mesh.core import Mesh, rotation_z
+from mesh.io import read_stl, write_stl
+from mesh.packing import Footprint, convex_hull, min_area_rect, pack
+
+
+def test_box_mesh_is_closed_and_outward():
+    box = Mesh.box([10, 20, 30])
+    tris = box.triangles
+    normals = np.cross(tris[:, 1] - tris[:, 0], tris[:, 2] - tris[:, 0])
+    # Signed volume via divergence theorem: positive for outward winding
+    volume = np.einsum("ij,ij->i", tris[:, 0], normals).sum() / 6
+    assert np.isclose(volume, 6000.0)
+
+
+def test_stl_round_trip(tmp_path):
+    box = Mesh.box([10, 20, 30], centre=[1, 2, 3])
+    path = tmp_path / "box.stl"
+    write_stl(path, box)
+    loaded = read_stl(path)
+    assert len(loaded.faces) == 12
+    assert np.allclose(loaded.bounds, box.bounds)
+
+
+def test_ascii_stl_is_parsed(tmp_path):
+    path = tmp_path / "tri.stl"
+    path.write_text(
+        "solid OpenSCAD_Model\n"
+        "  facet normal 0 0 1\n    outer loop\n"
+        "      vertex 0 0 0\n      vertex 1 0 0\n      vertex 0 1 0\n"
+        "    endloop\n  endfacet\n"
+        "endsolid OpenSCAD_Model\n"
+    )
+    mesh = read_stl(path)
+    assert mesh.faces.shape == (1, 3)
+    assert np.allclose(mesh.bounds, [[0, 0, 0], [1, 1, 0]])
+
+
+def test_convex_hull_of_square_with_interior_points():
+    pts = np.array([[0, 0], [1, 0], [1, 1], [0, 1], [0.5, 0.5], [0.2, 0.7]])
+    hull = convex_hull(pts)
+    assert len(hull) == 4
+
+
+def test_min_area_rect_recovers_rotated_rectangle():
+    box = Mesh.box([40, 10, 5]).transformed(rotation_z(30))
+    angle, width, height = min_area_rect(convex_hull(box.vertices))
+    assert np.isclose(width, 40.0)
+    assert np.isclose(height, 10.0)
+    aligned = box.transformed(rotation_z(angle))
+    assert np.allclose(aligned.extents[:2], [40, 10])
+
+
+def _overlaps(a, b):
+    (a0, a1), (b0, b1) = a, b
+    return np.all(a0[:2] < b1[:2] - 1e-6) and np.all(b0[:2] < a1[:2] - 1e-6)
+
+
+def test_pack_places_parts_without_overlap_inside_bed():
+    footprints = [
+        Footprint.from_mesh("panel", Mesh.box([120, 80, 3])),
+        Footprint.from_mesh("rail", Mesh.box([60, 15, 5]).transformed(rotation_z(45))),
+        Footprint.from_mesh("boss", Mesh.box([10, 10, 10])),
+    ]
+    plates = pack(footprints, copies=3, bed=(200, 200), spacing=2, margin=3)
+
+    placed = [p for plate in plates for p in plate.placements]
+    assert len(placed) == 9
+
+    for plate in plates:
+        bounds = [p.placed_mesh().bounds for p in plate.placements]
+        for b in bounds:
+            assert np.all(b[0][:2] >= 3 - 1e-6)
+            assert np.all(b[1][:2] <= 197 + 1e-6)
+            assert np.isclose(b[0][2], 0.0)
+        for i in range(len(bounds)):
+            for j in range(i + 1, len(bounds)):
+                assert not _overlaps(bounds[i], bounds[j])
+
+
+def test_pack_rejects_parts_larger_than_bed():
+    fp = Footprint.from_mesh("huge", Mesh.box([300, 300, 3]))
+    with pytest.raises(ValueError):
+        pack([fp], copies=1, bed=(256, 256))
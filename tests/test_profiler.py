@@ -0,0 +1,84 @@
+import json
+import time
+import xml.etree.ElementTree as ET
+
+from components.drive_bay import DriveBayCell
+from pipeline.profiler import Sampler, flame_svg, parse_openscad_stats, profile_part
+
+OPENSCAD_2021 = """\
+Parsing design (AST generation)...
+Compiling design (CSG Tree generation)...
+Rendering Polygon Mesh using CGAL...
+CGAL Cache insert: difference(){cube(size=[10,10,10]...
+CGAL Cache hit: multmatrix([[1,0,0,0],[0,1,0,0]...
+CGAL Cache insert: union(){multmatrix(...
+Geometries in cache: 12
+Geometry cache size in bytes: 46416
+CGAL Polyhedrons in cache: 3
+CGAL cache size in bytes: 2871360
+Total rendering time: 0:00:07.251
+"""
+
+
+def _busy_construction(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def _slow_factory():
+    _busy_construction(0.15)
+    return DriveBayCell(with_drive=False)
+
+
+def test_parse_openscad_stats():
+    stats = parse_openscad_stats(OPENSCAD_2021)
+    assert stats == {
+        "total_rendering_s": 7.251,
+        "cgal_polyhedrons_in_cache": 3,
+        "cgal_cache_bytes": 2871360,
+        "geometries_in_cache": 12,
+        "geometry_cache_bytes": 46416,
+        "cgal_cache_hits": 1,
+        "cgal_cache_inserts": 2,
+    }
+    old = parse_openscad_stats("Total rendering time: 0 hours, 2 minutes, 5 seconds\n")
+    assert old == {"total_rendering_s": 125}
+    assert parse_openscad_stats("") == {}
+
+
+def test_sampler_sees_the_busy_function():
+    sampler = Sampler(interval=0.001)
+    sampler.run("factory", _busy_construction, 0.1)
+    stacks = sampler.samples["factory"]
+    assert sum(stacks.values()) > 5
+    assert all(stack[0].startswith("_busy_construction (") for stack in stacks)
+    assert sampler.wall["factory"] >= 0.1
+
+
+def test_profile_part_reports(tmp_path):
+    result = profile_part("slow_cell", _slow_factory, tmp_path, "draft")
+    assert result.error is None
+    assert set(result.stages) == {"factory", "render", "manifold"}
+    function, own, total = result.hotspots(1)[0]
+    assert function.startswith("_busy_construction (") and own > 0.1
+    assert result.python_s >= result.stages["factory"] > 0.15
+
+    folded = (tmp_path / "slow_cell.folded").read_text().splitlines()
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in folded)
+    assert {line.rsplit(" ", 1)[0].split(";")[0] for line in folded} <= {"factory", "render", "manifold"}
+    report = json.loads((tmp_path / "slow_cell.json").read_text())
+    assert report["hotspots"][0]["function"] == function
+    ET.parse(tmp_path / "slow_cell.svg")
+
+
+def test_flame_svg_nests_children_over_parents():
+    svg = flame_svg({("factory", "build (a.py:1)"): 300, ("factory",): 100, ("openscad",): 600},
+                    "part <&>")
+    root = ET.fromstring(svg)
+    ns = "{http://www.w3.org/2000/svg}"
+    rects = {g.find(f"{ns}title").text.split(" (")[0]: g.find(f"{ns}rect") for g in root.iter(f"{ns}g")}
+    factory, build, openscad = rects["factory"], rects["build"], rects["openscad"]
+    assert float(openscad.get("width")) == 1.5 * float(factory.get("width"))
+    assert float(build.get("width")) == 0.75 * float(factory.get("width"))
+    assert float(build.get("y")) < float(factory.get("y"))
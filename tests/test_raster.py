@@ -0,0 +1,66 @@
+import anchorscad as ad
+import numpy as np
+import pytest
+
+import cadeng
+from mesh.core import Mesh
+from mesh.parts import render_coloured
+from mesh.raster import COLOUR_SCHEMES, parse_camera, rasterize, view_matrix
+
+
+def test_parse_camera():
+    assert parse_camera("0,0,0,55,0,25,200") == pytest.approx([55, 0, 25])
+    with pytest.raises(ValueError):
+        parse_camera("55,0,25")
+
+
+def test_view_matrix_rotates_z_first():
+    # rotate=[90,0,90]: +X first turns to +Y, then +Y tilts up to +Z (screen up)
+    assert view_matrix([90, 0, 90]) @ [1, 0, 0] == pytest.approx([0, 0, 1])
+
+
+def test_box_fills_framed_area():
+    scheme = COLOUR_SCHEMES["Cornfield"]
+    image = rasterize(Mesh.box([10, 20, 30]), [0, 0, 0], (100, 100), scheme=scheme)
+    assert image.shape == (100, 100, 3)
+    covered = np.any(image != scheme.background, axis=2)
+    rows, cols = np.nonzero(covered)
+    # Viewed from -Y: X across, Z up, scaled so Z fills 90% of the height
+    assert rows.max() - rows.min() + 1 == pytest.approx(90, abs=1)
+    assert cols.max() - cols.min() + 1 == pytest.approx(30, abs=1)
+    assert tuple(image[0, 0]) == scheme.background
+
+
+def test_face_colours_are_used():
+    mesh = Mesh.box([10, 10, 10])
+    red = np.tile([1.0, 0.0, 0.0], (len(mesh.faces), 1))
+    image = rasterize(mesh, [0, 0, 0], (64, 64), face_colours=red)
+    centre = image[32, 32]
+    assert centre[0] > 0 and centre[1] == 0 and centre[2] == 0
+
+
+def test_empty_mesh_is_background():
+    empty = Mesh(np.zeros((0, 3)), np.zeros((0, 3), dtype=np.int64))
+    image = rasterize(empty, [55, 0, 25], (8, 4))
+    assert (image == COLOUR_SCHEMES["Tomorrow Night"].background).all()
+
+
+def test_render_coloured_face_colours():
+    shape = ad.Box([10, 10, 10])
+    maker = shape.solid("box").colour("red").at("centre")
+    mesh, colours = render_coloured(maker)
+    assert colours.shape == (len(mesh.faces), 3)
+    assert colours == pytest.approx(np.tile([1, 0, 0], (len(mesh.faces), 1)))
+
+
+def test_gallery_views_resolve_camera_sets():
+    config = {
+        "cameras": {"iso": "0,0,0,55,0,25,200", "top": "0,0,0,0,0,0,200"},
+        "camera_sets": {"quick": ["iso"], "full": ["iso", "top"], "default": "full"},
+        "models": [
+            {"name": "a"},
+            {"name": "b", "angles": "quick", "variants": [{"name": "x", "angles": ["top"]}]},
+        ],
+    }
+    assert cadeng.camera_set(None, config) == ["iso", "top"]
+    assert cadeng.gallery_views(config) == {"a": ["iso", "top"], "b": ["iso"], "b_x": ["top"]}
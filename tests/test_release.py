@@ -0,0 +1,180 @@
+import json
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from mesh.io import read_stl
+from pipeline import release as rel
+
+RELEASE = {"tag": "v1.2.0", "commit": "0" * 40, "quality": "draft", "emboss_version": "v2025-01-01"}
+
+
+class FakeRunners(dict):
+    """Runners that describe their task in `<id>.txt`; `broken` task ids raise."""
+
+    def __init__(self, broken=()):
+        self.broken = set(broken)
+        self.calls = []
+        super().__init__({kind: self.run for kind in ("scad", "stl", "scaled", "screenshots", "package")})
+
+    def run(self, task, staging, release, inputs):
+        self.calls.append(task.id)
+        if task.id in self.broken:
+            raise RuntimeError("openscad timeout")
+        rel_path = f"{task.id.replace(':', '/')}.txt"
+        text = f"{task.id} {len(inputs)} {task.args.get('scales', '')}"
+        rel.write_atomic(staging / rel_path, text.encode())
+        return [rel_path]
+
+
+def _tasks():
+    return rel.plan(["base", "shell"], [100, 50], {"pico": {"front": "0,0,0,55,0,25,500"}},
+                    [(64, 48)], upload=False)
+
+
+def _run(checkpoint, runners, tasks=None):
+    with ThreadPoolExecutor(2) as ex:
+        return rel.run_dag(tasks or _tasks(), checkpoint, checkpoint.path.parent / "staging",
+                           runners, executor=ex, progress=lambda msg: None)
+
+
+@pytest.fixture
+def checkpoint(tmp_path):
+    return rel.Checkpoint(tmp_path / ".v1.2.0.partial" / "state.json", RELEASE)
+
+
+def test_plan_orders_stages():
+    tasks = rel.plan(["base"], [100, 50, 25], {"pico": {"front": "x"}}, [(64, 48)])
+    by_id = {t.id: t for t in tasks}
+    assert by_id["stl:base"].deps == ("scad:base",)
+    assert by_id["scaled:base"].args["scales"] == [50, 25]
+    assert set(by_id["package"].deps) == {"stl:base", "scaled:base", "screenshots:pico"}
+    assert by_id["publish"].deps == ("upload", "github")
+    order = [t.id for t in rel.topological_order(list(reversed(tasks)))]
+    assert order.index("scad:base") < order.index("stl:base") < order.index("package") < order.index("publish")
+    with pytest.raises(ValueError, match="cycle"):
+        rel.topological_order([rel.Task("a", "x", ("b",)), rel.Task("b", "x", ("a",))])
+
+
+def test_failed_task_resumes_from_checkpoint(checkpoint):
+    first = _run(checkpoint, FakeRunners(broken={"stl:shell"}))
+    assert first.failed == {"stl:shell": "openscad timeout"}
+    assert set(first.blocked) == {"scaled:shell", "package"}
+    assert "scaled:base" in first.ran and "screenshots:pico" in first.ran
+
+    # A new process picks the state up from disk and only runs what is left
+    runners = FakeRunners()
+    second = _run(rel.Checkpoint(checkpoint.path), runners)
+    assert second.ok
+    assert sorted(runners.calls) == ["package", "scaled:shell", "stl:shell"]
+    assert len(second.resumed) == len(_tasks()) - 3
+    assert not rel.Checkpoint(checkpoint.path).tasks["stl:shell"].get("error")
+
+
+def test_changed_inputs_or_outputs_rerun(checkpoint):
+    _run(checkpoint, FakeRunners())
+
+    # A damaged output reruns its task; identical output leaves dependents checkpointed
+    (checkpoint.path.parent / "staging/stl/base.txt").write_text("torn")
+    runners = FakeRunners()
+    _run(checkpoint, runners)
+    assert runners.calls == ["stl:base"]
+
+    # Different arguments change the key of the task and of everything downstream
+    tasks = _tasks()
+    next(t for t in tasks if t.id == "scaled:base").args["scales"] = [25]
+    runners = FakeRunners()
+    _run(checkpoint, runners, tasks)
+    assert sorted(runners.calls) == ["package", "scaled:base"]
+
+
+def test_source_changes_rerun_everything(checkpoint, monkeypatch):
+    _run(checkpoint, FakeRunners())
+    monkeypatch.setattr(rel, "source_digest", lambda: "edited")
+    runners = FakeRunners()
+    result = _run(checkpoint, runners)
+    assert not result.resumed and len(runners.calls) == len(_tasks())
+
+
+def test_resume_checks_the_tree(checkpoint, monkeypatch):
+    checkpoint.release["bump"] = "minor"
+    checkpoint.save()
+    git = {("rev-parse", "HEAD"): RELEASE["commit"], ("rev-parse", "--abbrev-ref", "HEAD"): "main",
+           ("status", "--porcelain", "--untracked-files=no"): " M src/config.py"}
+    monkeypatch.setattr(rel, "_git", lambda *args: git[args])
+    with pytest.raises(ValueError, match="uncommitted"):
+        rel.begin("minor", checkpoint.path.parent.parent, {})
+    git[("status", "--porcelain", "--untracked-files=no")] = ""
+    assert rel.begin("minor", checkpoint.path.parent.parent, {}).release["tag"] == "v1.2.0"
+
+
+def test_resume_refuses_other_settings(checkpoint, monkeypatch):
+    checkpoint.release["bump"] = "minor"
+    checkpoint.save()
+    git = {("rev-parse", "HEAD"): RELEASE["commit"], ("tag", "--list", "v*"): "v1.1.0"}
+    monkeypatch.setattr(rel, "_git", lambda *args: git[args])
+    root = checkpoint.path.parent.parent
+    with pytest.raises(ValueError, match="started with quality draft, not final"):
+        rel.begin("minor", root, {"quality": "final", "emboss_version": None}, check_git=False)
+    with pytest.raises(ValueError, match="emboss_version v2025-01-01, not v2026-01-01"):
+        rel.begin("minor", root, {"emboss_version": "v2026-01-01"}, check_git=False)
+    resumed = rel.begin("minor", root, {"quality": "draft", "emboss_version": None}, check_git=False)
+    assert resumed.release["emboss_version"] == "v2025-01-01"
+
+    # A new release takes unset settings from the defaults
+    fresh = rel.begin("minor", root, {"quality": None, "emboss_version": None}, restart=True,
+                      check_git=False, defaults={"quality": "standard", "emboss_version": "v2026-01-01"})
+    assert fresh.release["quality"] == "standard" and fresh.release["emboss_version"] == "v2026-01-01"
+
+
+def test_finish_publishes_in_one_rename(checkpoint):
+    assert _run(checkpoint, FakeRunners()).ok
+    final = rel.finish(checkpoint)
+    assert final == checkpoint.path.parent.parent / "v1.2.0"
+    assert (final / "stl/base.txt").read_text().startswith("stl:base 1")
+    assert json.loads((final / "release-state.json").read_text())["release"]["tag"] == "v1.2.0"
+    assert not checkpoint.path.parent.exists()
+
+
+def test_next_version():
+    tags = ["v0.9.3", "v1.2.0", "v1.10.1", "v2025-10-01", "nightly"]
+    assert rel.next_version("patch", tags) == "v1.10.2"
+    assert rel.next_version("minor", tags) == "v1.11.0"
+    assert rel.next_version("major", tags) == "v2.0.0"
+    assert rel.next_version("minor", []) == "v0.1.0"
+
+
+def test_real_runners_stage_scaled_stls_and_package(checkpoint):
+    tasks = rel.plan(["standoff"], [100, 50], {}, [], upload=False)
+    result = _run(checkpoint, rel.RUNNERS, tasks)
+    assert result.ok, result.failed
+    staging = checkpoint.path.parent / "staging"
+    full = read_stl(staging / "stl/standoff.stl")
+    half = read_stl(staging / "stl/scaled/standoff_50pct.stl")
+    assert half.extents == pytest.approx(full.extents * 0.5)
+
+    manifest = json.loads((staging / "dist/manifest.json").read_text())
+    assert set(manifest["files"]) >= {"stl/standoff.stl", "dist/keystone-v1.2.0-stl.zip"}
+    assert manifest["validation"]["standoff"]["ok"] and manifest["invalid"] == []
+    archive = staging / "dist/keystone-v1.2.0-stl.zip"
+    with zipfile.ZipFile(archive) as z:
+        assert z.namelist() == ["stl/scaled/standoff_50pct.stl", "stl/standoff.stl"]
+    # Re-packaging the same files gives a byte-identical archive
+    digest = rel.file_digest(archive)
+    archive.unlink()
+    _run(checkpoint, rel.RUNNERS, tasks)
+    assert rel.file_digest(archive) == digest
+
+
+def test_invalid_mesh_fails_packaging(tmp_path):
+    (tmp_path / "stl").mkdir()
+    (tmp_path / "stl/base.stl").write_bytes(b"solid")
+    rel.write_atomic(tmp_path / "validation/base.json",
+                     json.dumps({"ok": False, "problems": ["2 shells, expected 1"]}).encode())
+    with pytest.raises(RuntimeError, match="invalid meshes: base"):
+        rel.run_package(rel.Task("package", "package"), tmp_path, RELEASE,
+                        ["stl/base.stl", "validation/base.json"])
+    manifest = json.loads((tmp_path / "dist/manifest.json").read_text())
+    assert manifest["invalid"] == ["base"]
+    assert not (tmp_path / "dist/release-notes.md").exists()
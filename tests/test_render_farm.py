@@ -0,0 +1,280 @@
+import io
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from mesh.core import Mesh
+from mesh.io import read_stl, write_stl
+from pipeline.farm import Coordinator, FarmJob, recv_message, run_worker, send_message
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _stl(size) -> bytes:
+    buf = io.BytesIO()
+    write_stl(buf, Mesh.box(size))
+    return buf.getvalue()
+
+
+def _fake_render(header, scad):
+    return _stl([float(scad.decode().split()[1])] * 3)
+
+
+def _jobs():
+    return [
+        FarmJob("a", "cube 1"),
+        FarmJob("b", "cube 2"),
+        FarmJob("b_copy", "cube 2"),   # same SCAD as b
+        FarmJob("c", "cube 3"),
+    ]
+
+
+def _workers(coordinator, count, render=_fake_render, heartbeat=0.05):
+    address = coordinator.address or coordinator.serve()
+    threads = [
+        threading.Thread(target=run_worker, args=(*address, f"w{i}", render, heartbeat),
+                         kwargs={"token": coordinator.token}, daemon=True)
+        for i in range(count)
+    ]
+    for t in threads:
+        t.start()
+    return threads
+
+
+def test_farm_renders_each_scad_once(tmp_path):
+    coordinator = Coordinator(_jobs(), tmp_path / "out", tmp_path / "cache")
+    threads = _workers(coordinator, 2)
+    results = coordinator.wait(timeout=10)
+    for t in threads:
+        t.join(5)
+    coordinator.close()
+
+    assert all(r.ok for r in results.values()) and len(results) == 4
+    assert coordinator.stats["dispatched"] == 3
+    assert read_stl(tmp_path / "out" / "b_copy.stl").extents == pytest.approx([2, 2, 2])
+    assert (tmp_path / "out" / "c.mesh").is_dir()
+    assert {r.worker for r in results.values()} <= {"w0", "w1"}
+    assert not any(t.is_alive() for t in threads)   # workers were told "done"
+
+
+def test_cached_results_are_not_dispatched(tmp_path):
+    first = Coordinator(_jobs(), tmp_path / "out", tmp_path / "cache")
+    _workers(first, 1)
+    first.wait(timeout=10)
+    first.close()
+
+    again = Coordinator(_jobs() + [FarmJob("d", "cube 4")], tmp_path / "out", tmp_path / "cache")
+    assert again.stats["cached"] == 4
+    _workers(again, 1)
+    results = again.wait(timeout=10)
+    again.close()
+    assert again.stats["dispatched"] == 1
+    assert results["a"].cached and not results["d"].cached
+
+
+def _connect(coordinator, name, token=None):
+    sock = socket.create_connection(coordinator.address)
+    send_message(sock, {"type": "hello", "worker": name, "token": token or coordinator.token})
+    return sock, recv_message(sock)[0]
+
+
+def _take_job(coordinator, name):
+    sock, reply = _connect(coordinator, name)
+    assert reply["type"] == "welcome"
+    send_message(sock, {"type": "get", "worker": name})
+    header, _ = recv_message(sock)
+    assert header["type"] == "job"
+    return sock, header
+
+
+def test_job_of_disconnected_worker_is_retried(tmp_path):
+    coordinator = Coordinator([FarmJob("a", "cube 1")], tmp_path / "out", tmp_path / "cache")
+    coordinator.serve()
+    sock, _ = _take_job(coordinator, "crasher")
+    sock.close()
+    _workers(coordinator, 1)
+    results = coordinator.wait(timeout=10)
+    coordinator.close()
+    assert results["a"].ok and results["a"].worker == "w0"
+    assert results["a"].attempts == 2
+    assert coordinator.stats["retries"] == 1
+
+
+def test_silent_worker_loses_lease_and_late_result_is_dropped(tmp_path):
+    coordinator = Coordinator([FarmJob("a", "cube 1")], tmp_path / "out", tmp_path / "cache",
+                              lease_timeout=0.3)
+    coordinator.serve()
+    sock, header = _take_job(coordinator, "stuck")
+    time.sleep(0.6)   # no heartbeats
+    _workers(coordinator, 1)
+    results = coordinator.wait(timeout=10)
+    assert results["a"].worker == "w0"
+
+    send_message(sock, {"type": "result", "worker": "stuck", "key": header["key"], "ok": True},
+                 _stl([9, 9, 9]))
+    recv_message(sock)
+    sock.close()
+    coordinator.close()
+    assert coordinator.stats["duplicates"] == 1
+    assert read_stl(tmp_path / "out" / "a.stl").extents == pytest.approx([1, 1, 1])
+
+
+def test_workers_need_the_token_and_a_free_name(tmp_path):
+    coordinator = Coordinator([FarmJob("a", "cube 1")], tmp_path / "out", tmp_path / "cache",
+                              token="s3cret")
+    coordinator.serve()
+    sock, reply = _connect(coordinator, "intruder", token="guess")
+    assert reply == {"type": "rejected", "error": "bad farm token", "size": 0}
+    sock.close()
+    first, reply = _connect(coordinator, "w0")
+    assert reply["type"] == "welcome"
+    second, reply = _connect(coordinator, "w0")
+    assert reply["type"] == "rejected" and "already connected" in reply["error"]
+    for sock in (first, second):
+        sock.close()
+    with pytest.raises(PermissionError):
+        run_worker(*coordinator.address, "w1", _fake_render, token="guess")
+    coordinator.close()
+    assert coordinator.stats["rejected"] == 3 and coordinator.stats["dispatched"] == 0
+
+
+def test_results_only_count_from_lease_holders(tmp_path):
+    coordinator = Coordinator([FarmJob("a", "cube 1")], tmp_path / "out", tmp_path / "cache")
+    coordinator.serve()
+    holder, job = _take_job(coordinator, "holder")
+    other, _ = _connect(coordinator, "other")
+    # Claiming to be the holder does not help: the connection's worker counts
+    send_message(other, {"type": "result", "worker": "holder", "key": job["key"], "ok": True},
+                 _stl([9, 9, 9]))
+    assert recv_message(other)[0]["accepted"] is False
+    send_message(other, {"type": "result", "key": "no-such-job", "ok": True}, _stl([9, 9, 9]))
+    assert recv_message(other)[0]["accepted"] is False
+    assert not coordinator.results and coordinator.cache.get(job["key"]) is None
+
+    send_message(holder, {"type": "result", "key": job["key"], "ok": True}, _stl([1, 1, 1]))
+    assert recv_message(holder)[0]["accepted"] is True
+    results = coordinator.wait(timeout=10)
+    for sock in (holder, other):
+        sock.close()
+    coordinator.close()
+    assert results["a"].worker == "holder" and coordinator.stats["rejected"] == 2
+    # Validation happens on the worker; a result without its report fails
+    assert not results["a"].ok and "no validation report" in results["a"].error
+    assert read_stl(tmp_path / "out" / "a.stl").extents == pytest.approx([1, 1, 1])
+
+
+def test_key_covers_the_renderer(monkeypatch):
+    from pipeline import farm
+
+    job = FarmJob("a", "cube 1")
+    key = job.key
+    monkeypatch.setattr(farm, "renderer", lambda: "openscad 2021.01")
+    assert job.key != key
+
+
+def test_failures_are_retried_then_reported(tmp_path):
+    def broken(header, scad):
+        raise RuntimeError("no geometry")
+
+    coordinator = Coordinator([FarmJob("a", "cube 1")], tmp_path / "out", tmp_path / "cache",
+                              max_attempts=2)
+    _workers(coordinator, 1, render=broken)
+    results = coordinator.wait(timeout=10)
+    coordinator.close()
+    assert not results["a"].ok
+    assert results["a"].attempts == 2
+    assert "no geometry" in results["a"].error
+
+
+def test_results_are_validated(tmp_path):
+    def open_box(header, scad):
+        mesh = Mesh.box([1, 1, 1])
+        buf = io.BytesIO()
+        write_stl(buf, Mesh(mesh.vertices, mesh.faces[:-1]))   # one face missing
+        return buf.getvalue() if scad.decode() == "open" else _fake_render(header, scad)
+
+    jobs = [FarmJob("good", "cube 1"), FarmJob("open", "open"), FarmJob("split", "cube 2", expect_shells=2)]
+    coordinator = Coordinator(jobs, tmp_path / "out", tmp_path / "cache")
+    _workers(coordinator, 1, render=open_box)
+    results = coordinator.wait(timeout=10)
+    coordinator.close()
+
+    assert results["good"].ok and results["good"].validation["ok"]
+    assert not results["open"].ok and "not watertight" in results["open"].error
+    assert not results["split"].ok and "1 shells, expected 2" in results["split"].error
+    assert (tmp_path / "out" / "open.validation.json").exists()
+
+    # Cache hits are validated again
+    again = Coordinator(jobs, tmp_path / "out", tmp_path / "cache")
+    again.close()
+    assert again.stats["cached"] == 3
+    assert not again.results["open"].ok and again.results["good"].ok
+
+
+def test_worker_processes_render_registered_parts(tmp_path):
+    from pipeline.render import scad_source
+    import registry
+
+    parts = registry.load_all_parts()
+    jobs = [
+        FarmJob(name, scad_source(parts[name][0]()), part=name)
+        for name in ("standoff", "ram_stick", "ssd_2_5")
+    ]
+    coordinator = Coordinator(jobs, tmp_path / "out", tmp_path / "cache")
+    host, port = coordinator.serve()
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=run_worker, args=(host, port, f"proc-{i}"),
+                         kwargs={"token": coordinator.token}) for i in range(2)]
+    for p in procs:
+        p.start()
+    results = coordinator.wait(timeout=60)
+    for p in procs:
+        p.join(10)
+    coordinator.close()
+
+    assert all(r.ok for r in results.values()), results
+    assert all(p.exitcode == 0 for p in procs)
+    assert read_stl(tmp_path / "out" / "ram_stick.stl").extents == pytest.approx(
+        [133.35, 1.2, 31.25], abs=0.01)
+
+
+def test_render_cli_farm_end_to_end(tmp_path):
+    """bin/render --farm with a separate bin/render --farm-worker process."""
+    env = {**os.environ, "FARM_TOKEN": "e2e-token"}
+    render = [sys.executable, "-u", str(REPO_ROOT / "bin" / "render")]
+    coordinator = subprocess.Popen(
+        [*render, "--farm", "--port", "0", "--local-workers", "0", "-o", str(tmp_path), "standoff"],
+        cwd=REPO_ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+    )
+    try:
+        for line in coordinator.stdout:
+            if line.startswith("Farm coordinator on "):
+                address = line.split()[3].rstrip(":")
+                break
+        else:
+            pytest.fail("coordinator did not start")
+        worker = subprocess.run([*render, "--farm-worker", address, "-j", "1"], cwd=REPO_ROOT,
+                                env=env, capture_output=True, text=True, timeout=120)
+        output = coordinator.communicate(timeout=120)[0]
+    finally:
+        coordinator.kill()
+    assert worker.returncode == 0, worker.stdout + worker.stderr
+    assert coordinator.returncode == 0, output
+    farm = json.loads((tmp_path / "farm.json").read_text())
+    assert [r["worker"] is not None for r in farm["results"]] == [True]
+    assert json.loads((tmp_path / "manifest.json").read_text())["invalid"] == []
+    assert read_stl(tmp_path / "standoff.stl").faces.size
+
+
+def test_render_cli_rejects_farm_with_mesh_library():
+    result = subprocess.run([sys.executable, str(REPO_ROOT / "bin" / "render"), "--farm", "--mesh-library"],
+                            cwd=REPO_ROOT, capture_output=True, text=True)
+    assert result.returncode == 2 and "--mesh-library cannot be used with --farm" in result.stderr
@@ -0,0 +1,163 @@
+import json
+import threading
+import urllib.request
+
+import anchorscad as ad
+import pytest
+
+from config import PicoDimensions
+from components.frame import Standoff
+from pipeline.cache import DiskLruCache, LruCache
+from pipeline.render import apply_overrides
+from pipeline.server import (
+    INTERACTIVE, PREWARM, RenderRequest, RenderService, UnknownField, UnknownPart, make_server,
+)
+
+
+def _registry(calls, gate=None):
+    def factory():
+        calls.append(1)
+        if gate is not None:
+            gate.wait(5)
+        return ad.Box([10, 10, 10])
+    return {"box": (factory, "component"), "other": (factory, "component")}
+
+
+def test_apply_overrides_coerces_and_recurses():
+    from components.case_pico import PicoTopShell
+    shell = PicoTopShell(dim=PicoDimensions())
+    shell = apply_overrides(shell, {
+        "wall_thickness": "2.5",
+        "mobo.pcb_thickness": 2.0,
+        "shape.with_hdd": "true",
+    })
+    assert shell.dim.wall_thickness == 2.5
+    assert shell.dim.mobo.pcb_thickness == 2.0
+    assert shell.with_hdd is True
+
+
+def test_apply_overrides_rejects_unknown_field():
+    with pytest.raises(KeyError):
+        apply_overrides(Standoff(dim=PicoDimensions()), {"no_such_field": 1})
+
+
+def test_memory_lru_evicts_oldest():
+    cache = LruCache(max_bytes=10)
+    cache.put("a", b"12345")
+    cache.put("b", b"12345")
+    cache.get("a")
+    cache.put("c", b"12345")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"12345"
+
+
+def test_disk_cache_persists_between_services(tmp_path):
+    calls = []
+    service = RenderService(_registry(calls), tmp_path, workers=1)
+    data, status = service.render(RenderRequest.create("box"))
+    service.close()
+    assert status == "miss"
+
+    fresh = RenderService(_registry(calls), tmp_path, workers=1)
+    again, status = fresh.render(RenderRequest.create("box"))
+    fresh.close()
+    assert status == "disk"
+    assert again == data
+    assert len(calls) == 1
+
+
+def test_concurrent_requests_are_coalesced(tmp_path):
+    calls, gate = [], threading.Event()
+    service = RenderService(_registry(calls, gate), tmp_path, workers=2)
+    first, s1 = service.submit(RenderRequest.create("box"))
+    second, s2 = service.submit(RenderRequest.create("box"))
+    gate.set()
+    assert first is second
+    assert (s1, s2) == ("miss", "coalesced")
+    assert first.result(5)
+    service.close()
+    assert len(calls) == 1
+
+
+def test_interactive_requests_run_before_prewarm(tmp_path):
+    order, gate = [], threading.Event()
+
+    def blocker():
+        gate.wait(5)
+        return ad.Box([1, 1, 1])
+
+    def recorder(name):
+        def factory():
+            order.append(name)
+            return ad.Box([1, 1, 1])
+        return factory
+
+    registry = {
+        "blocker": (blocker, "component"),
+        "warm": (recorder("warm"), "component"),
+        "user": (recorder("user"), "component"),
+    }
+    service = RenderService(registry, tmp_path, workers=1)
+    service.submit(RenderRequest.create("blocker"))
+    service.submit(RenderRequest.create("warm"), PREWARM)
+    user, _ = service.submit(RenderRequest.create("user"), INTERACTIVE)
+    gate.set()
+    user.result(5)
+    service.close()
+    assert order == ["user", "warm"]
+
+
+def test_http_round_trip(tmp_path):
+    calls = []
+    service = RenderService(_registry(calls), tmp_path, workers=1)
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urllib.request.urlopen(f"{base}/render/box.scad") as resp:
+            assert resp.headers["X-Cache"] == "miss"
+            assert b"cube" in resp.read()
+        with urllib.request.urlopen(f"{base}/render/box.scad") as resp:
+            assert resp.headers["X-Cache"] == "memory"
+        with urllib.request.urlopen(f"{base}/parts") as resp:
+            assert {p["name"] for p in json.load(resp)} == {"box", "other"}
+        with pytest.raises(urllib.error.HTTPError) as err:
+            urllib.request.urlopen(f"{base}/render/missing.scad")
+        assert err.value.code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
+
+
+def test_overrides_are_parsed_before_keying():
+    registry = {"standoff": (lambda: Standoff(dim=PicoDimensions()), "component")}
+    text = RenderRequest.create("standoff", {"wall_thickness": "2.5"}, registry=registry)
+    number = RenderRequest.create("standoff", {"wall_thickness": 2.5}, registry=registry)
+    assert text == number and text.key("src") == number.key("src")
+    with pytest.raises(UnknownField):
+        RenderRequest.create("standoff", {"no_such_field": 1}, registry=registry)
+    with pytest.raises(UnknownPart):
+        RenderRequest.create("missing", registry=registry)
+
+
+def test_http_errors_inside_a_render_are_500(tmp_path):
+    def broken():
+        return {}["bug"]
+
+    service = RenderService({"broken": (broken, "component")}, tmp_path, workers=1)
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with pytest.raises(urllib.error.HTTPError) as err:
+            urllib.request.urlopen(f"{base}/render/broken.scad")
+        assert err.value.code == 500
+        with pytest.raises(urllib.error.HTTPError) as err:
+            urllib.request.urlopen(f"{base}/render/missing.scad")
+        assert err.value.code == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.close()
@@ -0,0 +1,90 @@
+import pytest
+
+from mesh.compare import diff
+from mesh.core import Mesh, translation
+from mesh.store import MeshCache
+from pipeline import revision
+from pipeline.revision import WORKTREE, PartDiff, diff_part, export_src, parse_revisions, revision_mesh
+
+
+def test_parse_revisions():
+    assert parse_revisions("HEAD~1") == ("HEAD~1", WORKTREE)
+    assert parse_revisions("v1..v2") == ("v1", "v2")
+    assert parse_revisions("v1..") == ("v1", WORKTREE)
+
+
+def test_identical_meshes_do_not_differ():
+    mesh = Mesh.box([100, 2, 50])   # long thin triangles
+    result = diff(mesh, Mesh(mesh.vertices.copy(), mesh.faces.copy()), samples=20_000)
+    assert result.comparison.hausdorff == pytest.approx(0, abs=1e-9)
+    assert not result.changed
+
+
+def test_diff_locates_change():
+    a = Mesh.box([10, 10, 10])
+    b = Mesh.concatenate([a, Mesh.box([2, 2, 4], [0, 0, 7])])   # boss on top
+    result = diff(a, b, samples=20_000)
+    assert result.changed
+    assert result.comparison.hausdorff == pytest.approx(4, abs=result.comparison.resolution)
+    moved = result.added > result.comparison.resolution
+    assert moved.sum() == 4                                  # the boss's top corners
+    assert b.vertices[moved][:, 2] == pytest.approx(9)
+    assert result.removed.max() == pytest.approx(0, abs=1e-9)
+
+
+def test_diff_does_not_align_moved_parts():
+    a = Mesh.box([10, 10, 10])
+    result = diff(a, a.transformed(translation([0, 0, 3])), samples=5000)
+    assert result.comparison.offset == pytest.approx((0, 0, 3))
+    assert result.comparison.hausdorff == pytest.approx(3, abs=result.comparison.resolution)
+
+
+def test_part_diff_report():
+    a = Mesh.box([10, 10, 10])
+    b = Mesh.box([10, 10, 12], [0, 0, 1])
+    result = PartDiff("block", "v1", WORKTREE, diff(a, b, samples=5000))
+    report = result.to_dict()
+    assert report["volume_delta"] == pytest.approx(200)
+    assert report["extents_delta"] == pytest.approx([0, 0, 2])
+    assert report["changed"] is True
+
+
+def test_revision_render_is_cached(tmp_path):
+    mesh = revision_mesh("ram_stick", "HEAD", tmp_path)
+    assert mesh.extents == pytest.approx([133.35, 1.2, 31.25], abs=0.01)
+    [cache] = tmp_path.glob("*.mesh")
+    assert MeshCache(cache).names == ["ram_stick"]
+
+    result = diff_part("ram_stick", "HEAD", "HEAD", tmp_path, tmp_path / "diff")
+    assert result.error is None and not result.diff.changed
+    header = (tmp_path / "diff" / "ram_stick-added.ply").read_bytes().split(b"end_header")[0]
+    assert b"property uchar red" in header
+    assert (tmp_path / "diff" / "ram_stick.json").exists()
+
+
+def test_unknown_revision(tmp_path):
+    with pytest.raises(ValueError):
+        diff_part("ram_stick", "no-such-rev", WORKTREE, tmp_path, tmp_path / "diff")
+
+
+def test_unknown_part_is_reported(tmp_path):
+    result = diff_part("no_such_part", "HEAD", WORKTREE, tmp_path, tmp_path / "diff")
+    assert result.diff is None and "no_such_part" in result.error
+
+
+def test_export_raced_by_another_process(tmp_path, monkeypatch):
+    git = revision._git
+
+    def racing_git(*args):
+        data = git(*args)
+        if args[0] == "archive":
+            # The other process renames its export into place first
+            other = tmp_path / "src" / args[-1] / "src"
+            other.mkdir(parents=True)
+            (other / "registry.py").write_text("")
+        return data
+
+    monkeypatch.setattr(revision, "_git", racing_git)
+    src = export_src("HEAD", tmp_path)
+    assert [p.name for p in src.iterdir()] == ["registry.py"]
+    assert [p.name for p in tmp_path.iterdir()] == ["src"]
@@ -0,0 +1,72 @@
+import dataclasses
+
+import numpy as np
+import pytest
+
+from analysis.snapfit import (
+    LATCH_FIELDS, LatchDesignSpace, LatchRequirements, evaluate, mating_force, optimize,
+)
+from components.case_pico import PicoTopShell
+from config import PicoDimensions
+from mesh.cost import MATERIALS
+
+
+def _single(**values):
+    return {f: np.array([float(values[f])]) for f in LATCH_FIELDS}
+
+
+def test_current_latch_lacks_strain_margin_in_pla():
+    dim = PicoDimensions()
+    result = evaluate(_single(**{f: getattr(dim, f) for f in LATCH_FIELDS}), MATERIALS["PLA"])
+    # 1.5 x 1.5 x (0.9 + 0.3) / 12^2: under PLA's limit, over the 80% utilization
+    assert result["strain"][0] == pytest.approx(0.01875)
+    assert not result["feasible"][0]
+
+
+def test_forces_scale_with_width():
+    base = dict(latch_arm_length=15, latch_arm_thickness=2, latch_arm_width=5,
+                latch_hook_depth=1, latch_hook_height=3)
+    narrow = evaluate(_single(**base), MATERIALS["PETG"])
+    wide = evaluate(_single(**{**base, "latch_arm_width": 10}), MATERIALS["PETG"])
+    assert wide["insertion_force"][0] == pytest.approx(2 * narrow["insertion_force"][0])
+    assert wide["strain"][0] == pytest.approx(narrow["strain"][0])
+
+
+def test_steep_return_face_self_locks():
+    assert np.isinf(mating_force(np.ones(2), 0.5, 80.0)).all()
+
+
+def test_optimize_meets_requirements_and_emits_overrides():
+    req = LatchRequirements()
+    for material in MATERIALS.values():
+        designs = optimize(material, req=req, top=3)
+        assert designs
+        sizes = [d.size for d in designs]
+        assert sizes == sorted(sizes)
+        best = designs[0]
+        assert best.strain_utilization <= req.max_utilization
+        assert best.insertion_force <= req.max_insertion
+        assert best.retention_force >= req.min_retention
+
+        dim = dataclasses.replace(PicoDimensions(), **best.overrides)
+        assert dim.latch_arm_length == best.overrides["latch_arm_length"]
+        PicoTopShell(dim=dim)
+
+
+def test_optimum_follows_material_and_targets():
+    best = {m: optimize(MATERIALS[m], top=1)[0] for m in ("PLA", "PETG")}
+    # PLA tolerates less strain, so it needs a longer, stiffer arm than PETG
+    assert best["PLA"].overrides != best["PETG"].overrides
+    assert best["PLA"].size > best["PETG"].size
+    assert best["PLA"].overrides["latch_arm_length"] < LatchDesignSpace().latch_arm_length[1]
+
+    petg = MATERIALS["PETG"]
+    stronger = optimize(petg, req=LatchRequirements(min_retention=20.0), top=1)[0]
+    assert stronger.retention_force >= 20.0 and stronger.size > best["PETG"].size
+    gentler = optimize(petg, req=LatchRequirements(max_utilization=0.5), top=1)[0]
+    assert gentler.strain_utilization <= 0.5 and gentler.size > best["PETG"].size
+
+
+def test_infeasible_space_returns_nothing():
+    space = LatchDesignSpace(latch_arm_length=(5.0, 5.0, 1.0), latch_arm_thickness=(3.0, 3.0, 1.0))
+    assert optimize(MATERIALS["PLA"], space) == []
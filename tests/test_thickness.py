@@ -0,0 +1,63 @@
+import json
+
+import manifold3d as m3d
+import numpy as np
+import pytest
+
+from analysis.thickness import Thresholds, analyze, write_report
+from mesh.bvh import BVH, ray_triangle
+from mesh.core import Mesh
+
+
+def _plates(thin=0.5, thick=3.0, gap=0.2) -> Mesh:
+    """A thin and a thick 20x20 plate side by side in X, `gap` apart."""
+    a = m3d.Manifold.cube([thin, 20, 20])
+    b = m3d.Manifold.cube([thick, 20, 20]).translate([thin + gap, 0, 0])
+    return Mesh.from_manifold(a + b)
+
+
+def test_bvh_matches_brute_force():
+    mesh = Mesh.from_manifold(m3d.Manifold.sphere(10, 48) - m3d.Manifold.cube([8, 8, 30], center=True))
+    rng = np.random.default_rng(1)
+    origins = rng.uniform(-15, 15, (300, 3))
+    dirs = rng.normal(size=(300, 3))
+    dirs /= np.linalg.norm(dirs, axis=1)[:, None]
+
+    t, faces = BVH(mesh, leaf_size=2).intersect(origins, dirs)
+    tris = mesh.triangles.astype(np.float64)
+    for i in range(len(origins)):
+        brute = ray_triangle(np.repeat(origins[i:i + 1], len(tris), 0),
+                             np.repeat(dirs[i:i + 1], len(tris), 0), tris)
+        assert t[i] == pytest.approx(brute.min())
+        if np.isfinite(t[i]):
+            assert brute[faces[i]] == pytest.approx(t[i])
+
+
+def test_thin_plate_and_gap_are_flagged():
+    limits = Thresholds.for_nozzle(0.4)
+    assert (limits.min_wall, limits.min_feature, limits.min_gap) == pytest.approx((0.9, 0.45, 0.4))
+
+    result = analyze("plates", _plates(), limits, samples=5000)
+    walls = [i for i in result.issues if i.kind == "wall"]
+    gaps = [i for i in result.issues if i.kind == "gap"]
+    assert not [i for i in result.issues if i.kind == "feature"]
+    # The thin plate, as one location
+    assert len(walls) == 1 and walls[0].size == pytest.approx(0.5) and walls[0].centre[0] <= 0.5
+    assert walls[0].area == pytest.approx(2 * 20 * 20, rel=0.1)
+    # The slot between the plates
+    assert len(gaps) == 1 and gaps[0].size == pytest.approx(0.2)
+    assert gaps[0].area == pytest.approx(2 * 20 * 20, rel=0.1)
+    assert result.summary()["min_thickness"] == pytest.approx(0.5)
+
+    # A coarser nozzle turns the thin plate into an unprintable feature
+    coarse = analyze("plates", _plates(), Thresholds.for_nozzle(1.0), samples=5000)
+    assert {i.kind for i in coarse.issues} == {"feature", "gap"}
+
+
+def test_solid_part_is_clean(tmp_path):
+    result = analyze("cube", Mesh.from_manifold(m3d.Manifold.cube([10, 10, 10])), samples=2000)
+    assert result.issues == []
+    summary = write_report(result, tmp_path)
+    assert json.loads((tmp_path / "cube.json").read_text()) == summary
+    header = (tmp_path / "cube.ply").read_bytes()[:200].decode(errors="ignore")
+    assert f"element face {len(result.mesh.faces)}" in header
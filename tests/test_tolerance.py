@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from analysis.tolerance import (
+    EXACT, PRINT_ERRORS, PrintError, PrintedPart, analyze, dovetail_fit, latch_dimensions, latch_fit,
+    latch_strain,
+)
+from components.dovetail import DovetailDimensions
+from components.latch import LatchDimensions
+from config import PicoDimensions
+from mesh.cost import MATERIALS
+
+
+def test_exact_prints_reproduce_nominal_fit():
+    rng = np.random.default_rng(0)
+    dovetail = dovetail_fit(DovetailDimensions(dovetail_clearance=0.15), "PLA", EXACT, 10, rng)
+    assert dovetail.values == pytest.approx(0.3)
+    assert not dovetail.too_tight.any() and not dovetail.too_loose.any()
+
+    latch = latch_fit(LatchDimensions(), MATERIALS["PETG"], EXACT, 10, rng)
+    assert latch.values == pytest.approx(2.0)
+    assert not latch.no_engagement.any()
+
+
+def test_over_extrusion_closes_dovetail_gap():
+    over = PrintError(offset=0.1, offset_sd=0.0, surface_sd=0.0, shrink=0.0, shrink_sd=0.0)
+    result = dovetail_fit(DovetailDimensions(dovetail_clearance=0.15), "PLA", over, 10,
+                          np.random.default_rng(0))
+    assert result.values == pytest.approx(-0.1)  # 0.3 - 4 x 0.1
+    assert result.too_tight.all()
+
+
+def test_over_extrusion_moves_wall_and_ledge_together():
+    over = PrintError(offset=0.1, offset_sd=0.0, surface_sd=0.0, shrink=0.0, shrink_sd=0.0)
+    result = latch_fit(LatchDimensions(), MATERIALS["PETG"], over, 10, np.random.default_rng(0))
+    # The ledge tip and the wall the arm lies on each move inboard by one offset
+    assert result.values == pytest.approx(2.0)
+
+
+def test_latch_outcomes():
+    rng = np.random.default_rng(0)
+    pla = MATERIALS["PLA"]
+    # 12 mm arm, 1.5 mm thick, 2 mm undercut: 3.1% strain, over PLA's limit
+    assert latch_strain(1.5, 12.0, 2.0) == pytest.approx(0.03125)
+    assert latch_fit(LatchDimensions(), pla, EXACT, 5, rng).too_tight.all()
+    assert latch_fit(LatchDimensions(hook_depth=0.3), pla, EXACT, 5, rng).too_loose.all()
+
+
+def test_default_pico_latch_fits_every_material():
+    dim = PicoDimensions()
+    for name, material in MATERIALS.items():
+        exact = latch_fit(latch_dimensions(dim), material, EXACT, 5, np.random.default_rng(0))
+        assert not (exact.too_tight | exact.too_loose | exact.no_engagement).any(), name
+    for result in analyze(dim, n=20_000, seed=1):
+        if result.joint == "latch":
+            assert result.summary()["p_ok"] > 0.9, result.summary()
+
+
+def test_layer_snapping():
+    part = PrintedPart(PrintError(0, 0, 0, 0, 0, layer_height=0.2), 1000, np.random.default_rng(1))
+    heights = part.height(12.05)
+    assert np.all(np.abs(heights - 12.05) <= 0.1 + 1e-9)
+
+
+def test_analyze_is_seeded_and_sums_to_one():
+    first = [r.summary() for r in analyze(materials=["ASA"], n=20_000, seed=3)]
+    second = [r.summary() for r in analyze(materials=["ASA"], n=20_000, seed=3)]
+    assert first == second
+    for s in first:
+        assert s["material"] == "ASA"
+        total = s["p_too_tight"] + s["p_too_loose"] + s["p_no_engagement"] + s["p_ok"]
+        assert total == pytest.approx(1.0, abs=1e-3)
+
+
+def test_every_material_has_an_error_model():
+    assert set(PRINT_ERRORS) == set(MATERIALS)
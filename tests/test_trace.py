@@ -0,0 +1,85 @@
+import json
+import sys
+
+import pytest
+
+from pipeline import trace
+
+
+@pytest.fixture
+def trace_file(tmp_path):
+    path = trace.start(tmp_path / "trace.jsonl")
+    yield path
+    trace.stop()
+
+
+def test_spans_nest_and_inherit_part(trace_file):
+    with trace.span("scad", part="base") as outer:
+        with trace.span("write", kind="scad") as inner:
+            inner.set(bytes=120)
+    with pytest.raises(ValueError):
+        with trace.span("factory", part="broken"):
+            raise ValueError("bad dimension")
+
+    write, scad, factory = trace.read_events(trace_file)
+    assert write["parent"] == scad["span"] == outer.id and write["part"] == "base"
+    assert write["bytes"] == 120 and write["kind"] == "scad"
+    assert scad["parent"] is None and scad["duration_s"] >= write["duration_s"]
+    assert not factory["ok"] and factory["error"] == "bad dimension"
+    assert len({e["trace"] for e in (write, scad, factory)}) == 1
+
+
+def test_no_events_when_stopped(tmp_path):
+    with trace.span("render", part="base") as span:
+        span.set(bytes=1)
+    assert not list(tmp_path.iterdir())
+
+
+def test_run_records_child_peak_rss(trace_file):
+    with trace.span("openscad", part="base"):
+        result = trace.run([sys.executable, "-c", "x = bytearray(64_000_000); print('ok')"])
+    assert result.returncode == 0 and result.stdout.strip() == "ok"
+    [event] = trace.read_events(trace_file)
+    assert event["peak_rss_kb"] > 64_000
+
+
+def test_summary_counts_nested_stage_once(trace_file, monkeypatch):
+    import anchorscad as ad
+    from components.drive_bay import DriveBayArray
+
+    # Restored by monkeypatch even if trace_builds() fails to
+    original = ad.CompositeShape.__post_init__
+    monkeypatch.setattr(ad.CompositeShape, "__post_init__", original)
+    with trace.trace_builds():
+        with trace.span("factory", part="array"):
+            DriveBayArray(columns=2, with_drives=False)
+    assert ad.CompositeShape.__post_init__ is original
+    with trace.span("library", cache="hit"):
+        pass
+    with trace.span("library", cache="miss"):
+        pass
+
+    events = trace.read_events(trace_file)
+    builds = [e for e in events if e["stage"] == "build"]
+    assert {e["shape"] for e in builds} == {"DriveBayArray", "DriveBayCell"}
+    stages = trace.summarize(events)
+    assert stages["build"]["count"] == 1
+    assert stages["library"]["hits"] == stages["library"]["misses"] == 1
+    table = trace.summary_table(events)
+    assert table.splitlines()[0].split()[0] == "stage" and "build array" in table
+
+
+def test_otlp_export(trace_file, tmp_path):
+    with trace.span("scad", part="base"):
+        with trace.span("write", bytes=10):
+            pass
+    otlp = tmp_path / "otlp.json"
+    trace.write_otlp(trace.read_events(trace_file), otlp, service="bin/render")
+
+    [resource] = json.loads(otlp.read_text())["resourceSpans"]
+    spans = {s["name"]: s for s in resource["scopeSpans"][0]["spans"]}
+    assert spans["write"]["parentSpanId"] == spans["scad"]["spanId"]
+    assert len(spans["write"]["traceId"]) == 32
+    assert int(spans["scad"]["endTimeUnixNano"]) >= int(spans["scad"]["startTimeUnixNano"])
+    attributes = {a["key"]: a["value"] for a in spans["write"]["attributes"]}
+    assert attributes["bytes"] == {"intValue": "10"} and attributes["part"] == {"stringValue": "base"}
@@ -0,0 +1,70 @@
+import manifold3d as m3d
+import numpy as np
+import pytest
+
+from mesh.bvh import BVH
+from mesh.core import Mesh
+from mesh.io import write_stl
+from mesh.validate import edge_defects, validate, validate_stl
+
+
+def _cube(size=10.0, offset=(0, 0, 0), rotate=(0, 0, 0)) -> Mesh:
+    return Mesh.from_manifold(m3d.Manifold.cube([size] * 3).rotate(list(rotate)).translate(list(offset)))
+
+
+def test_manifold_solid_is_valid():
+    holed = m3d.Manifold.cube([20, 20, 4]) - m3d.Manifold.cylinder(10, 3).translate([10, 10, -3])
+    result = validate(Mesh.from_manifold(holed), expect_shells=1)
+    assert result.ok, result.problems
+    assert result.to_dict()["problems"] == []
+
+
+def test_open_and_misoriented_meshes():
+    cube = _cube()
+    opened = validate(Mesh(cube.vertices, cube.faces[1:]))
+    assert opened.boundary_edges == 3 and not opened.ok
+
+    flipped = cube.faces.copy()
+    flipped[0] = flipped[0][::-1]
+    assert edge_defects(flipped) == (0, 0, 3)
+
+
+def test_coplanar_hole_leaves_non_manifold_edge():
+    # Two cubes sharing only an edge: the typical coplanar-cut failure
+    a, b = _cube(), _cube(offset=(10, 10, 0))
+    joined = Mesh.from_triangles(np.concatenate([a.triangles, b.triangles]))
+    result = validate(joined, expect_shells=1)
+    assert result.nonmanifold_edges == 1
+    assert result.self_intersections == 0
+    assert "non-manifold: 1 edges shared by 3+ faces" in result.problems
+
+
+def test_overlapping_bodies_and_zero_area_faces():
+    a, b = _cube(), _cube(offset=(5, 5, 5), rotate=(20, 30, 40))
+    soup = Mesh.concatenate([a, b])
+    result = validate(soup, expect_shells=1)
+    assert result.self_intersections > 0
+    assert result.shells == 2 and "2 shells, expected 1" in result.problems
+    assert result.boundary_edges == 0 and result.nonmanifold_edges == 0
+
+    sliver = Mesh(np.vstack([a.vertices, [[1, 1, 1]]]), np.vstack([a.faces, [[0, 0, len(a.vertices)]]]))
+    assert validate(sliver).degenerate_faces == 1
+
+
+def test_validate_stl_writes_report(tmp_path):
+    path = tmp_path / "cube.stl"
+    write_stl(path, _cube())
+    assert validate_stl(path, 1).ok
+    assert (tmp_path / "cube.validation.json").read_text().count('"ok": true') == 1
+
+
+def test_bvh_box_queries_match_brute_force():
+    mesh = Mesh.from_manifold(m3d.Manifold.sphere(10, 32))
+    rng = np.random.default_rng(2)
+    lo = rng.uniform(-12, 10, (50, 3))
+    hi = lo + rng.uniform(0, 4, (50, 3))
+    q, f = BVH(mesh).overlapping(lo, hi)
+    tris = mesh.triangles
+    t_lo, t_hi = tris.min(axis=1), tris.max(axis=1)
+    brute = np.all((lo[:, None] <= t_hi[None]) & (hi[:, None] >= t_lo[None]), axis=2)
+    assert sorted(zip(q.tolist(), f.tolist())) == sorted(zip(*np.nonzero(brute)))
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from config import PicoDimensions
+from mesh.parts import render_shape
+from mesh.properties import mass_properties
+from pipeline.render import render_quality, scad_source, vitamin_detail
+from vitamins.cooling import FAN_120_25, Fan
+from vitamins.heatsink import NoctuaL9, NoctuaL12S
+from vitamins.motherboard import MiniItxMotherboard
+from vitamins.motherboard_assembly import MotherboardAssemblyPico
+from vitamins.psu import FlexAtxPsu
+
+VITAMINS = {
+    "noctua_l9": lambda detail: NoctuaL9(detail=detail),
+    "noctua_l12s": lambda detail: NoctuaL12S(detail=detail),
+    "fan": lambda detail: Fan(dim=FAN_120_25, detail=detail),
+    "flex_atx": lambda detail: FlexAtxPsu(detail=detail),
+    "mini_itx": lambda detail: MiniItxMotherboard(detail=detail),
+}
+
+
+@pytest.mark.parametrize("name", sorted(VITAMINS))
+def test_cheaper_levels_cover_the_detailed_model(name):
+    make = VITAMINS[name]
+    detailed, proxy, bbox = (render_shape(make(d)) for d in ("detailed", "proxy", "bbox"))
+    assert np.allclose(proxy.bounds, detailed.bounds, atol=1e-3)
+    assert np.all(bbox.bounds[0] <= detailed.bounds[0] + 1e-3)
+    assert np.all(bbox.bounds[1] >= detailed.bounds[1] - 1e-3)
+    assert mass_properties(bbox).volume >= mass_properties(detailed).volume - 1e-3
+
+
+@pytest.mark.parametrize("name", sorted(VITAMINS))
+def test_levels_keep_anchors(name):
+    make = VITAMINS[name]
+    assert np.allclose(make("bbox").at("centre").A, make("detailed").at("centre").A)
+
+
+def test_unknown_detail_is_rejected():
+    with pytest.raises(ValueError):
+        Fan(dim=FAN_120_25, detail="ultra")
+
+
+def test_assembly_detail_follows_quality_profile():
+    import registry
+
+    registry.load_all_parts()
+    assert vitamin_detail() == "detailed"
+    sources = {}
+    for quality in ("draft", "preview", "standard", "final"):
+        with render_quality(quality):
+            sources[quality] = scad_source(registry.materialize("pico_base_assembly"))
+    assert "mount_0" in sources["final"] and "mount_0" in sources["standard"]
+    assert "mount_0" not in sources["preview"] and "airflow" in sources["preview"]
+    assert "airflow" not in sources["draft"]
+
+
+def test_standalone_motherboard_assembly_is_detailed():
+    import registry
+
+    registry.load_all_parts()
+    with render_quality("standard"):
+        standalone = registry.materialize("motherboard_assembly_pico")
+    assert standalone.detail == "detailed"
+    assert "mount_0" in scad_source(standalone)
+
+
+def test_detail_is_part_of_the_repr():
+    dim = PicoDimensions()
+    assert repr(MotherboardAssemblyPico(dim=dim)) != repr(MotherboardAssemblyPico(dim=dim, detail="proxy"))